@@ -3,28 +3,44 @@
 #//|>-----------------------------------------------------------------------------------------------------------------<|
 
 #// IMPORT
-from importlib.resources import files
-
 from sphinx.application import Sphinx
 from sphinx.util.typing import ExtensionMetadata
 
 from ._version import __version__
+from .localtoc_cache import setup_cache
+from .localtoc_css import setup_css
+from .localtoc_pipeline import setup_pipeline
+from .localtoc_profile import setup_profile
+from .localtoc_report import setup_report
+from .localtoc_nodes import setup_nodes
+from .localtoc_stream import setup_stream
+from .localtoc_budget import setup_budget
 from .localtoc_type import setup_type
 from .localtoc_dropdown import setup_dropdown
+from .localtoc_collapse import setup_collapse
+from .localtoc_lazy import setup_lazy
+from .localtoc_globaltoc import setup_globaltoc
 
 
 #// RUN
 def setup(app: Sphinx) -> ExtensionMetadata:
-    root = files(__name__)
-    app.config.html_static_path.append(str(root / "_static"))
-
-    app.add_css_file("styles/localtoc.css")
-
+    setup_pipeline(app)
+    setup_cache(app)
+    setup_profile(app)
+    setup_report(app)
+    setup_css(app)
+    setup_nodes(app)
+    setup_stream(app)
+    setup_budget(app)
     setup_type(app)
     setup_dropdown(app)
+    setup_collapse(app)
+    setup_lazy(app)
+    setup_globaltoc(app)
 
     return {
         "version": __version__,
+        "env_version": 1,
         "parallel_read_safe": True,
         "parallel_write_safe": True,
     }
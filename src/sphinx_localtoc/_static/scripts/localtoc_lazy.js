@@ -0,0 +1,38 @@
+/* Local ToC lazy subtrees: a list left empty in the page is filled the first time its dropdown is opened */
+(() => {
+    // Fragment file ➜ pending or loaded fragments, each file is fetched once per page
+    const files = new Map();
+
+    const load = (source) => {
+        if (!files.has(source)) {
+            files.set(source, fetch(source).then((response) => {
+                if (!response.ok) throw new Error(`${source}: ${response.status}`);
+                return response.json();
+            }));
+        }
+        return files.get(source);
+    };
+
+    document.addEventListener("change", (event) => {
+        const toggle = event.target;
+
+        // Only an opened dropdown (unchecked) matters
+        if (!(toggle instanceof HTMLInputElement) || !toggle.classList.contains("slt-dropdown") || toggle.checked) return;
+
+        const list = toggle.parentElement && toggle.parentElement.querySelector(":scope > ul.slt-dropdown-lazy");
+        if (!list || list.dataset.sltLoaded) return;
+
+        list.dataset.sltLoaded = "loading";
+        load(list.dataset.sltSrc)
+            .then((fragments) => {
+                // The section link stays when the fragment is missing (e.g. a stale file)
+                if (list.dataset.sltKey in fragments) list.innerHTML = fragments[list.dataset.sltKey];
+                list.dataset.sltLoaded = "done";
+            })
+            .catch(() => {
+                // Try again on the next opening (e.g. a network hiccup)
+                files.delete(list.dataset.sltSrc);
+                delete list.dataset.sltLoaded;
+            });
+    });
+})();
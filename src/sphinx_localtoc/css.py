@@ -0,0 +1,76 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import argparse
+import sys
+
+from pathlib import Path
+
+from .localtoc_css import minify_css
+from .tools.localtoc_css_generator import generate_css
+
+
+#// LOGIC
+def _parse_args(argv: list[str]|None=None) -> argparse.Namespace:
+    """
+    Read the command line options.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m sphinx_localtoc.css",
+        description="Generate the Local ToC stylesheet with every known object type.",
+    )
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("-o", "--output", help="stylesheet file to write (overwritten when it exists)")
+    target.add_argument("--stdout", action="store_true", help="write the stylesheet to the standard output")
+    parser.add_argument(
+        "--check", action="store_true",
+        help="do not write anything, exit with 1 when the --output file is missing or stale"
+    )
+    parser.add_argument("--minify", action="store_true", help="drop the comments and the needless whitespace")
+
+    args: argparse.Namespace = parser.parse_args(argv)
+    if args.check and args.output is None:
+        parser.error("--check needs --output")
+
+    return args
+
+
+def main(argv: list[str]|None=None) -> int:
+    """
+    Run the stylesheet generator from the command line.
+
+    :return:    Exit code, 1 when --check finds a stale stylesheet
+    """
+    args: argparse.Namespace = _parse_args(argv)
+
+    css: str = generate_css()
+    if args.minify:
+        css = minify_css(css) + "\n"
+
+    if args.stdout:
+        sys.stdout.write(css)
+        return 0
+
+    output: Path = Path(args.output)
+
+    if args.check:
+        try:
+            current: str|None = output.read_text(encoding="utf-8")
+        except OSError:
+            current = None
+
+        if current != css:
+            sys.stderr.write(f"{output}: {"missing" if current is None else "stale"}, regenerate it\n")
+            return 1
+        return 0
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(css, encoding="utf-8")
+    return 0
+
+
+#// RUN
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+from docutils import nodes
+from typing import Any
+from typing import TYPE_CHECKING
+
+from sphinx import addnodes
+from sphinx.application import Sphinx
+from sphinx.config import Config
+from sphinx.util import logging
+
+from .localtoc_dropdown import walk_list
+from .localtoc_dropdown import walk_nodes
+from .localtoc_dropdown import subtree_sizes
+from .localtoc_nodes import ENGINE as NODES_ENGINE
+from .localtoc_nodes import first_child
+from .localtoc_pipeline import add_stage
+from .localtoc_pipeline import DEFAULT_ENGINE
+from .localtoc_stream import ENGINE as STREAM_ENGINE
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from bs4.element import Tag
+
+
+#// GLOBAL VARIABLES
+logger = logging.getLogger(__name__)
+
+# Class of the entry replacing the cut entries of a list
+MORE_CLASS: str = "slt-more"
+
+
+#// LOGIC
+class Budget:
+    """
+    Limits of the ToC entries kept in the page, 0 for no limit.
+    """
+    __slots__ = ("depth", "branch", "total", "label")
+
+    def __init__(self, app: Sphinx) -> None:
+        self.depth: int = max(app.config["localtoc_budget_depth"], 0)
+        self.branch: int = max(app.config["localtoc_budget_branch"], 0)
+        self.total: int = max(app.config["localtoc_budget_total"], 0)
+        self.label: str = app.config["localtoc_budget_more"]
+
+    def more(self, count: int) -> str:
+        """
+        Get the text of the link replacing :param:`count` cut entries.
+        """
+        return self.label.format(count=count)
+
+
+def plan_cuts(entries: list[tuple[int, Any, Any, bool, Any]], budget: Budget
+              ) -> tuple[list[Any], dict[int, tuple[Any, int]]]:
+    """
+    Decide which entries are cut, in document order.
+
+    An entry is cut when it is deeper than the depth budget, past the branch budget in its list, or once the total
+    budget is spent by the entries before it. Its subtree goes with it, and is counted in the amount of cut entries.
+
+    :param entries: Everything :func:`walk_list` or :func:`walk_nodes` yielded, in document order
+    :return:        The cut entries (only the topmost ones), and id() of a list ➜ (the list, amount of entries cut)
+    """
+    sizes: dict[int, int] = subtree_sizes(entries)
+
+    cut: list[Any] = []
+    more: dict[int, tuple[Any, int]] = {}
+
+    # id() of a list ➜ amount of its entries walked so far, and the lists cut along with their entry
+    seen: dict[int, int] = {}
+    dropped: set[int] = set()
+    kept: int = 0
+
+    for depth, item, sub, _hd, parent in entries:
+        # Inside a cut subtree ➜ already counted
+        if id(parent) in dropped:
+            if sub is not None:
+                dropped.add(id(sub))
+            continue
+
+        seen[id(parent)] = position = seen.get(id(parent), 0) + 1
+
+        if (
+            (budget.depth and depth >= budget.depth)
+            or (budget.branch and position > budget.branch)
+            or (budget.total and kept >= budget.total)
+        ):
+            cut.append(item)
+            if sub is not None:
+                dropped.add(id(sub))
+
+            count: int = more.get(id(parent), (parent, 0))[1]
+            more[id(parent)] = (parent, count + 1 + (0 if sub is None else sizes.get(id(sub), 0)))
+            continue
+
+        kept += 1
+
+    return cut, more
+
+
+def _budget_stage(app: Sphinx, soup: "BeautifulSoup", _ct: dict[str, str|None], _dt: any) -> None:
+    """
+    Cut the entries past the budgets of the Local ToC, each list ending with a "N more…" entry linking the section
+    holding the cut entries.
+
+    Runs before the decorating stages, so the cut entries are never decorated.
+    """
+    root_ul: "Tag|None" = soup.find("ul")
+    if root_ul is None: return
+
+    budget: Budget = Budget(app)
+    entries: list[tuple[int, "Tag", "Tag|None", bool, "Tag"]] = list(walk_list(root_ul))
+    cut, more = plan_cuts(entries, budget)
+    if not cut: return
+
+    # id() of a nested list ➜ the entry holding it, whose link is the section of the cut entries
+    owners: dict[int, "Tag"] = {id(ul): li for _d, li, ul, _hd, _pu in entries if ul is not None}
+
+    for li in cut:
+        # The line break after the entry goes with it
+        if isinstance(li.next_sibling, str) and not li.next_sibling.strip():
+            li.next_sibling.extract()
+        li.decompose()
+
+    for ul, count in more.values():
+        owner: "Tag|None" = owners.get(id(ul))
+        first: "Tag|None" = None if owner is None else owner.find()
+        href: str = first.get("href", "#") if first is not None and first.name == "a" else "#"
+
+        tag_link = soup.new_tag("a", attrs={"class": "reference internal", "href": href})
+        tag_link.string = budget.more(count)
+        tag_more = soup.new_tag("li", attrs={"class": MORE_CLASS})
+        tag_more.append(tag_link)
+
+        ul.append(tag_more)
+        ul.append("\n")
+
+
+def _budget_nodes_stage(app: Sphinx, toc: nodes.bullet_list, _ct: dict[str, str|None], _dt: any) -> None:
+    """
+    Same as :func:`_budget_stage`, but on the ToC docutils nodes.
+    """
+    budget: Budget = Budget(app)
+    entries: list[tuple[int, nodes.list_item, nodes.bullet_list|None, bool, nodes.bullet_list]] = list(
+        walk_nodes(toc)
+    )
+    cut, more = plan_cuts(entries, budget)
+    if not cut: return
+
+    owners: dict[int, nodes.list_item] = {id(sub): item for _d, item, sub, _hd, _pa in entries if sub is not None}
+
+    for item in cut:
+        item.parent.remove(item)
+
+    for bullet_list, count in more.values():
+        owner: nodes.list_item|None = owners.get(id(bullet_list))
+        paragraph: nodes.Node|None = None if owner is None else first_child(owner, addnodes.compact_paragraph)
+        reference: nodes.Node|None = None if paragraph is None else first_child(paragraph, nodes.reference)
+
+        # Same link as the section entry (rendered as "#" for the page itself)
+        link: nodes.reference = nodes.reference("", "", internal=True, refuri="#")
+        if reference is not None:
+            link = reference.copy()
+        link += nodes.Text(budget.more(count))
+
+        bullet_list += nodes.list_item("", addnodes.compact_paragraph("", "", link), classes=[MORE_CLASS])
+
+
+def _check_engine(_app: Sphinx, config: Config) -> None:
+    """
+    Warn when the budgets are used with the "stream" engine, which can not cut entries without a tree.
+    """
+    if not config["localtoc_budget"] or config["localtoc_engine"] != STREAM_ENGINE: return
+    logger.warning(
+        f"[sphinx-localtoc] localtoc_budget is not supported by the {STREAM_ENGINE!r} engine, the pages are rewritten "
+        f"by the {DEFAULT_ENGINE!r} engine instead"
+    )
+
+
+def setup_budget(app: Sphinx) -> None:
+    """
+    Register configuration values and event hooks for the budgets of the Local ToC.
+
+    Config values added:
+        localtoc_budget (bool)
+            Cut the ToC entries past the budgets, each list losing entries ends with a "N more…" entry linking the
+            section holding them.
+
+        localtoc_budget_depth (int)
+            Number of ToC depth levels kept (0 ➜ no depth limit).
+
+        localtoc_budget_branch (int)
+            Entries kept per list (0 ➜ no limit).
+
+        localtoc_budget_total (int)
+            Entries kept in the whole ToC, in document order (0 ➜ no limit).
+
+        localtoc_budget_more (str)
+            Text of the "more" entries, "{count}" is replaced with the amount of cut entries (subtrees included).
+
+    Connected events:
+        config-inited
+            Warn when the budgets are used with the "stream" engine (the pages fall back to the "soup" one).
+
+    Pipeline stages added:
+        budget
+            Runs before every decorating stage, on the "soup" and "nodes" engines.
+    """
+    app.add_config_value(
+        "localtoc_budget",
+        False,
+        "html"
+    )
+    app.add_config_value(
+        "localtoc_budget_depth",
+        6,
+        "html"
+    )
+    app.add_config_value(
+        "localtoc_budget_branch",
+        100,
+        "html"
+    )
+    app.add_config_value(
+        "localtoc_budget_total",
+        1000,
+        "html"
+    )
+    app.add_config_value(
+        "localtoc_budget_more",
+        "{count} more…",
+        "html"
+    )
+
+    app.connect("config-inited", _check_engine)
+    options: tuple[str, ...] = (
+        "localtoc_budget_depth", "localtoc_budget_branch", "localtoc_budget_total", "localtoc_budget_more",
+    )
+    add_stage(app, "budget", _budget_stage, "localtoc_budget", 300, options=options)
+    add_stage(app, "budget", _budget_nodes_stage, "localtoc_budget", 300, NODES_ENGINE, options=options)
@@ -0,0 +1,183 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import hashlib
+import os
+import tempfile
+import time
+
+from pathlib import Path
+
+from sphinx.application import Sphinx
+
+from ._version import __version__
+from .localtoc_profile import profiled
+
+
+#// GLOBAL VARIABLES
+CACHE_DIR: str = "localtoc_cache"
+CACHE_SUFFIX: str = ".html"
+
+
+#// LOGIC
+def _cache_dir(app: Sphinx) -> Path:
+    """
+    Get the cache directory, which lives next to the doctrees of the build.
+    """
+    return Path(app.doctreedir) / CACHE_DIR
+
+
+def _cache_file(app: Sphinx, key: str) -> Path:
+    """
+    Get the cache file of a key, spread over sub-directories to keep them small.
+    """
+    return _cache_dir(app) / key[:2] / f"{key}{CACHE_SUFFIX}"
+
+
+def cache_key(app: Sphinx, toc: str, inputs: list[object], options: list[str]) -> str:
+    """
+    Compute the cache key of a ToC rewrite.
+
+    The key covers everything the rewritten ToC depends on:
+        - the extension version
+        - the input ToC HTML
+        - the extra inputs given by the enabled stages (e.g. the per page type map)
+        - the config values the stages declared (see `add_stage`), the other ones (profiling, report, stylesheet,
+          ...) never change the rewritten ToC and keep the entries valid
+
+    :param options: Names of the config values the rewritten ToC depends on
+    """
+    digest = hashlib.sha256()
+    digest.update(__version__.encode())
+    digest.update(b"\0")
+    digest.update(toc.encode("utf-8", "surrogatepass"))
+
+    for name in sorted(options):
+        digest.update(f"\0{name}={app.config[name]!r}".encode())
+
+    for value in inputs:
+        digest.update(f"\0{value!r}".encode())
+
+    return digest.hexdigest()
+
+
+def cache_get(app: Sphinx, key: str) -> str|None:
+    """
+    Get the stored rewritten ToC of a key.
+
+    :return:    The rewritten ToC HTML, or None on a miss
+    """
+    file: Path = _cache_file(app, key)
+
+    try:
+        html: str = file.read_text(encoding="utf-8")
+        # Refresh the age of the entry, so it survives the eviction while it is used
+        os.utime(file)
+    except OSError: return None
+
+    return html
+
+
+def cache_put(app: Sphinx, key: str, html: str) -> None:
+    """
+    Store the rewritten ToC of a key.
+
+    The file is written aside and moved in place, so parallel writers (`sphinx-build -j`) never see a partial entry.
+    """
+    file: Path = _cache_file(app, key)
+    temp_name: str|None = None
+
+    # A cache failure must never break the build
+    try:
+        file.parent.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=file.parent, suffix=".tmp", delete=False) as temp:
+            temp_name = temp.name
+            temp.write(html)
+
+        os.replace(temp_name, file)
+    except OSError:
+        if temp_name is not None:
+            Path(temp_name).unlink(missing_ok=True)
+
+
+def _evict(app: Sphinx, exception: Exception|None) -> None:
+    """
+    Drop the cache entries which are too old, then the least recently used ones until the cache fits its size.
+    """
+    # Skip if the build failed or the cache is not used
+    if exception is not None or not app.config["localtoc_cache"]: return
+
+    root: Path = _cache_dir(app)
+    if not root.is_dir(): return
+
+    max_age: float = app.config["localtoc_cache_max_age"] * 24 * 60 * 60
+    max_size: int = app.config["localtoc_cache_max_size"]
+    now: float = time.time()
+
+    # Leftovers of interrupted writes
+    for file in root.glob("*/*.tmp"):
+        try:
+            if now - file.stat().st_mtime > 60 * 60:
+                file.unlink(missing_ok=True)
+        except OSError: continue
+
+    # Every entry as (last use, size, path)
+    entries: list[tuple[float, int, Path]] = []
+    for file in root.glob(f"*/*{CACHE_SUFFIX}"):
+        try:
+            stat: os.stat_result = file.stat()
+        except OSError: continue
+
+        # Too old ➜ evict
+        if max_age > 0 and now - stat.st_mtime > max_age:
+            file.unlink(missing_ok=True)
+        else:
+            entries.append((stat.st_mtime, stat.st_size, file))
+
+    # Too big ➜ evict the least recently used entries first
+    total: int = sum(entry[1] for entry in entries)
+    if max_size > 0 and total > max_size:
+        for _mt, size, file in sorted(entries, key=lambda entry: entry[0]):
+            file.unlink(missing_ok=True)
+            total -= size
+            if total <= max_size: break
+
+
+def setup_cache(app: Sphinx) -> None:
+    """
+    Register configuration values and event hooks for the persistent cache of rewritten ToCs.
+
+    Config values added:
+        localtoc_cache (bool)
+            Store the rewritten ToCs in the doctree directory and reuse them across builds, without parsing.
+
+        localtoc_cache_max_size (int)
+            Maximum size of the cache in bytes, the least recently used entries are evicted first (0 ➜ no limit).
+
+        localtoc_cache_max_age (int)
+            Days after which an unused entry is evicted (0 ➜ no limit).
+
+    Connected events:
+        build-finished
+            Evict the entries over the age and size limits.
+    """
+    app.add_config_value(
+        "localtoc_cache",
+        False,
+        ""
+    )
+    app.add_config_value(
+        "localtoc_cache_max_size",
+        64 * 1024 * 1024,
+        ""
+    )
+    app.add_config_value(
+        "localtoc_cache_max_age",
+        30,
+        ""
+    )
+
+    app.connect("build-finished", profiled("build-finished", _evict))
@@ -0,0 +1,196 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+from docutils import nodes
+from typing import TYPE_CHECKING
+
+from sphinx.application import Sphinx
+from sphinx.config import Config
+from sphinx.util import logging
+
+from .localtoc_dropdown import walk_list
+from .localtoc_dropdown import walk_nodes
+from .localtoc_dropdown import subtree_sizes
+from .localtoc_nodes import ENGINE as NODES_ENGINE
+from .localtoc_pipeline import add_stage
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from bs4.element import Tag
+
+
+#// GLOBAL VARIABLES
+logger = logging.getLogger(__name__)
+
+# Class of the nested lists big enough to get the rendering hints (see the generated stylesheet)
+LARGE_CLASS: str = "slt-dropdown-large"
+
+# Default of `localtoc_dropdown_large`, any other value set without the collapse policy is reported
+LARGE_DEFAULT: int = 100
+
+
+#// LOGIC
+class CollapsePolicy:
+    """
+    Decide, per toggled branch, whether it starts collapsed and whether its list gets the rendering hints.
+
+    A branch is collapsed when its nested list starts deep enough or holds enough entries. When the whole ToC is too
+    big, every branch is collapsed, so only the first level is laid out on the first paint.
+    """
+    __slots__ = ("depth", "size", "collapse_all", "large")
+
+    def __init__(self, app: Sphinx, total: int) -> None:
+        """
+        :param total:   Amount of entries of the whole ToC
+        """
+        total_limit: int = max(app.config["localtoc_dropdown_collapse_total"], 0)
+
+        self.depth: int = max(app.config["localtoc_dropdown_collapse_depth"], 0)
+        self.size: int = max(app.config["localtoc_dropdown_collapse_size"], 0)
+        self.collapse_all: bool = bool(total_limit) and total >= total_limit
+        self.large: int = max(app.config["localtoc_dropdown_large"], 0)
+
+    def collapsed(self, depth: int, size: int) -> bool:
+        """
+        :param depth:   Depth of the nested list (its entries depth)
+        :param size:    Amount of entries in the nested list, its own nested lists included
+        """
+        return self.collapse_all or bool(self.depth and depth >= self.depth) or bool(self.size and size >= self.size)
+
+    def is_large(self, size: int) -> bool:
+        """
+        :param size:    Amount of entries in the nested list, its own nested lists included
+        """
+        return bool(self.large) and size >= self.large
+
+
+def _collapse_stage(app: Sphinx, soup: "BeautifulSoup", _ct: dict[str, str|None], _dt: any) -> None:
+    """
+    Apply the collapse policy to the toggles injected by the dropdown stage.
+
+    The collapsed toggles are rendered checked, which the stylesheet shows closed, so the browser skips their lists
+    on the first layout. The big lists get the "slt-dropdown-large" class, rendered with `content-visibility`.
+    """
+    root_ul: "Tag|None" = soup.find("ul")
+    if root_ul is None: return
+
+    entries: list[tuple[int, "Tag", "Tag|None", bool, "Tag"]] = list(walk_list(root_ul))
+    sizes: dict[int, int] = subtree_sizes(entries)
+    policy: CollapsePolicy = CollapsePolicy(app, len(entries))
+
+    for depth, li, ul, _hd, _pu in entries:
+        # Only the toggled <li> (see the dropdown stage) can be collapsed
+        if ul is None: continue
+        toggle: "Tag|None" = li.find("input", class_="slt-dropdown", recursive=False)
+        if toggle is None: continue
+
+        size: int = sizes.get(id(ul), 0)
+
+        if policy.collapsed(depth + 1, size):
+            toggle["checked"] = ""
+
+        if policy.is_large(size):
+            ul["class"] = ul.get_attribute_list("class") + [LARGE_CLASS]
+
+
+def _collapse_nodes_stage(app: Sphinx, toc: nodes.bullet_list, _ct: dict[str, str|None], _dt: any) -> None:
+    """
+    Same as :func:`_collapse_stage`, but on the ToC docutils nodes decorated by the dropdown stage.
+    """
+    entries: list[tuple[int, nodes.list_item, nodes.bullet_list|None, bool, nodes.bullet_list]] = list(
+        walk_nodes(toc)
+    )
+    sizes: dict[int, int] = subtree_sizes(entries)
+    policy: CollapsePolicy = CollapsePolicy(app, len(entries))
+
+    for depth, item, sub, _hd, _pa in entries:
+        # The toggle is the raw HTML node the dropdown stage put first
+        if sub is None or not item.children or not isinstance(item[0], nodes.raw): continue
+        markup: str = item[0].astext()
+        if not markup.startswith('<input class="slt-dropdown"'): continue
+
+        size: int = sizes.get(id(sub), 0)
+
+        # Same attribute order as the "soup" engine output
+        if policy.collapsed(depth + 1, size):
+            item[0] = nodes.raw("", markup.replace("<input ", '<input checked="" ', 1), format="html")
+
+        if policy.is_large(size):
+            sub["classes"].append(LARGE_CLASS)
+
+
+def _check_large(_app: Sphinx, config: Config) -> None:
+    """
+    Warn when the rendering hints are configured, but the collapse policy which applies them is off.
+    """
+    if config["localtoc_dropdown_collapse"] or config["localtoc_dropdown_large"] == LARGE_DEFAULT: return
+    logger.warning(
+        "[sphinx-localtoc] localtoc_dropdown_large is only applied with localtoc_dropdown_collapse = True, ignored"
+    )
+
+
+def setup_collapse(app: Sphinx) -> None:
+    """
+    Register configuration values and event hooks for the collapse policy of the Local ToC dropdown feature.
+
+    Config values added:
+        localtoc_dropdown_collapse (bool)
+            Decide per branch whether it starts collapsed, instead of rendering every branch expanded.
+
+        localtoc_dropdown_collapse_depth (int)
+            Branches whose nested list starts at this ToC depth are collapsed (0 ➜ no depth limit).
+
+        localtoc_dropdown_collapse_size (int)
+            Branches holding at least this amount of entries are collapsed (0 ➜ no size limit).
+
+        localtoc_dropdown_collapse_total (int)
+            Every branch is collapsed when the whole ToC holds at least this amount of entries (0 ➜ no limit).
+
+        localtoc_dropdown_large (int)
+            Nested lists holding at least this amount of entries get the "slt-dropdown-large" class, which the
+            stylesheet renders with `content-visibility` and containment hints (0 ➜ never). Part of the collapse
+            policy: it is ignored (with a warning) when localtoc_dropdown_collapse is off.
+
+    Connected events:
+        config-inited
+            Warn when localtoc_dropdown_large is set without the collapse policy.
+
+    Pipeline stages added:
+        collapse
+            Runs after the dropdown stage, on the "soup" and "nodes" engines.
+    """
+    app.add_config_value(
+        "localtoc_dropdown_collapse",
+        False,
+        "html"
+    )
+    app.add_config_value(
+        "localtoc_dropdown_collapse_depth",
+        3,
+        "html"
+    )
+    app.add_config_value(
+        "localtoc_dropdown_collapse_size",
+        30,
+        "html"
+    )
+    app.add_config_value(
+        "localtoc_dropdown_collapse_total",
+        300,
+        "html"
+    )
+    app.add_config_value(
+        "localtoc_dropdown_large",
+        LARGE_DEFAULT,
+        "html"
+    )
+
+    app.connect("config-inited", _check_large)
+    options: tuple[str, ...] = (
+        "localtoc_dropdown_collapse_depth", "localtoc_dropdown_collapse_size", "localtoc_dropdown_collapse_total",
+        "localtoc_dropdown_large",
+    )
+    add_stage(app, "collapse", _collapse_stage, "localtoc_dropdown_collapse", 550, options=options)
+    add_stage(app, "collapse", _collapse_nodes_stage, "localtoc_dropdown_collapse", 550, NODES_ENGINE, options=options)
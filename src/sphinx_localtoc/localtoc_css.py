@@ -0,0 +1,322 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import hashlib
+import re
+
+from docutils import nodes
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from sphinx.application import Sphinx
+from sphinx.environment import BuildEnvironment
+from sphinx.util import logging
+
+from ._version import __version__
+from .localtoc_pipeline import add_html_hook
+from .localtoc_profile import profiled
+from .tools.localtoc_css_generator import generate_css
+from .tools.localtoc_css_generator import obj_types
+from .tools.localtoc_css_generator import prefix_main
+
+
+#// GLOBAL VARIABLES
+logger = logging.getLogger(__name__)
+
+# Stylesheet path, relative to the static directory of the output
+CSS_FILE: str = "styles/localtoc.css"
+
+# Stylesheet path with the hash of its content, for long-lived browser caching
+CSS_HASHED_FILE: str = "styles/localtoc.{digest}.css"
+
+# Length of the content hash in the stylesheet name (hex digits)
+_HASH_LENGTH: int = 16
+
+# Rules inlined in the pages as critical CSS: hidden toggles and closed branches, so the ToC does not move when the
+# stylesheet is applied (selectors as the minifier gives them)
+_CRITICAL_SELECTORS: tuple[str, ...] = (
+    f".{prefix_main}-dropdown",
+    f".{prefix_main}-dropdown ~ ul",
+    f".{prefix_main}-dropdown:checked ~ ul",
+)
+
+# First line of the generated stylesheet, holding the hash of its inputs
+_STAMP: str = "/* Local ToC {version} | inputs {digest} */\n"
+
+RGB = tuple[int, int, int]
+
+# Strings of a stylesheet, kept as they are by the minifier
+_CSS_STRING: re.Pattern[str] = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+# Strings and comments of a stylesheet, the comments are dropped by the minifier
+_CSS_TOKEN: re.Pattern[str] = re.compile(rf"{_CSS_STRING.pattern}|/\*.*?\*/", re.DOTALL)
+# Whitespace which is never needed: around block and declaration delimiters, and after property colons
+_CSS_SPACE: re.Pattern[str] = re.compile(r"\s*([{};,])\s*|(:)\s+")
+# Rules of a minified stylesheet without nested blocks, as (selector, declarations)
+_CSS_RULE: re.Pattern[str] = re.compile(r"([^{}]+)\{([^{}]*)\}")
+
+
+#// LOGIC
+def _valid_color(value: object) -> bool:
+    """
+    Check whether the value is an RGB color, as (red, green, blue) with 0-255 channels.
+    """
+    return (
+        isinstance(value, (tuple, list)) and len(value) == 3
+        and all(isinstance(channel, int) and 0 <= channel <= 255 for channel in value)
+    )
+
+
+def css_types(app: Sphinx) -> dict[str, tuple[str, RGB]]:
+    """
+    Get the object types of the stylesheet: the known ones, updated with the `localtoc_css_types` overrides.
+
+    Every override is an (abbreviation, color) pair, where None keeps the default value of a known type.
+    Extra types need both values. Invalid overrides are skipped with a warning.
+    """
+    types: dict[str, tuple[str, RGB]] = dict(obj_types)
+
+    for name, value in app.config["localtoc_css_types"].items():
+        if not isinstance(value, (tuple, list)) or len(value) != 2:
+            logger.warning(f"localtoc_css_types[{name!r}] must be an (abbreviation, (red, green, blue)) pair")
+            continue
+
+        abbr, color = value
+        default: tuple[str, RGB]|None = types.get(name)
+
+        if default is None and (abbr is None or color is None):
+            logger.warning(f"localtoc_css_types[{name!r}] is not a known object type, both values are needed")
+            continue
+        if abbr is not None and (not isinstance(abbr, str) or not abbr or '"' in abbr or "\\" in abbr):
+            logger.warning(f"localtoc_css_types[{name!r}] abbreviation must be a non-empty string without quotes")
+            continue
+        if color is not None and not _valid_color(color):
+            logger.warning(f"localtoc_css_types[{name!r}] color must be a (red, green, blue) tuple of 0-255 values")
+            continue
+
+        types[name] = (
+            default[0] if abbr is None else abbr,
+            default[1] if color is None else tuple(color),
+        )
+
+    return types
+
+
+def minify_css(css: str) -> str:
+    """
+    Drop the comments and the needless whitespace of a stylesheet, keeping its strings untouched.
+    """
+    def squeeze(code: str) -> str:
+        return _CSS_SPACE.sub(lambda match: match.group(1) or match.group(2), re.sub(r"\s+", " ", code))
+
+    # Comments first, a string may hold "/*"
+    css = _CSS_TOKEN.sub(lambda match: match.group(1) or " ", css)
+
+    parts: list[str] = []
+    position: int = 0
+
+    for match in _CSS_STRING.finditer(css):
+        parts.append(squeeze(css[position:match.start()]))
+        parts.append(match.group(1))
+        position = match.end()
+    parts.append(squeeze(css[position:]))
+
+    return "".join(parts).replace(";}", "}").strip()
+
+
+def _inputs_digest(app: Sphinx, types: dict[str, tuple[str, RGB]]) -> str:
+    """
+    Hash everything the stylesheet depends on: the extension version (the template ships with it), the types and
+    the output options.
+    """
+    digest = hashlib.sha256()
+    digest.update(__version__.encode())
+    digest.update(f"\0minify={bool(app.config["localtoc_css_minify"])}".encode())
+
+    for name, (abbr, color) in types.items():
+        digest.update(f"\0{name}\0{abbr}\0{color!r}".encode())
+
+    return digest.hexdigest()
+
+
+def _used_types(env: BuildEnvironment) -> set[str]:
+    """
+    Get the object types found in the project (the "objtype" of every collected "domain-objtype" pair).
+    """
+    used: set[str] = set()
+    for pairs in getattr(env, "asi_object_types", {}).values():
+        used.update(pair.split("-", 1)[-1] for pair in pairs)
+    return used
+
+
+@cache
+def critical_css() -> str:
+    """
+    Get the rules of the stylesheet the ToC needs before the stylesheet is loaded, minified.
+    """
+    return "".join(
+        f"{selector}{{{declarations}}}"
+        for selector, declarations in _CSS_RULE.findall(minify_css(generate_css({})))
+        if selector in _CRITICAL_SELECTORS
+    )
+
+
+def _write_stamped_css(app: Sphinx, types: dict[str, tuple[str, RGB]]) -> str:
+    """
+    Generate the stylesheet under its fixed name, unless it is already up to date.
+
+    The stylesheet starts with the hash of its inputs, so an unchanged one costs a single line read.
+
+    :return:    Stylesheet path, relative to the output static directory
+    """
+    stamp: str = _STAMP.format(version=__version__, digest=_inputs_digest(app, types))
+    css_file: Path = Path(app.outdir) / "_static" / CSS_FILE
+
+    try:
+        with css_file.open(encoding="utf-8") as file:
+            if file.readline() == stamp: return CSS_FILE
+    except OSError: pass
+
+    css: str = generate_css(types)
+    if app.config["localtoc_css_minify"]:
+        css = minify_css(css) + "\n"
+
+    css_file.parent.mkdir(parents=True, exist_ok=True)
+    css_file.write_text(stamp + css, encoding="utf-8")
+    return CSS_FILE
+
+
+def _write_hashed_css(app: Sphinx, types: dict[str, tuple[str, RGB]]) -> str:
+    """
+    Generate the minified stylesheet under a name holding the hash of its content.
+
+    A new content gets a new name, so an existing file is always up to date and can be cached as immutable. The
+    files of earlier builds are kept: the pages Sphinx does not write again still link them.
+
+    :return:    Stylesheet path, relative to the output static directory
+    """
+    css: str = minify_css(generate_css(types)) + "\n"
+    css_name: str = CSS_HASHED_FILE.format(digest=hashlib.sha256(css.encode()).hexdigest()[:_HASH_LENGTH])
+    css_file: Path = Path(app.outdir) / "_static" / css_name
+
+    if not css_file.exists():
+        css_file.parent.mkdir(parents=True, exist_ok=True)
+        css_file.write_text(css, encoding="utf-8")
+
+    return css_name
+
+
+def _write_css(app: Sphinx, used: set[str]|None=None) -> None:
+    """
+    Generate the stylesheet into the output static directory, unless it is already up to date, and link it from
+    the pages.
+
+    :param used:    Object types to keep the rules for, None to keep them all
+    """
+    # Only the HTML builders use the stylesheet
+    if app.builder.format != "html": return
+
+    types: dict[str, tuple[str, RGB]] = css_types(app)
+    if used is not None:
+        types = {name: value for name, value in types.items() if name in used}
+
+    if app.config["localtoc_css_hash"]:
+        app.add_css_file(_write_hashed_css(app, types))
+    else:
+        app.add_css_file(_write_stamped_css(app, types))
+
+
+def _write_full_css(app: Sphinx) -> None:
+    """
+    Generate the stylesheet with every object type, right when the build starts.
+    """
+    # The pruned stylesheet needs the whole project to be read first
+    if app.config["localtoc_css_prune"]: return
+
+    _write_css(app)
+
+
+def _write_pruned_css(app: Sphinx, env: BuildEnvironment) -> None:
+    """
+    Generate the stylesheet with the object types found in the project only, once every document is read.
+    """
+    if not app.config["localtoc_css_prune"]: return
+
+    # Object types are never shown ➜ no object type rule is needed
+    _write_css(app, _used_types(env) if app.config["localtoc_type"] else set())
+
+
+def _inline_critical_css(app: Sphinx, _pn: str, _tm: str, context: dict[str, Any], _dt: nodes.document|None) -> None:
+    """
+    Inline the critical rules of the stylesheet in the head of the page.
+    """
+    if not app.config["localtoc_css_inline"]: return
+
+    context["metatags"] = f'{context.get("metatags", "")}<style>{critical_css()}</style>\n'
+
+
+def setup_css(app: Sphinx) -> None:
+    """
+    Register configuration values and event hooks for the generated Local ToC stylesheet.
+
+    Config values added:
+        localtoc_css_types (dict)
+            Object type ➜ (abbreviation, (red, green, blue)) overrides of the stylesheet. None keeps the default
+            value of a known type, new types need both values.
+
+        localtoc_css_prune (bool)
+            Keep only the rules of the object types found in the project. The stylesheet is then generated once
+            every document is read, instead of at the build start.
+
+        localtoc_css_minify (bool)
+            Drop the comments and the needless whitespace of the stylesheet.
+
+        localtoc_css_hash (bool)
+            Name the stylesheet after the hash of its (always minified) content, e.g. "localtoc.0123456789abcdef.css",
+            so it can be served as immutable. The files of earlier builds are kept for the pages not written again.
+
+        localtoc_css_inline (bool)
+            Inline the few rules the ToC needs before the stylesheet is loaded (hidden toggles and closed branches)
+            in the head of every page.
+
+    Connected events:
+        builder-inited
+            Generate the stylesheet when its inputs changed since the last build, and link it from the pages.
+
+        env-updated
+            Generate the pruned stylesheet when the object types used by the project changed, and link it.
+
+        html-page-context (HTML builders only)
+            Inline the critical rules.
+    """
+    app.add_config_value(
+        "localtoc_css_types",
+        {},
+        ""
+    )
+    app.add_config_value(
+        "localtoc_css_prune",
+        False,
+        ""
+    )
+    app.add_config_value(
+        "localtoc_css_minify",
+        False,
+        ""
+    )
+    app.add_config_value(
+        "localtoc_css_hash",
+        False,
+        "html"
+    )
+    app.add_config_value(
+        "localtoc_css_inline",
+        False,
+        "html"
+    )
+
+    app.connect("builder-inited", profiled("builder-inited", _write_full_css))
+    app.connect("env-updated", profiled("env-updated", _write_pruned_css))
+    add_html_hook(app, "html-page-context", _inline_critical_css)
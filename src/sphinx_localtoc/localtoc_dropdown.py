@@ -3,19 +3,43 @@
 #//|>-----------------------------------------------------------------------------------------------------------------<|
 
 #// IMPORT
-from bs4 import BeautifulSoup
-from bs4.element import Tag
-from bs4.element import ResultSet
-from bs4.element import AttributeValueList
+from docutils import nodes
+from typing import Any
 from typing import Iterator
+from typing import TYPE_CHECKING
 
+from sphinx import addnodes
 from sphinx.application import Sphinx
 
+from .localtoc_ids import TOGGLE_PREFIX
+from .localtoc_ids import toggle_id
+from .localtoc_nodes import ENGINE as NODES_ENGINE
+from .localtoc_nodes import first_child
+from .localtoc_pipeline import add_stage
+from .localtoc_stream import ENGINE as STREAM_ENGINE
+from .localtoc_stream import StreamPlan
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from bs4.element import AttributeValueList
+    from bs4.element import Tag
+
 
 #// LOGIC
-def _walk_list(root_ul: Tag, depth: int=0) -> Iterator[tuple[int, Tag, Tag|None, bool]]:
+def first_list(li: "Tag") -> "Tag|None":
+    """
+    Get the first direct <ul> child of the <li>, looking at its own children only.
     """
-    Walk a nested <ul>/<li> tree and yield per <li> metadata.
+    # Strings and comments have no name
+    for child in li.children:
+        if child.name == "ul":
+            return child
+    return None
+
+
+def walk_list(root_ul: "Tag") -> "Iterator[tuple[int, Tag, Tag|None, bool, Tag]]":
+    """
+    Walk a nested <ul>/<li> tree and yield per <li> metadata, in document order.
 
     For each <ul> level, this function:
         - checks whether any <li> at this level has a nested <ul> (i.e. whether this level is "expandable")
@@ -23,163 +47,236 @@ def _walk_list(root_ul: Tag, depth: int=0) -> Iterator[tuple[int, Tag, Tag|None,
             * current depth
             * the <li> tag itself
             * whether this <li> has a nested <ul>
-            * whether any <li> at this level has a nested <ul> at all.
+            * whether any <li> at this level has a nested <ul> at all
+            * the <ul> holding the <li>
+
+    The tree is walked once with an explicit stack, so every tag is visited a constant number of times whatever the
+    depth of the ToC (no parent lookups, no nested generators).
 
     Yield information about the current <li>:
         - [int]         ➜   Current nesting level
         - [Tag]         ➜   The <li> tag itself
         - [Tag | None]  ➜   The nested <ul> of the <li>
         - [bool]        ➜   Some <li> at this level has a nested <ul>
+        - [Tag]         ➜   The <ul> holding the <li>
     """
-    # Get all direct <li> children of the current <ul>
-    items: ResultSet[Tag] = root_ul.find_all("li", recursive=False)
+    # Pending <li> as (depth, <li>, nested <ul>, has_depth, parent <ul>), the next one on top
+    stack: list[tuple[int, Tag, Tag|None, bool, Tag]] = []
+    level: tuple[Tag, int]|None = (root_ul, 0)
 
-    # Look one step ahead for nested <ul>
-    has_depth: bool = any(li.find("ul", recursive=False) for li in items)
+    while True:
+        # Expand a new level: all its direct <li> children, looking one step ahead for nested <ul>
+        if level is not None:
+            ul, depth = level
+            items: list[Tag] = [child for child in ul.children if child.name == "li"]
+            nested: list[Tag|None] = [first_list(li) for li in items]
+            has_depth: bool = any(sub is not None for sub in nested)
 
-    # Process each <li> at this level
-    for li in items:
-        # Only bother checking for a nested <ul> if at least one item at this level has it
-        ul: Tag|None = None
-        if has_depth:
-            ul = li.find("ul", recursive=False)
+            # Pushed in reverse, so they come out in document order
+            for li, sub in zip(reversed(items), reversed(nested), strict=True):
+                stack.append((depth, li, sub, has_depth, ul))
 
-        # Yield information about this <li>
-        yield depth, li, ul, has_depth
+        if not stack: return
 
-        # If this <li> has a nested <ul>, recurse into it at the next depth
-        if ul is not None:
-            yield from _walk_list(ul, depth + 1)
+        entry: tuple[int, Tag, Tag|None, bool, Tag] = stack.pop()
+        yield entry
+
+        # If this <li> has a nested <ul>, it is walked right after it at the next depth
+        level = None if entry[2] is None else (entry[2], entry[0] + 1)
 
 
-def _previous_li_modified(li: Tag, hint: str, current_depth: int, config_depth: int) -> bool:
+def walk_nodes(root_list: nodes.bullet_list
+                ) -> Iterator[tuple[int, nodes.list_item, nodes.bullet_list|None, bool, nodes.bullet_list]]:
     """
-    Determine whether the parent <li> of the current item was already modified.
+    Same as :func:`walk_list`, but for the ToC docutils nodes (bullet_list / list_item).
+
+    Yield information about the current list_item:
+        - [int]                         ➜   Current nesting level
+        - [list_item]                   ➜   The list_item node itself
+        - [bullet_list | None]          ➜   The nested bullet_list of the list_item
+        - [bool]                        ➜   Some list_item at this level has a nested bullet_list
+        - [bullet_list]                 ➜   The bullet_list holding the list_item
+    """
+    stack: list[tuple[int, nodes.list_item, nodes.bullet_list|None, bool, nodes.bullet_list]] = []
+    level: tuple[nodes.bullet_list, int]|None = (root_list, 0)
 
-    A parent <li> is considered "modified" if a class is starting with the :param:`hint` either:
-        - in the <li> element itself
-        - or in the first child tag (usually <input> or <label>)
+    while True:
+        if level is not None:
+            bullet_list, depth = level
+            items: list[nodes.list_item] = [
+                item for item in bullet_list.children if isinstance(item, nodes.list_item)
+            ]
+            nested: list[nodes.bullet_list|None] = [first_child(item, nodes.bullet_list) for item in items]
+            has_depth: bool = any(sub is not None for sub in nested)
 
-    :return:    True if was "modified"
-    """
-    # Skip checks for the very first depth level
-    if current_depth == 0 or current_depth == config_depth:
-        return False
+            for item, sub in zip(reversed(items), reversed(nested), strict=True):
+                stack.append((depth, item, sub, has_depth, bullet_list))
 
-    # Find the nearest ancestor <li>
-    parent_li = li.find_parent("li")
+        if not stack: return
 
-    # # If there's no parent <li>, nothing could have been modified
-    if parent_li is None:
-        return False
+        entry: tuple[int, nodes.list_item, nodes.bullet_list|None, bool, nodes.bullet_list] = stack.pop()
+        yield entry
 
-    # Check if the parent <li> itself has the hint related class
-    for class_name in parent_li.get("class", []):  # type: ignore[assignment]
-        if class_name.startswith(hint):
-            return True
+        level = None if entry[2] is None else (entry[2], entry[0] + 1)
 
-    # Check the parent's direct children (e.g. <input> or <label>)
-    # These are where dropdown elements are injected
-    for child in parent_li.children:
-        if isinstance(child, Tag):
-            for class_name in child.get("class", []):  # type: ignore[assignment]
-                if class_name.startswith(hint):
-                    return True
 
-            # First real child tag found, but no hint related class (e.g. <a>) ➜ not modified
-            return False
+def subtree_sizes(entries: list[tuple[int, Any, Any, bool, Any]]) -> dict[int, int]:
+    """
+    Count the entries of every list of a walked ToC, nested lists included.
+
+    :param entries: Everything :func:`walk_list` or :func:`walk_nodes` yielded, in document order
+    :return:        id() of the list ➜ amount of entries in its subtree
+    """
+    sizes: dict[int, int] = {}
 
-    # Fallback: no modification detected
-    return False
+    # Summed from the deepest entries up: a nested list always comes after the entry holding it
+    for _d, _li, sub, _hd, parent in reversed(entries):
+        sizes[id(parent)] = sizes.get(id(parent), 0) + 1 + (0 if sub is None else sizes.get(id(sub), 0))
 
+    return sizes
 
-def _html_page_context(app: Sphinx, _pn: str, _tm: str, context: dict[str, str|None], _dt: any) -> None:
+
+def inject_dropdowns(soup: "BeautifulSoup", slt_depth: int, root_ul: "Tag|None"=None, used_ids: set[str]|None=None,
+                     prefix: str=TOGGLE_PREFIX) -> None:
     """
-    Inject dropdown toggles and alignment classes into the Local ToC HTML.
+    Inject dropdown toggles and alignment classes into the ToC HTML.
 
     It rewrites the already rendered ToC HTML by adding:
         - toggle controls to <li> elements that contain nested <ul> lists (i.e. adding <input> and <label>)
         - alignment classes to sibling <li> elements when needed
+
+    The cost is linear in the amount of ToC tags: the tree is walked once and nothing is looked up again.
+
+    :param slt_depth:   Number of initial ToC depth levels to skip before applying dropdown logic
+    :param root_ul:     List to decorate, the first one of the soup by default
+    :param used_ids:    IDs already given in the page, when several lists of the page are decorated
+    :param prefix:      Prefix of the toggle IDs (see :func:`toggle_id`)
+    """
+    # No list in the ToC ➜ skip safely
+    if root_ul is None:
+        root_ul = soup.find("ul")
+    if root_ul is None: return
+
+    # IDs given to the toggle inputs, derived from the entry links (see :func:`toggle_id`)
+    if used_ids is None:
+        used_ids = set()
+
+    # Walk through all <li> elements in depth
+    for depth, li, ul, has_depth, parent_ul in walk_list(root_ul):
+
+        # Apply dropdown logic after the configured offset
+        if depth < slt_depth: continue
+
+        # Inject alignment class on the configured offset so starting depth branch items can be customized
+        if has_depth and depth == slt_depth:
+            parent_ul_classes: AttributeValueList = parent_ul.get_attribute_list("class")
+
+            if "slt-dropdown-branch" not in parent_ul_classes:
+                parent_ul_classes.append("slt-dropdown-branch")
+                parent_ul["class"] = parent_ul_classes
+
+        # Case 1: this <li> has a nested <ul> ➜ inject dropdown toggle
+        if ul is not None:
+            # The first child (usually <a>) gets the label, its link gives the ID
+            first: Tag = li.find()
+            ltt_id: str = toggle_id(first.get("href", "") if first.name == "a" else "", used_ids, prefix)
+
+            # Checkbox acts as the toggle state (CSS-driven, no JS)
+            tag_input = soup.new_tag(
+                "input",
+                attrs={
+                    "type": "checkbox",
+                    "role": "switch",
+                    "id": ltt_id,
+                    "class": "slt-dropdown"
+                }
+            )
+
+            # Label acts as the visible dropdown icon
+            tag_label = soup.new_tag(
+                "label",
+                attrs={
+                    "for": ltt_id,
+                    "class": "slt-dropdown-icon"
+                }
+            )
+
+            # Insert label elements inside the first child (usually <a>) for easier CSS customizations
+            first.insert(0, tag_label)
+            # Insert input elements before the first child (usually <a>) for easier access of neste <ul> from CSS
+            li.insert(0, tag_input)
+
+            # Inject alignment class so nested depth items can be customized
+            nested_ul_classes: AttributeValueList = ul.get_attribute_list("class")
+            nested_ul_classes.append("slt-dropdown-depth")
+            ul["class"] = nested_ul_classes
+
+        # Case 2: this <li> do not have a nested <ul>, but at least one from the same depth level have it
+        # Case 3: this is the end of this depth level, but the parent <li> got a toggle (it is walked past the offset)
+        # Case 2 & 3 ➜ inject alignment class so leaf items line up visually
+        elif has_depth or depth > slt_depth:
+            li["class"] = li.get("class", []) + ["slt-dropdown-leaf"]  # type: ignore[assignment]
+
+
+def _dropdown_stage(app: Sphinx, soup: "BeautifulSoup", _ct: dict[str, str|None], _dt: any) -> None:
     """
-    # Feature disabled ➜ nothing to do
-    if not app.config["localtoc_dropdown"]: return
+    Inject dropdown toggles and alignment classes into the Local ToC HTML (see :func:`inject_dropdowns`).
+    """
+    # Depth offset: skip the first N levels before applying dropdown logic
+    inject_dropdowns(soup, max(app.config["localtoc_dropdown_depth"], 0))
 
-    # No ToC in the context ➜ skip safely
-    # noinspection PyBroadException
-    try:
-        toc: str = context["toc"]
-    except BaseException: return
 
+def _dropdown_nodes_stage(app: Sphinx, toc: nodes.bullet_list, _ct: dict[str, str|None], _dt: any) -> None:
+    """
+    Same as :func:`_dropdown_stage`, but decorating the ToC docutils nodes before they are rendered.
+
+    The toggles are added as raw HTML nodes, matching the markup of the "soup" engine.
+    """
     # Depth offset: skip the first N levels before applying dropdown logic
     slt_depth: int = max(app.config["localtoc_dropdown_depth"], 0)
 
-    # Counter used to generate unique IDs for toggle inputs
-    slt_index: int = 0
+    # IDs given to the toggle inputs, derived from the entry links (see :func:`toggle_id`)
+    used_ids: set[str] = set()
 
-    # Parse the ToC HTML into a BeautifulSoup system for easier life
-    soup: BeautifulSoup = BeautifulSoup(toc, "html.parser")
-
-    # Walk through all <li> elements in depth
-    for depth, li, ul, has_depth in _walk_list(soup.find("ul")):
+    # Walk through all list_item nodes in depth
+    for depth, item, sub, has_depth, parent in walk_nodes(toc):
 
         # Apply dropdown logic after the configured offset
-        if depth >= slt_depth:
-
-            # Inject alignment class on the configured offset so starting depth branch items can be customized
-            if has_depth and depth == slt_depth:
-                # Find the nearest ancestor <ul> (usually the parent)
-                parent_ul: Tag|None = li.find_parent("ul")
-
-                if parent_ul is not None:
-                    parent_ul_classes: AttributeValueList = parent_ul.get_attribute_list("class")
-
-                    if "slt-dropdown-branch" not in parent_ul_classes:
-                        parent_ul_classes.append("slt-dropdown-branch")
-                        parent_ul["class"] = parent_ul_classes
-
-            # Case 1: this <li> has a nested <ul> ➜ inject dropdown toggle
-            if ul is not None:
-                slt_index += 1
-                ltt_id: str = f"slt-dropdown-{slt_index}"
-
-                # Checkbox acts as the toggle state (CSS-driven, no JS)
-                tag_input = soup.new_tag(
-                    "input",
-                    attrs={
-                        "type": "checkbox",
-                        "role": "switch",
-                        "id": ltt_id,
-                        "class": "slt-dropdown"
-                    }
-                )
-
-                # Label acts as the visible dropdown icon
-                tag_label = soup.new_tag(
-                    "label",
-                    attrs={
-                        "for": ltt_id,
-                        "class": "slt-dropdown-icon"
-                    }
-                )
-
-                # Insert label elements inside the first child (usually <a>) for easier CSS customizations
-                li.find().insert(0, tag_label)
-                # Insert input elements before the first child (usually <a>) for easier access of neste <ul> from CSS
-                li.insert(0, tag_input)
-
-                # Inject alignment class so nested depth items can be customized
-                nested_ul_classes: AttributeValueList = ul.get_attribute_list("class")
-                nested_ul_classes.append("slt-dropdown-depth")
-                ul["class"] = nested_ul_classes
-
-            # Case 2: this <li> do not have a nested <ul>, but at least one from the same depth level have it
-            # Case 3: this is the end of this depth level, but the parent <li> was modified earlier
-            # Case 2 & 3 ➜ inject alignment class so leaf items line up visually
-            elif has_depth or _previous_li_modified(li, "slt-dropdown", depth, slt_depth):
-                li["class"] = li.get("class", []) + ["slt-dropdown-leaf"]  # type: ignore[assignment]
-                
-    # Replace the original ToC HTML with the modified version
-    context["toc"] = soup.decode()
+        if depth < slt_depth: continue
+
+        # Inject alignment class on the configured offset so starting depth branch items can be customized
+        if has_depth and depth == slt_depth and "slt-dropdown-branch" not in parent["classes"]:
+            parent["classes"].append("slt-dropdown-branch")
+
+        # Case 1: this list_item has a nested bullet_list ➜ inject dropdown toggle
+        if sub is not None:
+            # Label goes inside the reference (rendered as <a>), input goes before its paragraph
+            paragraph: nodes.Node|None = first_child(item, addnodes.compact_paragraph)
+            reference: nodes.Node|None = None if paragraph is None else first_child(paragraph, nodes.reference)
+            ltt_id: str = toggle_id("" if reference is None else reference.get("refuri", ""), used_ids)
+            if reference is not None:
+                reference.insert(0, nodes.raw(
+                    "", f'<label class="slt-dropdown-icon" for="{ltt_id}"></label>', format="html"
+                ))
+            item.insert(0, nodes.raw(
+                "", f'<input class="slt-dropdown" id="{ltt_id}" role="switch" type="checkbox"/>', format="html"
+            ))
+
+            # Inject alignment class so nested depth items can be customized
+            sub["classes"].append("slt-dropdown-depth")
+
+        # Case 2: this list_item do not have a nested bullet_list, but at least one from the same depth level have it
+        # Case 3: this is the end of this depth level, but the parent list_item got a toggle
+        # Case 2 & 3 ➜ inject alignment class so leaf items line up visually
+        elif has_depth or depth > slt_depth:
+            item["classes"].append("slt-dropdown-leaf")
+
+
+def _dropdown_stream_stage(app: Sphinx, plan: StreamPlan, _ct: dict[str, str|None], _dt: any) -> None:
+    """
+    Same as :func:`_dropdown_stage`, but only handing the depth offset to the "stream" engine.
+    """
+    plan.dropdown_depth = max(app.config["localtoc_dropdown_depth"], 0)
 
 
 def setup_dropdown(app: Sphinx) -> None:
@@ -198,8 +295,8 @@ def setup_dropdown(app: Sphinx) -> None:
         localtoc_dropdown_depth (int)
             Number of initial ToC depth levels to skip before applying dropdown logic.
 
-    Connected events:
-        html-page-context
+    Pipeline stages added:
+        dropdown
             Used to modify context["toc"] before the page is rendered.
     """
     app.add_config_value(
@@ -213,4 +310,7 @@ def setup_dropdown(app: Sphinx) -> None:
         "html"
     )
 
-    app.connect("html-page-context", _html_page_context)
+    options: tuple[str, ...] = ("localtoc_dropdown_depth",)
+    add_stage(app, "dropdown", _dropdown_stage, "localtoc_dropdown", 500, options=options)
+    add_stage(app, "dropdown", _dropdown_nodes_stage, "localtoc_dropdown", 500, NODES_ENGINE, options=options)
+    add_stage(app, "dropdown", _dropdown_stream_stage, "localtoc_dropdown", 500, STREAM_ENGINE, options=options)
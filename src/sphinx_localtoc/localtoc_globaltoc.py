@@ -0,0 +1,386 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import html
+import re
+
+from collections import Counter
+from docutils import nodes
+from functools import partial
+from typing import Any
+from typing import TYPE_CHECKING
+
+from sphinx.application import Sphinx
+from sphinx.builders.html import StandaloneHTMLBuilder
+from sphinx.environment import BuildEnvironment
+from sphinx.environment.adapters.toctree import global_toctree_for_doc
+
+from .localtoc_dropdown import first_list
+from .localtoc_dropdown import walk_list
+from .localtoc_dropdown import inject_dropdowns
+from .localtoc_pipeline import add_html_hook
+from .localtoc_pipeline import parse_fragment
+from .localtoc_pipeline import serialize_fragment
+from .localtoc_pipeline import soup_parser
+from .localtoc_type import page_index
+from .localtoc_type import add_type_filters
+from .localtoc_type import decorate_types
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from bs4.element import Tag
+
+
+#// GLOBAL VARIABLES
+# Prefix of the toggle IDs of the navigation, apart from the ones of the local ToC rendered in the same page
+NAV_TOGGLE_PREFIX: str = "slt-nav-"
+
+# Document the page independent navigation is resolved for: there is none of that name, so no entry is "current"
+_NEUTRAL: str = "\0"
+
+# Slots left in the serialized navigation, filled for each page:
+#   class="... \0cN\0 ..."  ➜   the "current" class of the entries on the path to the page, and the dropdown
+#                               alignment classes, which depend on the branches kept for the page
+#   href="\0hN\0"           ➜   a link, relative to the page
+#   \0sN\0 ... \0eN\0       ➜   the nested list of a branch and its toggle, dropped when collapsed
+_SLOTS: re.Pattern[str] = re.compile(r' class="([^"]*?)\0c(\d+)\0([^"]*)"| href="\0h(\d+)\0"|\0([se])(\d+)\0')
+
+# Dropdown alignment classes given per page (see :func:`inject_dropdowns`)
+_LEAF_CLASS: str = "slt-dropdown-leaf"
+_BRANCH_CLASS: str = "slt-dropdown-branch"
+
+
+#// LOGIC
+class NavTemplate:
+    """
+    Decorated global navigation of one set of `toctree()` options, built once per build for all pages.
+
+    The navigation is resolved for no page at all, decorated, and serialized with slots around its page dependent
+    bits. Rendering it for a page is then a single join: the links are made relative to the page, and the entries
+    on the path to the page get the "current" class and stay expanded, as Sphinx renders them.
+
+    When collapsed, the other branches are dropped with their toggles, and the alignment classes follow the branches
+    kept: the page gets the same markup as its own navigation decorated by the dropdown stage.
+    """
+    __slots__ = ("parts", "ends", "links", "current", "opened", "aligns")
+
+    def __init__(self, app: Sphinx, kwargs: dict[str, Any]) -> None:
+        """
+        :param kwargs:  Options of the `toctree()` template function, except `collapse` (applied per page)
+        """
+        builder: StandaloneHTMLBuilder = app.builder
+        toctree: nodes.Element|None = global_toctree_for_doc(
+            app.env, _NEUTRAL, builder, tags=builder.tags, collapse=False, **kwargs
+        )
+        soup: "BeautifulSoup" = parse_fragment(builder.render_partial(toctree)["fragment"], soup_parser(app))
+
+        # Link of a document from the neutral page ➜ document name
+        docs: dict[str, str] = {builder.get_relative_uri(_NEUTRAL, docname): docname for docname in app.env.found_docs}
+
+        # Links to the documents as (document, anchor), by slot
+        self.links: list[tuple[str, str]] = []
+        # Document ➜ class slot ➜ amount of "current" classes (an entry listed twice is marked twice)
+        self.current: dict[str, Counter[int]] = {}
+        # Document ➜ branches holding a link to it, which stay expanded
+        self.opened: dict[str, set[int]] = {}
+        # Class slot ➜ alignment class as (class, own branch, branches of its level, deep, given when expanded)
+        self.aligns: dict[int, tuple[str, int|None, tuple[int, ...], bool, bool]] = {}
+
+        # Entries with a nested list, in document order
+        branches: list["Tag"] = [li for li in soup.find_all("li") if first_list(li) is not None]
+        branch_of: dict[int, int] = {id(li): branch for branch, li in enumerate(branches)}
+
+        # Tags getting a class slot, by slot
+        marked: dict[int, "Tag"] = {}
+        slot_of: dict[int, int] = {}
+
+        def slot(tag: "Tag") -> int:
+            """
+            Get the class slot of a tag, given on first use.
+            """
+            if id(tag) not in slot_of:
+                slot_of[id(tag)] = len(marked)
+                marked[len(marked)] = tag
+            return slot_of[id(tag)]
+
+        anchors: list["Tag"] = []
+        root: "Tag" = soup.body if soup.asi_leading is not None else soup
+
+        for element in soup.find_all("a"):
+            path, _, anchor = element.get("href", "").partition("#")
+            docname: str|None = docs.get(path)
+
+            # External links are the same for every page
+            if docname is None: continue
+
+            anchors.append(element)
+            self.links.append((docname, anchor))
+
+            # Canonical link while decorating: it gives the types and the toggle IDs, the same for every page
+            element["href"] = f"{docname}#{anchor}" if anchor else docname
+
+            # The link and its ancestors, as Sphinx walks them up
+            path_tags: list["Tag"] = [element]
+            for parent in element.parents:
+                if parent is root: break
+                path_tags.append(parent)
+
+            self.opened.setdefault(docname, set()).update(
+                branch_of[id(tag)] for tag in path_tags if id(tag) in branch_of
+            )
+
+            # Only the links to the page itself (not to one of its sections) mark the branch "current"
+            if anchor: continue
+
+            counter: Counter[int] = self.current.setdefault(docname, Counter())
+            for tag in path_tags:
+                counter[slot(tag)] += 1
+
+        # One list per toctree of the root document
+        root_lists: list["Tag"] = [ul for ul in soup.find_all("ul") if ul.find_parent("ul") is None]
+        slt_depth: int = max(app.config["localtoc_globaltoc_dropdown_depth"], 0)
+
+        # Same rules as the dropdown stage, but with the branches kept for the page (see :meth:`render`)
+        if app.config["localtoc_dropdown"]:
+            for ul in root_lists:
+                entries: list[tuple[int, "Tag", "Tag|None", bool, "Tag"]] = list(walk_list(ul))
+
+                # id() of a list ➜ its branches
+                levels: dict[int, list[int]] = {}
+                for _d, li, sub, _hd, parent_ul in entries:
+                    if sub is not None:
+                        levels.setdefault(id(parent_ul), []).append(branch_of[id(li)])
+
+                for depth, li, sub, has_depth, parent_ul in entries:
+                    if depth < slt_depth: continue
+                    level: tuple[int, ...] = tuple(levels.get(id(parent_ul), ()))
+
+                    if has_depth and depth == slt_depth:
+                        self.aligns[slot(parent_ul)] = (_BRANCH_CLASS, None, level, False, True)
+
+                    own: int|None = None if sub is None else branch_of[id(li)]
+                    self.aligns[slot(li)] = (
+                        _LEAF_CLASS, own, level, depth > slt_depth, sub is None and (has_depth or depth > slt_depth)
+                    )
+
+        # Sphinx puts "current" first in the classes of a link and last in the other ones (before the decorations)
+        for slot, tag in marked.items():
+            token: str = f"\0c{slot}\0"
+            classes: list[str] = list(tag.get("class", []))
+            tag["class"] = [token] + classes if tag.name == "a" else classes + [token]
+
+        if app.config["localtoc_type"]:
+            types: dict[str, str] = {}
+            for docname, anchor in self.links:
+                obj_type: str|None = anchor and (page_index(app, docname) or {}).get(anchor)
+                if obj_type:
+                    types.setdefault(f"{docname}#{anchor}", obj_type)
+            decorate_types(soup, types)
+
+        if app.config["localtoc_type"] and app.config["localtoc_type_filter"]:
+            for ul in root_lists:
+                add_type_filters(ul)
+
+        if app.config["localtoc_dropdown"]:
+            # All the lists share the IDs of the page
+            used_ids: set[str] = set()
+            for ul in root_lists:
+                inject_dropdowns(soup, slt_depth, ul, used_ids, NAV_TOGGLE_PREFIX)
+
+            # The alignment classes are given by the slots (always the last ones of their tag)
+            for slot, (name, *_rest) in self.aligns.items():
+                classes = marked[slot].get_attribute_list("class")
+                marked[slot]["class"] = [value for value in classes if value != name]
+
+        for branch, li in enumerate(branches):
+            # The toggle and its label are dropped with the nested list when collapsed
+            toggle: "Tag|None" = li.find("input", class_="slt-dropdown", recursive=False)
+            if toggle is not None:
+                first: "Tag" = toggle.find_next_sibling()
+                label: "Tag|None" = first.find("label", class_="slt-dropdown-icon", recursive=False)
+                for tag in (toggle, label):
+                    if tag is None: continue
+                    tag.insert_before(f"\0s{branch}\0")
+                    tag.insert_after(f"\0e{branch}\0")
+
+            # The nested list (and its line break) is dropped when collapsed
+            ul: "Tag" = first_list(li)
+            end: Any = ul.next_sibling if isinstance(ul.next_sibling, str) and not ul.next_sibling.strip() else ul
+            ul.insert_before(f"\0s{branch}\0")
+            end.insert_after(f"\0e{branch}\0")
+
+        for link, element in enumerate(anchors):
+            element["href"] = f"\0h{link}\0"
+
+        # Literal strings and slots, the start of a droppable list knows where it ends
+        self.parts: list[str|tuple[Any, ...]] = []
+        self.ends: dict[int, int] = {}
+        starts: dict[int, int] = {}
+        navigation: str = serialize_fragment(soup)
+        position: int = 0
+
+        for match in _SLOTS.finditer(navigation):
+            self.parts.append(navigation[position:match.start()])
+            position = match.end()
+
+            before, slot, after, link, edge, edge_branch = match.groups()
+            if slot is not None:
+                self.parts.append(("c", int(slot), before.split(), after.split()))
+            elif link is not None:
+                self.parts.append(("h", int(link)))
+            elif edge == "s":
+                starts[int(edge_branch)] = len(self.parts)
+                self.parts.append(("s", int(edge_branch)))
+            else:
+                self.ends[starts[int(edge_branch)]] = len(self.parts)
+                self.parts.append(("e", int(edge_branch)))
+
+        self.parts.append(navigation[position:])
+
+    def render(self, app: Sphinx, pagename: str, collapse: bool) -> str:
+        """
+        Fill the slots for a page.
+
+        :param collapse:    Collapse the branches which do not lead to the page, as the `toctree()` option does
+        """
+        current: Counter[int] = self.current.get(pagename, Counter())
+        opened: set[int] = self.opened.get(pagename, set())
+
+        html_parts: list[str] = []
+        index: int = 0
+        while index < len(self.parts):
+            part: str|tuple[Any, ...] = self.parts[index]
+
+            if isinstance(part, str):
+                html_parts.append(part)
+
+            elif part[0] == "h":
+                docname, anchor = self.links[part[1]]
+                uri: str = _relative_uri(app, pagename, docname) + (f"#{anchor}" if anchor else "")
+                html_parts.append(f' href="{html.escape(uri or "#", quote=True)}"')
+
+            elif part[0] == "c":
+                classes: list[str] = part[2] + ["current"] * current[part[1]] + part[3]
+                align: tuple[str, int|None, tuple[int, ...], bool, bool]|None = self.aligns.get(part[1])
+                if align is not None and _aligned(align, collapse, opened):
+                    classes.append(align[0])
+                if classes:
+                    html_parts.append(f' class="{" ".join(classes)}"')
+
+            elif part[0] == "s" and collapse and part[1] not in opened:
+                index = self.ends[index]
+
+            index += 1
+
+        return "".join(html_parts)
+
+
+def _aligned(align: tuple[str, int|None, tuple[int, ...], bool, bool], collapse: bool, opened: set[int]) -> bool:
+    """
+    Check whether an entry (or a list) gets its alignment class in the navigation of a page.
+
+    :param align:       Alignment class as (class, own branch, branches of its level, deep, given when expanded)
+    :param opened:      Branches kept expanded for the page
+    """
+    name, own, level, deep, expanded = align
+    if not collapse: return expanded
+
+    # A kept branch has a toggle, the other entries line up with the ones of their level
+    if own is not None and own in opened: return False
+    return (deep and name == _LEAF_CLASS) or any(branch in opened for branch in level)
+
+
+def _relative_uri(app: Sphinx, pagename: str, docname: str) -> str:
+    """
+    Get the link from a page to a document, computed once per directory of the pages (only the directory matters).
+    """
+    # The page itself, Sphinx links it as "#"
+    if docname == pagename: return ""
+
+    folder: str = app.builder.get_target_uri(pagename).rpartition("/")[0]
+    uris: dict[str, str] = app.asi_localtoc_nav_uris.setdefault(folder, {})
+
+    if docname not in uris:
+        uris[docname] = app.builder.get_relative_uri(pagename, docname)
+    return uris[docname]
+
+
+def _toctree(app: Sphinx, pagename: str, collapse: bool=True, **kwargs: Any) -> str:
+    """
+    Replacement of the `toctree()` template function, rendering the memoized navigation of its options.
+    """
+    # Same defaults as Sphinx
+    if "includehidden" not in kwargs:
+        kwargs["includehidden"] = False
+    if kwargs.get("maxdepth") == "":
+        kwargs.pop("maxdepth")
+
+    key: tuple[tuple[str, str], ...] = tuple(sorted((name, repr(value)) for name, value in kwargs.items()))
+    template: NavTemplate|None = app.asi_localtoc_navs.get(key)
+    if template is None:
+        template = app.asi_localtoc_navs[key] = NavTemplate(app, kwargs)
+
+    return template.render(app, pagename, bool(collapse))
+
+
+def _reset(app: Sphinx, _env: BuildEnvironment) -> None:
+    """
+    Forget the navigations of an earlier build, the documents may have changed.
+    """
+    app.asi_localtoc_navs = {}
+    app.asi_localtoc_nav_uris = {}
+
+
+def _wrap_toctree(app: Sphinx, pagename: str, _tm: str, context: dict[str, Any], _dt: nodes.document|None) -> None:
+    """
+    Hand the memoized navigation to the templates of the page.
+    """
+    if not app.config["localtoc_globaltoc"] or "toctree" not in context: return
+
+    # Builders resolving the navigation their own way (e.g. "singlehtml") keep it
+    if type(app.builder)._get_local_toctree is not StandaloneHTMLBuilder._get_local_toctree: return
+
+    context["toctree"] = partial(_toctree, app, pagename)
+
+
+def setup_globaltoc(app: Sphinx) -> None:
+    """
+    Register configuration values and event hooks for the decorated global navigation.
+
+    Config values added:
+        localtoc_globaltoc (bool)
+            Decorate the navigation rendered by the `toctree()` template function too (object types and dropdown
+            toggles, following `localtoc_type` and `localtoc_dropdown`).
+
+            The navigation is decorated once per build and set of options, then only its links and "current"
+            entries are filled for each page. A collapsed navigation drops the branches not leading to the page as
+            Sphinx does, only the kept ones get dropdown toggles.
+
+        localtoc_globaltoc_dropdown_depth (int)
+            Number of initial navigation depth levels to skip before applying dropdown logic.
+
+    Connected events:
+        env-updated (HTML builders only)
+            Forget the navigations of an earlier build.
+
+        html-page-context (HTML builders only)
+            Replace the `toctree()` template function of the page.
+    """
+    app.add_config_value(
+        "localtoc_globaltoc",
+        False,
+        "html"
+    )
+    app.add_config_value(
+        "localtoc_globaltoc_dropdown_depth",
+        0,
+        "html"
+    )
+
+    app.asi_localtoc_navs = {}
+    app.asi_localtoc_nav_uris = {}
+
+    add_html_hook(app, "env-updated", _reset)
+    add_html_hook(app, "html-page-context", _wrap_toctree)
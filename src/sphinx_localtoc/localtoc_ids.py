@@ -0,0 +1,42 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import re
+
+
+#// GLOBAL VARIABLES
+# Prefix of the dropdown toggle IDs, it keeps them apart from the anchors of the page
+TOGGLE_PREFIX: str = "slt-dropdown-"
+
+# Anchor of the entries linking to the page itself (the page title)
+_TOP: str = "top"
+
+# Characters kept in the IDs as they are, anything else becomes "-" (no escaping is ever needed)
+_UNSAFE: re.Pattern[str] = re.compile(r"[^\w.:-]+")
+
+
+#// LOGIC
+def toggle_id(href: str, used: set[str], prefix: str=TOGGLE_PREFIX) -> str:
+    """
+    Get the ID of a dropdown toggle from the link of its ToC entry, unique within the page.
+
+    The ID does not depend on the position of the entry, so adding a section only changes the toggles it adds and
+    the rest of the ToC stays byte-identical. Colliding IDs get a "-2", "-3", ... suffix, in document order.
+
+    :param href:    Link of the entry, "#" or empty for the page itself
+    :param used:    IDs already given in the page, updated with the new one
+    :param prefix:  Prefix of the ID, a ToC rendered next to the local one (e.g. the global navigation) has its own
+    """
+    anchor: str = _UNSAFE.sub("-", href.strip().lstrip("#")) or _TOP
+    base: str = f"{prefix}{anchor}"
+
+    ltt_id: str = base
+    suffix: int = 1
+    while ltt_id in used:
+        suffix += 1
+        ltt_id = f"{base}-{suffix}"
+
+    used.add(ltt_id)
+    return ltt_id
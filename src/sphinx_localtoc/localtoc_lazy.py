@@ -0,0 +1,211 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import json
+
+from importlib.resources import files
+from pathlib import Path
+from typing import Callable
+from typing import TYPE_CHECKING
+
+from sphinx.application import Sphinx
+
+from .localtoc_dropdown import walk_list
+from .localtoc_dropdown import subtree_sizes
+from .localtoc_pipeline import add_html_hook
+from .localtoc_pipeline import add_stage
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from bs4.element import Tag
+
+
+#// GLOBAL VARIABLES
+# Fragment files, relative to the static directory of the output (one JSON file per page)
+FRAGMENT_DIR: str = "localtoc"
+
+# Script filling the lazy subtrees, relative to the static directory of the package
+SCRIPT_FILE: str = "scripts/localtoc_lazy.js"
+
+# Class of the entry standing in for a moved subtree until the script fills it
+FALLBACK_CLASS: str = "slt-dropdown-lazy-fallback"
+
+
+#// LOGIC
+def _fragment_file(app: Sphinx, pagename: str) -> Path:
+    """
+    Get the fragment file of a page.
+    """
+    return Path(app.outdir) / "_static" / FRAGMENT_DIR / f"{pagename}.json"
+
+
+def _lazy_stage(app: Sphinx, soup: "BeautifulSoup", context: dict[str, str|None], _dt: any) -> None:
+    """
+    Move the big or deep subtrees of the Local ToC out of the page, into a fragment file next to it.
+
+    A subtree is the nested <ul> of a toggled <li>. It is left in the page with the "slt-dropdown-lazy" class, the
+    data the script needs to fill it (fragment file and key), and its toggle starts closed. Only the outermost lazy
+    subtrees are moved: a fragment holds its whole subtree.
+
+    Until the script fills it (or without JavaScript), the list holds a single entry linking the section of the moved
+    entries, so opening the toggle always leads somewhere.
+    """
+    # Nothing toggled ➜ nothing to move
+    if not app.config["localtoc_dropdown"]: return
+
+    root_ul: "Tag|None" = soup.find("ul")
+    if root_ul is None: return
+
+    lazy_depth: int = max(app.config["localtoc_dropdown_lazy_depth"], 0)
+    lazy_size: int = max(app.config["localtoc_dropdown_lazy_size"], 0)
+    if not lazy_depth and not lazy_size: return
+
+    entries: list[tuple[int, "Tag", "Tag|None", bool, "Tag"]] = list(walk_list(root_ul))
+    sizes: dict[int, int] = subtree_sizes(entries)
+
+    pagename: str = context.get("pagename") or ""
+    pathto: Callable[..., str]|None = context.get("pathto")
+    source: str = pathto(f"_static/{FRAGMENT_DIR}/{pagename}.json", 1) if pathto else ""
+
+    # Key ➜ inner HTML of the moved subtree
+    fragments: dict[str, str] = {}
+    # Lists already inside a moved subtree
+    moved: set[int] = set()
+    label: str = app.config["localtoc_dropdown_lazy_label"]
+
+    for depth, li, ul, _hd, parent_ul in entries:
+        if id(parent_ul) in moved:
+            if ul is not None:
+                moved.add(id(ul))
+            continue
+
+        # Only the toggled <li> (see the dropdown stage) can open a lazy subtree
+        toggle: "Tag|None" = li.find("input", class_="slt-dropdown", recursive=False)
+        if ul is None or toggle is None: continue
+
+        if (lazy_depth and depth + 1 >= lazy_depth) or (lazy_size and sizes.get(id(ul), 0) >= lazy_size):
+            key: str = toggle.get("id", "")
+            fragments[key] = ul.decode_contents()
+            moved.add(id(ul))
+
+            # The section link of the <li> (the page itself for the title entry)
+            link: "Tag|None" = li.find("a", recursive=False)
+            tag_link = soup.new_tag("a", attrs={
+                "class": "reference internal", "href": "#" if link is None else link.get("href", "#"),
+            })
+            tag_link.string = label.format(count=sizes.get(id(ul), 0))
+            tag_fallback = soup.new_tag("li", attrs={"class": FALLBACK_CLASS})
+            tag_fallback.append(tag_link)
+
+            ul.clear()
+            ul.append(tag_fallback)
+            ul["class"] = ul.get_attribute_list("class") + ["slt-dropdown-lazy"]
+            ul["data-slt-src"] = source
+            ul["data-slt-key"] = key
+
+            # Closed until it is opened (and filled) by the reader
+            toggle["checked"] = ""
+
+    # Every page writes its own file, so the parallel writers (`sphinx-build -j`) never share one
+    fragment_file: Path = _fragment_file(app, pagename)
+
+    # Nothing moved anymore ➜ the file of an earlier build is stale
+    if not fragments:
+        fragment_file.unlink(missing_ok=True)
+        return
+
+    fragment_file.parent.mkdir(parents=True, exist_ok=True)
+    fragment_file.write_text(json.dumps(fragments, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+
+def _prune(app: Sphinx, exception: Exception|None) -> None:
+    """
+    Drop the fragment files of the pages which are gone (removed or renamed), or all of them when the mode is off.
+    """
+    # Skip if the build failed
+    if exception is not None: return
+
+    root: Path = Path(app.outdir) / "_static" / FRAGMENT_DIR
+    if not root.is_dir(): return
+
+    pages: set[str] = set(app.env.found_docs) if app.config["localtoc_dropdown_lazy"] else set()
+
+    for file in root.rglob("*.json"):
+        if file.relative_to(root).with_suffix("").as_posix() not in pages:
+            file.unlink(missing_ok=True)
+
+    # Folders of the nested pages left empty, deepest first
+    for folder in sorted(root.rglob("*/"), key=lambda path: len(path.parts), reverse=True):
+        if folder.is_dir() and not any(folder.iterdir()):
+            folder.rmdir()
+
+
+def _add_script(app: Sphinx) -> None:
+    """
+    Ship the script filling the lazy subtrees, only when the mode is used.
+    """
+    if app.builder.format != "html" or not app.config["localtoc_dropdown_lazy"]: return
+
+    app.config.html_static_path.append(str(files(__package__) / "_static"))
+    app.add_js_file(SCRIPT_FILE, defer="defer")
+
+
+def setup_lazy(app: Sphinx) -> None:
+    """
+    Register configuration values and event hooks for the lazy subtrees of the Local ToC dropdown feature.
+
+    Config values added:
+        localtoc_dropdown_lazy (bool)
+            Move the big or deep ToC subtrees out of the pages, they are loaded when their dropdown is first opened.
+
+        localtoc_dropdown_lazy_depth (int)
+            Nested lists starting at this ToC depth are lazy (0 ➜ no depth limit).
+
+        localtoc_dropdown_lazy_size (int)
+            Nested lists holding at least this amount of entries are lazy (0 ➜ no size limit).
+
+        localtoc_dropdown_lazy_label (str)
+            Text of the section link shown in a lazy subtree until it is filled (or without JavaScript), "{count}"
+            is replaced with the amount of moved entries.
+
+    Connected events:
+        builder-inited
+            Add the script which fills the lazy subtrees, for the HTML builders.
+
+        build-finished (HTML builders only)
+            Drop the fragment files of the pages which are gone.
+
+    Pipeline stages added:
+        lazy
+            Runs after the dropdown stage, only on the "soup" engine.
+    """
+    app.add_config_value(
+        "localtoc_dropdown_lazy",
+        False,
+        "html"
+    )
+    app.add_config_value(
+        "localtoc_dropdown_lazy_depth",
+        3,
+        "html"
+    )
+    app.add_config_value(
+        "localtoc_dropdown_lazy_size",
+        50,
+        "html"
+    )
+    app.add_config_value(
+        "localtoc_dropdown_lazy_label",
+        "{count} entries…",
+        "html"
+    )
+
+    app.connect("builder-inited", _add_script)
+    add_html_hook(app, "build-finished", _prune, priority=900)
+    options: tuple[str, ...] = (
+        "localtoc_dropdown", "localtoc_dropdown_lazy_depth", "localtoc_dropdown_lazy_size",
+        "localtoc_dropdown_lazy_label",
+    )
+    add_stage(app, "lazy", _lazy_stage, "localtoc_dropdown_lazy", 600, cacheable=False, options=options)
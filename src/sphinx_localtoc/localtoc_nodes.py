@@ -0,0 +1,117 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+from docutils import nodes
+from typing import Any
+
+from sphinx.application import Sphinx
+from sphinx.builders.html import StandaloneHTMLBuilder
+from sphinx.builders.singlehtml import SingleFileHTMLBuilder
+
+from .localtoc_pipeline import add_engine
+from .localtoc_pipeline import mark_rewritten
+from .localtoc_pipeline import run_stages
+from .localtoc_pipeline import select_engine
+from .localtoc_pipeline import Stage
+
+
+#// GLOBAL VARIABLES
+ENGINE: str = "nodes"
+
+# Name of the rendering in the profiling report, the stages are reported under it
+_PROFILE_HOOK: str = "render-partial:localtoc_nodes"
+
+
+#// LOGIC
+def first_child(node: nodes.Element, cls: type[nodes.Node]) -> nodes.Node|None:
+    """
+    Get the first direct child of the node which is an instance of :param:`cls`.
+    """
+    for child in node.children:
+        if isinstance(child, cls):
+            return child
+    return None
+
+
+def _nodes_parse(_app: Sphinx, _pn: str, _ct: dict[str, str|None]) -> None:
+    """
+    The pages reaching the pipeline were not rewritten while Sphinx rendered them (e.g. "singlehtml"), so they are
+    left to the default engine.
+    """
+    return None
+
+
+def _hook_builder(app: Sphinx) -> None:
+    """
+    Decorate the local ToC nodes of each page right before the builder renders them into context["toc"].
+
+    The builder renders the nodes given by `document_toc` in `get_doc_context`, where the only bullet list is the
+    local ToC (the other rendered nodes are titles). Its methods are wrapped on the instance, so the nodes are
+    decorated in place and rendered once.
+    """
+    # Only the builders which render `document_toc` as "toc" can be hooked
+    builder = app.builder
+    if not isinstance(builder, StandaloneHTMLBuilder) or isinstance(builder, SingleFileHTMLBuilder): return
+
+    # Another engine was selected, or it falls back to the default one ➜ nothing to hook
+    engine, stages = select_engine(app)
+    if engine != ENGINE or not stages: return
+
+    write_doc = builder.write_doc
+    get_doc_context = builder.get_doc_context
+    render_partial = builder.render_partial
+
+    # Doctree of the page being written, and its name while its local ToC is not rendered yet
+    state: dict[str, Any] = {}
+
+    def hooked_write_doc(docname: str, doctree: nodes.document) -> None:
+        state["doctree"] = doctree
+        try:
+            write_doc(docname, doctree)
+        finally:
+            state.clear()
+
+    def hooked_get_doc_context(docname: str, body: str, metatags: str) -> dict[str, Any]:
+        state["page"] = docname
+        try:
+            return get_doc_context(docname, body, metatags)
+        finally:
+            state.pop("page", None)
+
+    def hooked_render_partial(node: nodes.Node|None) -> dict[str, str]:
+        if "page" in state and isinstance(node, nodes.bullet_list):
+            pagename: str = state.pop("page")
+            _decorate(app, stages, node, pagename, state.get("doctree"))
+        return render_partial(node)
+
+    builder.write_doc = hooked_write_doc
+    builder.get_doc_context = hooked_get_doc_context
+    builder.render_partial = hooked_render_partial
+
+
+def _decorate(app: Sphinx, stages: dict[str, Stage], toc: nodes.bullet_list, pagename: str,
+              doctree: nodes.document|None) -> None:
+    """
+    Run the stages over the local ToC nodes of a page, and tell the pipeline not to rewrite the rendered HTML.
+
+    The page context does not exist yet, the stages get only its "pagename".
+    """
+    run_stages(app, stages, toc, pagename, {"pagename": pagename}, doctree, _PROFILE_HOOK)
+    mark_rewritten(app, pagename)
+
+
+def setup_nodes(app: Sphinx) -> None:
+    """
+    Register the "nodes" engine for the Local ToC pipeline.
+
+    This engine decorates the ToC docutils nodes (bullet_list / list_item / reference) while the builder renders
+    them, so the HTML comes out already decorated: the ToC is neither rendered twice nor parsed.
+
+    Connected events:
+        builder-inited
+            Wrap the rendering of the local ToC of the HTML builder, when the engine is selected.
+    """
+    add_engine(app, ENGINE, _nodes_parse)
+    app.connect("builder-inited", _hook_builder)
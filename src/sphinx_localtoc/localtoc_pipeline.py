@@ -0,0 +1,355 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+from docutils import nodes
+from functools import cache
+from importlib.util import find_spec
+from typing import Any
+from typing import Callable
+from typing import TYPE_CHECKING
+
+from sphinx.application import Sphinx
+from sphinx.util import logging
+
+from .localtoc_cache import cache_get
+from .localtoc_cache import cache_key
+from .localtoc_cache import cache_put
+from .localtoc_profile import measure
+from .localtoc_profile import profiled
+
+# Annotations only, bs4 itself is imported on first use (see parse_fragment)
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+
+#// GLOBAL VARIABLES
+logger = logging.getLogger(__name__)
+
+# Signature of a rewrite stage: (app, tree, context, doctree) ➜ None
+# The "tree" is whatever the engine parser returns (e.g. a BeautifulSoup for the "soup" engine)
+Stage = Callable[[Sphinx, Any, dict[str, str|None], nodes.document|None], None]
+
+# Extra inputs of a stage for the cache key: (app, pagename, doctree) ➜ any value with a stable repr()
+StageKey = Callable[[Sphinx, str, nodes.document|None], object]
+
+# Engine parser: (app, pagename, context) ➜ tree | None
+EngineParse = Callable[[Sphinx, str, dict[str, str|None]], Any]
+# Engine serializer: (app, tree) ➜ HTML
+EngineSerialize = Callable[[Sphinx, Any], str]
+
+# The engine which supports every stage, used as fallback
+DEFAULT_ENGINE: str = "soup"
+
+# BeautifulSoup parsers of the "soup" engine ("auto" ➜ lxml when installed, "html.parser" otherwise)
+PARSERS: tuple[str, ...] = ("auto", "lxml", "html.parser")
+
+# Name of the pipeline handler in the profiling report, its parts are reported under it
+_PROFILE_HOOK: str = "html-page-context:html_page_context"
+
+
+#// LOGIC
+def add_stage(app: Sphinx, name: str, callback: Stage, config: str, priority: int=500,
+              engine: str=DEFAULT_ENGINE, cache_key: StageKey|None=None, cacheable: bool=True,
+              options: tuple[str, ...]=()) -> None:
+    """
+    Register a rewrite stage for the Local ToC pipeline.
+
+    All stages share a single parsed ToC, so the HTML is parsed and serialized only once per page no matter how many
+    features are enabled. Stages run in ascending :param:`priority` order (registration order on ties).
+
+    The same feature may be registered for more than one engine under the same :param:`name`. When a feature is
+    enabled but the selected engine does not provide it, the page falls back to the default engine.
+
+    :param name:        Unique name of the stage (used for replacing an already registered stage)
+    :param callback:    Function called with (app, tree, context, doctree)
+    :param config:      Name of the config value that enables the stage (falsy value ➜ stage is skipped)
+    :param priority:    Order of execution, lower values run first
+    :param engine:      Name of the engine the callback works with
+    :param cache_key:   Function returning the page inputs of the stage other than the ToC HTML and the config values
+                        (e.g. the per page type map), so the rewrite cache can tell when they change
+    :param cacheable:   False when the stage has side effects besides the ToC (e.g. writes files), so the rewrite
+                        cache is not used for the pages it runs on
+    :param options:     Config values the output of the stage depends on, besides :param:`config` (part of the
+                        rewrite cache key)
+    """
+    registry: dict[str, list[tuple[int, str, str, Stage]]] = app.asi_localtoc_stages
+    stages: list[tuple[int, str, str, Stage]] = [stage for stage in registry.get(engine, []) if stage[1] != name]
+    stages.append((priority, name, config, callback))
+
+    # Stable sort ➜ same priority keeps the registration order
+    stages.sort(key=lambda stage: stage[0])
+    registry[engine] = stages
+
+    if cache_key is not None:
+        app.asi_localtoc_cache_keys[name] = cache_key
+    app.asi_localtoc_cache_options.update((config, *options))
+    if not cacheable:
+        app.asi_localtoc_uncached.add(name)
+
+
+def add_html_hook(app: Sphinx, event: str, callback: Callable[..., Any], priority: int=500) -> None:
+    """
+    Connect an event handler once the builder is known, and only for the HTML builders (html, dirhtml, singlehtml,
+    epub, ...), so other builders (latex, man, linkcheck, gettext, ...) pay nothing for the Local ToC.
+
+    The handlers are connected at `builder-inited`, so they can not listen to `builder-inited` itself.
+
+    :param event:       Name of the Sphinx event
+    :param callback:    The event handler
+    :param priority:    Priority of the handler, as for `app.connect`
+    """
+    app.asi_localtoc_html_hooks.append((event, callback, priority))
+
+
+def _connect_html_hooks(app: Sphinx) -> None:
+    """
+    Connect the handlers registered with :func:`add_html_hook` when the builder writes HTML.
+    """
+    if app.builder.format != "html": return
+
+    for event, callback, priority in app.asi_localtoc_html_hooks:
+        app.connect(event, callback, priority)
+
+
+def add_engine(app: Sphinx, name: str, parse: EngineParse, serialize: EngineSerialize|None=None) -> None:
+    """
+    Register a rewrite engine selectable through the `localtoc_engine` config value.
+
+    :param name:        Value of `localtoc_engine` that selects this engine
+    :param parse:       Function returning the tree the stages work on, or None to use the default engine for the page
+    :param serialize:   Function turning the tree back into the ToC HTML, None for an engine which rewrites the ToC
+                        before Sphinx renders it (see :func:`mark_rewritten`) and whose parser always gives None
+    """
+    app.asi_localtoc_engines[name] = (parse, serialize)
+
+
+def _enabled_stages(app: Sphinx, engine: str) -> dict[str, Stage]:
+    """
+    Get the enabled stages of an engine, keyed by name and in execution order.
+    """
+    return {
+        name: callback for _p, name, config, callback in app.asi_localtoc_stages.get(engine, []) if app.config[config]
+    }
+
+
+def select_engine(app: Sphinx) -> tuple[str, dict[str, Stage]]:
+    """
+    Pick the engine for the current build and the callbacks of its enabled stages.
+
+    :return:    The engine name and its enabled stages by name, in execution order
+    """
+    engine: str = app.config["localtoc_engine"]
+    if engine not in app.asi_localtoc_engines:
+        engine = DEFAULT_ENGINE
+
+    # Every feature is available on the default engine, so it tells which features are enabled
+    enabled: dict[str, Stage] = _enabled_stages(app, DEFAULT_ENGINE)
+    provided: dict[str, Stage] = _enabled_stages(app, engine)
+
+    # Some enabled feature is not provided by the selected engine ➜ the default one can do it all
+    if not enabled.keys() <= provided.keys():
+        logger.verbose(
+            "[sphinx-localtoc] engine %r does not provide %s, falling back to %r",
+            engine, ", ".join(sorted(enabled.keys() - provided.keys())), DEFAULT_ENGINE
+        )
+        engine, provided = DEFAULT_ENGINE, enabled
+
+    return engine, provided
+
+
+def run_stages(app: Sphinx, stages: dict[str, Stage], tree: Any, pagename: str, context: dict[str, str|None],
+               doctree: nodes.document|None, hook: str=_PROFILE_HOOK) -> None:
+    """
+    Run the stages over the tree of a page, in order, each one measured under :param:`hook` when profiling.
+    """
+    for name, stage in stages.items():
+        with measure(app, f"{hook}/{name}", pagename):
+            stage(app, tree, context, doctree)
+
+
+def mark_rewritten(app: Sphinx, pagename: str) -> None:
+    """
+    Tell the pipeline that the ToC of the page was rewritten before Sphinx rendered it, so the rendered one is left
+    as it is.
+    """
+    app.asi_localtoc_rewritten.add(pagename)
+
+
+@cache
+def lxml_available() -> bool:
+    """
+    Check once whether the lxml parser can be used by BeautifulSoup.
+    """
+    return find_spec("lxml") is not None
+
+
+def soup_parser(app: Sphinx) -> str:
+    """
+    Get the BeautifulSoup parser selected by the `localtoc_parser` config value ("auto" ➜ lxml when installed).
+    """
+    parser: str = app.config["localtoc_parser"]
+
+    if parser == "auto":
+        return "lxml" if lxml_available() else "html.parser"
+    if parser not in PARSERS:
+        logger.warning(f"[sphinx-localtoc] unknown localtoc_parser {parser!r}, using 'html.parser'")
+        return "html.parser"
+
+    return parser
+
+
+def parse_fragment(toc: str, parser: str) -> "BeautifulSoup":
+    """
+    Parse a ToC HTML fragment into a BeautifulSoup system, to be given back by :func:`serialize_fragment`.
+
+    :param parser:  "lxml" or "html.parser", both give the same fragment back
+    """
+    # Imported here so engines without a DOM tree never pay for it
+    from bs4 import BeautifulSoup
+
+    soup: BeautifulSoup = BeautifulSoup(toc, parser)
+
+    # lxml wraps the fragment into <html><body> and drops its leading whitespace ➜ kept to be restored
+    # (always set: a missing attribute would be looked up as a child tag by BeautifulSoup)
+    soup.asi_leading = toc[:len(toc) - len(toc.lstrip())] if parser == "lxml" else None
+
+    return soup
+
+
+def serialize_fragment(soup: "BeautifulSoup") -> str:
+    """
+    Serialize a BeautifulSoup tree made by :func:`parse_fragment` back into HTML.
+    """
+    leading: str|None = soup.asi_leading
+
+    # Parsed by lxml ➜ only the fragment itself, as "html.parser" would give it
+    if leading is not None:
+        return leading + (soup.body.decode_contents() if soup.body is not None else "")
+
+    return soup.decode()
+
+
+def _soup_parse(app: Sphinx, _pn: str, context: dict[str, str|None]) -> "BeautifulSoup":
+    """
+    Parse the rendered ToC HTML into a BeautifulSoup system for easier life.
+    """
+    return parse_fragment(context["toc"], soup_parser(app))
+
+
+def _soup_serialize(_app: Sphinx, soup: "BeautifulSoup") -> str:
+    """
+    Serialize the BeautifulSoup tree back into HTML.
+    """
+    return serialize_fragment(soup)
+
+
+def _html_page_context(app: Sphinx, pagename: str, _tm: str, context: dict[str, str|None],
+                       doctree: nodes.document|None) -> None:
+    """
+    Run all enabled rewrite stages over the Local ToC with a single parse/serialize round-trip.
+    """
+    # Only the stages enabled by the user are relevant for this page
+    engine, stages = select_engine(app)
+
+    # Nothing enabled ➜ nothing to do
+    if not stages: return
+
+    # Already rewritten before it was rendered ➜ nothing left to do
+    if pagename in app.asi_localtoc_rewritten:
+        app.asi_localtoc_rewritten.discard(pagename)
+        return
+
+    # No ToC in the context ➜ skip safely
+    toc: str|None = context.get("toc")
+    if not toc: return
+
+    # Same input as an earlier rewrite ➜ reuse its output without parsing
+    key: str|None = None
+    if app.config["localtoc_cache"] and app.asi_localtoc_uncached.isdisjoint(stages):
+        key = cache_key(app, toc, [
+            (name, app.asi_localtoc_cache_keys[name](app, pagename, doctree))
+            for name in stages if name in app.asi_localtoc_cache_keys
+        ], sorted(app.asi_localtoc_cache_options))
+
+        cached: str|None = cache_get(app, key)
+        if cached is not None:
+            context["toc"] = cached
+            return
+
+    parse, serialize = app.asi_localtoc_engines[engine]
+    with measure(app, f"{_PROFILE_HOOK}/{engine}-parse", pagename):
+        tree: Any = parse(app, pagename, context)
+
+    # The engine may refuse the page (e.g. unsupported builder) ➜ the default one can do it all
+    if tree is None:
+        engine, stages = DEFAULT_ENGINE, _enabled_stages(app, DEFAULT_ENGINE)
+        parse, serialize = app.asi_localtoc_engines[engine]
+        with measure(app, f"{_PROFILE_HOOK}/{engine}-parse", pagename):
+            tree = parse(app, pagename, context)
+
+    # Every stage works on the same tree
+    run_stages(app, stages, tree, pagename, context, doctree)
+
+    # Replace the original ToC HTML with the modified version
+    with measure(app, f"{_PROFILE_HOOK}/{engine}-serialize", pagename):
+        context["toc"] = serialize(app, tree)
+
+    if key is not None:
+        cache_put(app, key, context["toc"])
+
+
+def setup_pipeline(app: Sphinx) -> None:
+    """
+    Attach the single HTML rewrite handler shared by all Local ToC features.
+
+    Features plug into it through :func:`add_stage` instead of connecting their own handlers, so the rendered ToC is
+    parsed and serialized only once per page.
+
+    Config values added:
+        localtoc_engine (str)
+            Name of the engine used to rewrite the local ToC.
+
+            "soup" parses the rendered HTML with BeautifulSoup and supports every feature.
+            "nodes" decorates the ToC docutils nodes while Sphinx renders them.
+            "stream" rewrites the rendered HTML in a single pass over its tokens, without building a tree.
+            Other engines are faster but may support only some features, in which case "soup" is used instead.
+
+        localtoc_parser (str)
+            BeautifulSoup parser of the "soup" engine: "auto", "lxml" or "html.parser".
+
+            "auto" uses lxml when it is installed (several times faster), "html.parser" otherwise.
+            Both give the same ToC markup.
+
+    Connected events:
+        builder-inited
+            Connect the handlers of the HTML builders (see :func:`add_html_hook`).
+
+        html-page-context (HTML builders only)
+            Used to rewrite context["toc"] through all enabled stages.
+    """
+    app.add_config_value(
+        "localtoc_engine",
+        DEFAULT_ENGINE,
+        "html"
+    )
+    app.add_config_value(
+        "localtoc_parser",
+        "auto",
+        "html"
+    )
+
+    if not hasattr(app, "asi_localtoc_stages"):
+        app.asi_localtoc_stages = {}
+        app.asi_localtoc_engines = {}
+        app.asi_localtoc_cache_keys = {}
+        app.asi_localtoc_cache_options = set()
+        app.asi_localtoc_html_hooks = []
+        app.asi_localtoc_uncached = set()
+        app.asi_localtoc_rewritten = set()
+
+    add_engine(app, DEFAULT_ENGINE, _soup_parse, _soup_serialize)
+
+    app.connect("builder-inited", _connect_html_hooks, priority=100)
+    add_html_hook(app, "html-page-context", profiled("html-page-context", _html_page_context))
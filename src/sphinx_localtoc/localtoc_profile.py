@@ -0,0 +1,292 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import json
+import os
+import shutil
+import time
+import tracemalloc
+
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import IO
+from typing import Iterator
+
+from sphinx.application import Sphinx
+
+from ._version import __version__
+
+
+#// GLOBAL VARIABLES
+SPOOL_DIR: str = "localtoc_profile"
+
+# How to find the page of a hook call, from (app, args)
+_PAGE_OF: dict[str, Callable[[Sphinx, tuple[Any, ...]], str|None]] = {
+    "doctree-read": lambda app, _args: app.env.docname,
+    "html-page-context": lambda _app, args: args[0],
+}
+
+# Running measures, as [start memory, highest peak seen by nested measures]
+_frames: list[list[int]] = []
+
+
+#// LOGIC
+class Spool:
+    """
+    Records written by every process of a build (including the forked `sphinx-build -j` workers), merged at the end.
+
+    Every process gets its own JSON lines file in a directory next to the doctrees of the build, flushed on each
+    record because the workers may exit without flushing their buffers.
+    """
+    __slots__ = ("name", "_file")
+
+    def __init__(self, name: str) -> None:
+        """
+        :param name:    Directory of the spool files, inside the doctree directory
+        """
+        self.name: str = name
+        # Open spool file of the current process, as (pid, file)
+        self._file: tuple[int, IO[str]]|None = None
+
+    def directory(self, app: Sphinx) -> Path:
+        """
+        Get the directory where every process writes its records.
+        """
+        return Path(app.doctreedir) / self.name
+
+    def write(self, app: Sphinx, record: dict[str, Any]) -> None:
+        """
+        Append a record to the spool file of the current process.
+        """
+        if self._file is None or self._file[0] != os.getpid():
+            directory: Path = self.directory(app)
+            directory.mkdir(parents=True, exist_ok=True)
+            self._file = (os.getpid(), (directory / f"{os.getpid()}.jsonl").open("a", encoding="utf-8"))
+
+        self._file[1].write(json.dumps(record) + "\n")
+        self._file[1].flush()
+
+    def read(self, app: Sphinx) -> list[dict[str, Any]]:
+        """
+        Get the records of every process.
+        """
+        if self._file is not None and self._file[0] == os.getpid():
+            self._file[1].close()
+            self._file = None
+
+        records: list[dict[str, Any]] = []
+        for file in sorted(self.directory(app).glob("*.jsonl")):
+            for line in file.read_text(encoding="utf-8").splitlines():
+                if line.strip():
+                    records.append(json.loads(line))
+        return records
+
+    def reset(self, app: Sphinx) -> None:
+        """
+        Drop every record, of an earlier build or already merged.
+        """
+        shutil.rmtree(self.directory(app), ignore_errors=True)
+
+
+_spool: Spool = Spool(SPOOL_DIR)
+
+
+def _enabled(app: Sphinx) -> bool:
+    """
+    Check whether the profiling mode is enabled.
+    """
+    return bool(app.config["localtoc_profile"].strip())
+
+
+@contextmanager
+def measure(app: Sphinx, hook: str, page: str|None) -> Iterator[None]:
+    """
+    Record the wall time and the peak allocation of the wrapped code, when the profiling mode is enabled.
+
+    Measures can be nested (e.g. the stages inside `html-page-context`), the peak of a measure includes the peaks of
+    the nested ones.
+    """
+    if not _enabled(app):
+        yield
+        return
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    # The peak is reset for this measure, so the running one is handed to the parent before
+    current, peak = tracemalloc.get_traced_memory()
+    if _frames:
+        _frames[-1][1] = max(_frames[-1][1], peak)
+    tracemalloc.reset_peak()
+
+    frame: list[int] = [current, 0]
+    _frames.append(frame)
+    start: float = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        seconds: float = time.perf_counter() - start
+        peak = max(tracemalloc.get_traced_memory()[1], frame[1])
+        _frames.pop()
+
+        # The parent peak includes this one
+        if _frames:
+            _frames[-1][1] = max(_frames[-1][1], peak)
+
+        _spool.write(app, {
+            "hook": hook, "page": page, "seconds": seconds, "peak": max(peak - frame[0], 0), "pid": os.getpid()
+        })
+
+
+def profiled(hook: str, callback: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap an event handler, so each of its calls is measured when the profiling mode is enabled.
+
+    :param hook:        Name of the Sphinx event the handler is connected to
+    :param callback:    The event handler
+    """
+    page_of: Callable[[Sphinx, tuple[Any, ...]], str|None] = _PAGE_OF.get(hook, lambda _app, _args: None)
+
+    @wraps(callback)
+    def wrapper(app: Sphinx, *args: Any) -> Any:
+        if not _enabled(app):
+            return callback(app, *args)
+
+        with measure(app, f"{hook}:{callback.__name__.lstrip("_")}", page_of(app, args)):
+            return callback(app, *args)
+
+    return wrapper
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """
+    Get the nearest-rank percentile of already sorted values.
+    """
+    if not values:
+        return 0.0
+    rank: int = max(int(round(percent / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def _reset(app: Sphinx) -> None:
+    """
+    Drop the records left by an earlier build, before anything is measured.
+    """
+    if _enabled(app):
+        _spool.reset(app)
+
+
+def _report(app: Sphinx, exception: Exception|None) -> None:
+    """
+    Merge the records of every process and write the profiling report.
+    """
+    # Skip if the build failed or the profiling mode is not used
+    if exception is not None or not _enabled(app): return
+
+    # Records of every process
+    records: list[dict[str, Any]] = _spool.read(app)
+
+    # Resolve the final path
+    report_file: Path = Path(app.config["localtoc_profile"])
+    if not report_file.is_absolute():
+        report_file = Path(app.confdir) / report_file
+    report_file.parent.mkdir(parents=True, exist_ok=True)
+
+    # Timings by hook, and by page for the page related ones (nested measures are named "<hook>/<part>")
+    hooks: dict[str, list[dict[str, Any]]] = {}
+    pages: dict[str, float] = {}
+    for record in records:
+        hooks.setdefault(record["hook"], []).append(record)
+        if record["page"] is not None and "/" not in record["hook"]:
+            pages[record["page"]] = pages.get(record["page"], 0.0) + record["seconds"]
+
+    decorator: dict[str, str] = {
+        "line": f"#//|>{"-" * 113}<|",
+        "line-short": f"#//|>{"-" * 56}<|",
+        "prefix": "#//|"
+    }
+    lines: list[str] = [
+        decorator["line"],
+        f"{decorator["prefix"]} Profiling report for Sphinx extension",
+        f"{decorator["prefix"]} Local ToC: {__version__}",
+        f"{decorator["prefix"]} Project: {getattr(app.config, "project", "<unknown project>")} "
+        f"{getattr(app.config, "version", "<no-version>")}",
+        f"{decorator["prefix"]} Processes: {len(set(record.get("pid", 0) for record in records)) or 1}",
+        decorator["line"],
+        "",
+        decorator["line-short"],
+        f"{decorator["prefix"]} Hooks (times in milliseconds, peak allocation in KiB)",
+        decorator["line-short"],
+        "\t%-52.52s | %7s | %10s | %8s | %8s | %8s | %8s | %8s | %9s" % (
+            "hook", "calls", "total", "mean", "p50", "p90", "p99", "max", "peak"
+        ),
+    ]
+
+    for hook in sorted(hooks):
+        seconds: list[float] = sorted(record["seconds"] * 1000 for record in hooks[hook])
+        peak: float = max(record["peak"] for record in hooks[hook]) / 1024
+        lines.append("\t%-52.52s | %7d | %10.2f | %8.3f | %8.3f | %8.3f | %8.3f | %8.3f | %9.1f" % (
+            hook, len(seconds), sum(seconds), sum(seconds) / len(seconds),
+            _percentile(seconds, 50), _percentile(seconds, 90), _percentile(seconds, 99), seconds[-1], peak
+        ))
+
+    slowest: list[tuple[str, float]] = sorted(pages.items(), key=lambda item: item[1], reverse=True)
+    slowest = slowest[:max(app.config["localtoc_profile_top"], 0)]
+
+    lines += [
+        "",
+        decorator["line-short"],
+        f"{decorator["prefix"]} Slowest pages: {len(slowest)} from {len(pages)} (all hooks, in milliseconds)",
+        decorator["line-short"],
+    ]
+    for page, total in slowest:
+        lines.append("\t• %10.3f | %s" % (total * 1000, page))
+
+    report_file.write_text("\n".join(lines) + "\n", encoding="utf8")
+
+    _spool.reset(app)
+
+
+def setup_profile(app: Sphinx) -> None:
+    """
+    Register configuration values and event hooks for the profiling mode.
+
+    The handlers of the extension are wrapped with :func:`profiled` where they are connected, and the ToC pipeline
+    measures each of its stages with :func:`measure`.
+
+    Config values added:
+        localtoc_profile (str)
+            Absolute or relative path (including filename) to the profiling report, empty to disable the mode.
+
+            When enabled, the wall time and the peak allocation of every hook are recorded on every page.
+            If the file already exists, it will be overwritten.
+
+        localtoc_profile_top (int)
+            Amount of slowest pages listed in the report.
+
+    Connected events:
+        builder-inited
+            Drop the records left by an earlier build.
+
+        build-finished
+            Merge the records of all processes (including the parallel workers) and write the report.
+    """
+    app.add_config_value(
+        "localtoc_profile",
+        "",
+        ""
+    )
+    app.add_config_value(
+        "localtoc_profile_top",
+        20,
+        ""
+    )
+
+    app.connect("builder-inited", _reset)
+    app.connect("build-finished", _report, priority=900)
@@ -0,0 +1,200 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import csv
+import json
+import re
+
+from docutils import nodes
+from pathlib import Path
+from typing import Any
+
+from sphinx.application import Sphinx
+
+from ._version import __version__
+from .localtoc_pipeline import add_html_hook
+from .localtoc_profile import Spool
+from .localtoc_stream import link_anchor
+from .localtoc_stream import toc_tokens
+
+
+#// GLOBAL VARIABLES
+SPOOL_DIR: str = "localtoc_report"
+
+# Columns of the report, in order (the CSV report has the counts only, the anchors are listed by the JSON one)
+COLUMNS: tuple[str, ...] = (
+    "page", "toc_bytes_before", "toc_bytes_after", "entries", "max_depth", "toggles", "links", "typed", "untyped",
+    "flagged",
+)
+
+# Type decorator of a link, giving its object type
+_TYPE_SPAN: re.Pattern[str] = re.compile(r'class="slt-type slt-obj-([^"\s]+)"')
+
+_spool: Spool = Spool(SPOOL_DIR)
+
+# Page ➜ ToC size before the rewrite, for the pages of the current process
+_before: dict[str, int] = {}
+
+
+#// LOGIC
+def _enabled(app: Sphinx) -> bool:
+    """
+    Check whether the weight report is enabled.
+    """
+    return bool(app.config["localtoc_report"].strip())
+
+
+def toc_weight(toc: str) -> dict[str, Any]:
+    """
+    Measure a rendered (and maybe decorated) ToC, in a single pass over its tokens.
+
+    :return:    Entries, deepest list nesting, dropdown toggles, links, and the links with and without a type (with
+                the anchors of both, the typed ones along with their type)
+    """
+    entries: int = 0
+    depth: int = 0
+    max_depth: int = 0
+    toggles: int = toc.count('class="slt-dropdown"')
+    links: int = 0
+    typed: list[dict[str, str]] = []
+    untyped: list[str] = []
+
+    for start, end, closing, name in toc_tokens(toc):
+        if name == "ul":
+            depth += -1 if closing else 1
+            max_depth = max(max_depth, depth)
+
+        elif name == "li" and not closing:
+            entries += 1
+
+        elif name == "a" and not closing:
+            links += 1
+            anchor: str = link_anchor(toc[start:end])
+
+            # The type span is the first one in the link (after the dropdown label)
+            close: int = toc.find("</a>", end)
+            decorator: re.Match[str]|None = _TYPE_SPAN.search(toc, end, close if close >= 0 else len(toc))
+            if decorator is not None:
+                typed.append({"anchor": anchor, "type": decorator.group(1)})
+            else:
+                untyped.append(anchor)
+
+    return {
+        "entries": entries, "max_depth": max_depth, "toggles": toggles,
+        "links": links, "typed": len(typed), "untyped": len(untyped),
+        "typed_anchors": typed, "untyped_anchors": untyped,
+    }
+
+
+def _measure_before(app: Sphinx, pagename: str, _tm: str, context: dict[str, Any], _dt: nodes.document|None
+                    ) -> None:
+    """
+    Keep the size of the ToC rendered by Sphinx, before any rewrite.
+    """
+    if not _enabled(app) or not context.get("toc"): return
+    _before[pagename] = len(context["toc"].encode("utf-8"))
+
+
+def _measure_after(app: Sphinx, pagename: str, _tm: str, context: dict[str, Any], _dt: nodes.document|None
+                   ) -> None:
+    """
+    Measure the decorated ToC and record the page row.
+    """
+    if not _enabled(app) or pagename not in _before: return
+
+    toc: str = context.get("toc") or ""
+    size: int = len(toc.encode("utf-8"))
+
+    _spool.write(app, {
+        "page": pagename,
+        "toc_bytes_before": _before.pop(pagename),
+        "toc_bytes_after": size,
+        **toc_weight(toc),
+        "flagged": size > max(app.config["localtoc_report_threshold"], 0),
+    })
+
+
+def _reset(app: Sphinx) -> None:
+    """
+    Drop the rows left by an earlier build.
+    """
+    if _enabled(app):
+        _spool.reset(app)
+
+
+def _report(app: Sphinx, exception: Exception|None) -> None:
+    """
+    Merge the rows of every process and write the report, as JSON or CSV after its file extension.
+    """
+    # Skip if the build failed or the report is not used
+    if exception is not None or not _enabled(app): return
+
+    # Heaviest pages first
+    rows: list[dict[str, Any]] = sorted(_spool.read(app), key=lambda row: (-row["toc_bytes_after"], row["page"]))
+
+    # Resolve the final path
+    report_file: Path = Path(app.config["localtoc_report"])
+    if not report_file.is_absolute():
+        report_file = Path(app.confdir) / report_file
+    report_file.parent.mkdir(parents=True, exist_ok=True)
+
+    if report_file.suffix.lower() == ".csv":
+        with report_file.open("w", encoding="utf-8", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        report_file.write_text(json.dumps({
+            "version": __version__,
+            "project": getattr(app.config, "project", ""),
+            "threshold": max(app.config["localtoc_report_threshold"], 0),
+            "pages": len(rows),
+            "flagged": sum(row["flagged"] for row in rows),
+            "rows": rows,
+        }, indent=2) + "\n", encoding="utf-8")
+
+    _spool.reset(app)
+
+
+def setup_report(app: Sphinx) -> None:
+    """
+    Register configuration values and event hooks for the per page ToC weight report.
+
+    Config values added:
+        localtoc_report (str)
+            Absolute or relative path (including filename) to the report, empty to disable it. A ".csv" file gets
+            one line per page with the counts only, any other one a JSON document which also lists the anchors of
+            the links, the typed ones with their object type.
+
+            Only the pages written by the build are reported. If the file already exists, it will be overwritten.
+
+        localtoc_report_threshold (int)
+            Pages whose decorated ToC is bigger than this amount of bytes are flagged.
+
+    Connected events:
+        builder-inited
+            Drop the rows left by an earlier build.
+
+        html-page-context (HTML builders only)
+            Measure the ToC before and after the rewrite pipeline.
+
+        build-finished (HTML builders only)
+            Merge the rows of all processes (including the parallel workers) and write the report.
+    """
+    app.add_config_value(
+        "localtoc_report",
+        "",
+        ""
+    )
+    app.add_config_value(
+        "localtoc_report_threshold",
+        50000,
+        ""
+    )
+
+    app.connect("builder-inited", _reset)
+    add_html_hook(app, "html-page-context", _measure_before, priority=450)
+    add_html_hook(app, "html-page-context", _measure_after, priority=550)
+    add_html_hook(app, "build-finished", _report, priority=900)
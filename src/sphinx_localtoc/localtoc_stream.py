@@ -0,0 +1,301 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import re
+
+from collections.abc import Mapping
+from html import unescape
+from typing import Iterator
+
+from sphinx.application import Sphinx
+
+from .localtoc_ids import toggle_id
+from .localtoc_pipeline import add_engine
+
+
+#// GLOBAL VARIABLES
+ENGINE: str = "stream"
+
+# Every comment and tag, a ">" inside a comment or a quoted attribute value does not end it
+_TOKEN: re.Pattern[str] = re.compile(
+    r"""<!--.*?-->|<(/?)([a-z][^\s/>]*)(?:[^>"']|"[^"]*"|'[^']*')*>""", re.IGNORECASE | re.DOTALL
+)
+# The only tags which matter for the ToC structure
+_STRUCTURE: frozenset[str] = frozenset(("ul", "li", "a"))
+
+# An attribute of a start tag, searched after the tag name: name, then the double, single or not quoted value
+_TAG_NAME: re.Pattern[str] = re.compile(r"</?[^\s/>]*")
+_ATTRIBUTE: re.Pattern[str] = re.compile(r"""([^\s"'>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+
+# Precomputed fragments, with the same markup (and attribute order) as the "soup" engine
+_FRAGMENT_INPUT: str = '<input class="slt-dropdown" id="{id}" role="switch" type="checkbox"/>'
+_FRAGMENT_LABEL: str = '<label class="slt-dropdown-icon" for="{id}"></label>'
+_FRAGMENT_TYPE: str = '<span class="slt-type slt-obj-{type}"></span>'
+
+# Bit flags about <ul> and <li> tags, found by the look-ahead pass
+_WALKED: int = 1       # The list is part of the walked tree (root <ul> or first <ul> of a walked <li>)
+_HAS_DEPTH: int = 2    # Some <li> of the list has a nested <ul>
+_HAS_UL: int = 4       # The <li> has a nested <ul>
+
+
+#// LOGIC
+class StreamPlan:
+    """
+    What the "stream" engine has to inject in the ToC, filled by the pipeline stages.
+
+    Stages only configure the rewrite, the ToC markup itself is streamed once when the plan is serialized.
+    """
+    __slots__ = ("toc", "types", "dropdown_depth")
+
+    def __init__(self, toc: str) -> None:
+        self.toc: str = toc
+        # Anchor ➜ object type, for the type decorations
+        self.types: Mapping[str, str]|None = None
+        # Depth offset of the dropdown system, None when the dropdown system is not used
+        self.dropdown_depth: int|None = None
+
+
+def toc_tokens(toc: str) -> Iterator[tuple[int, int, bool, str]]:
+    """
+    Tokenize the ToC markup, yielding only the structural tags (comments and other tags are skipped).
+
+    Yield information about the current tag:
+        - [int]     ➜   Start offset of the tag
+        - [int]     ➜   End offset of the tag
+        - [bool]    ➜   Is a closing tag
+        - [str]     ➜   Tag name in lower case
+    """
+    for match in _TOKEN.finditer(toc):
+        # Comment ➜ no tag name
+        name: str = (match.group(2) or "").lower()
+        if name in _STRUCTURE:
+            yield match.start(), match.end(), match.group(1) == "/", name
+
+
+def _look_ahead(toc: str) -> tuple[bytearray, bytearray]:
+    """
+    Find, in one pass and without a tree, the flags the rewrite pass needs to know in advance.
+
+    :return:    Flags for every <ul> and every <li>, in document order
+    """
+    ul_flags: bytearray = bytearray()
+    li_flags: bytearray = bytearray()
+
+    # Stack of open tags, as ("ul" | "li", index in its flags)
+    stack: list[tuple[str, int]] = []
+    walked_root: bool = False
+
+    for _s, _e, closing, name in toc_tokens(toc):
+        if name == "a": continue
+
+        if closing:
+            # Pop up to the matching open tag, tolerating unclosed <li>
+            while stack:
+                if stack.pop()[0] == name: break
+            continue
+
+        if name == "ul":
+            flag: int = 0
+            parent: tuple[str, int]|None = stack[-1] if stack else None
+
+            # Root <ul> ➜ the first top level list is walked
+            if parent is None:
+                if not walked_root:
+                    flag = _WALKED
+                    walked_root = True
+
+            # Nested <ul> ➜ only the first one of a walked <li> is walked
+            elif parent[0] == "li" and li_flags[parent[1]] & _WALKED and not li_flags[parent[1]] & _HAS_UL:
+                li_flags[parent[1]] |= _HAS_UL
+                flag = _WALKED
+
+                # Mark the list holding the <li> as expandable
+                for tag, index in reversed(stack):
+                    if tag == "ul":
+                        ul_flags[index] |= _HAS_DEPTH
+                        break
+
+            ul_flags.append(flag)
+            stack.append(("ul", len(ul_flags) - 1))
+
+        else:
+            # <li> is walked when its list is walked
+            parent_ul: int|None = next((index for tag, index in reversed(stack) if tag == "ul"), None)
+            walked: bool = parent_ul is not None and bool(ul_flags[parent_ul] & _WALKED)
+
+            # An unclosed <li> is closed by its next sibling
+            if stack and stack[-1][0] == "li":
+                stack.pop()
+
+            li_flags.append(_WALKED if walked else 0)
+            stack.append(("li", len(li_flags) - 1))
+
+    return ul_flags, li_flags
+
+
+def _attribute(tag: str, name: str) -> re.Match[str]|None:
+    """
+    Find an attribute of the start tag markup, skipping the quoted values of the other ones.
+    """
+    name_end: int = _TAG_NAME.match(tag).end()
+    for match in _ATTRIBUTE.finditer(tag, name_end, len(tag) - 1):
+        if match.group(1).lower() == name:
+            return match
+    return None
+
+
+def _value(match: re.Match[str]) -> str:
+    """
+    Get the raw value of an attribute found by :func:`_attribute`, empty when it has none.
+    """
+    return next((group for group in match.groups()[1:] if group is not None), "")
+
+
+def _add_class(tag: str, class_name: str) -> str:
+    """
+    Append a class to the start tag markup.
+    """
+    match: re.Match[str]|None = _attribute(tag, "class")
+
+    # No class yet ➜ add the attribute right after the tag name
+    if match is None:
+        name_end: int = _TAG_NAME.match(tag).end()
+        return f'{tag[:name_end]} class="{class_name}"{tag[name_end:]}'
+
+    classes: str = " ".join(filter(None, (_value(match), class_name)))
+    return f'{tag[:match.start()]}class="{classes}"{tag[match.end():]}'
+
+
+def link_anchor(tag: str) -> str:
+    """
+    Get the anchor target of an <a> start tag (without leading # and whitespace).
+    """
+    match: re.Match[str]|None = _attribute(tag, "href")
+    if match is None:
+        return ""
+    return unescape(_value(match)).strip().lstrip("#")
+
+
+def _stream_parse(_app: Sphinx, _pn: str, context: dict[str, str|None]) -> StreamPlan:
+    """
+    Nothing to parse, the stages only fill the plan.
+    """
+    return StreamPlan(context["toc"])
+
+
+def _stream_serialize(_app: Sphinx, plan: StreamPlan) -> str:
+    """
+    Stream the ToC markup once, copying every token to the output and injecting the precomputed fragments.
+    """
+    toc: str = plan.toc
+    types: Mapping[str, str]|None = plan.types
+    slt_depth: int|None = plan.dropdown_depth
+
+    # Nothing to inject ➜ nothing to do
+    if types is None and slt_depth is None:
+        return toc
+
+    ul_flags, li_flags = _look_ahead(toc) if slt_depth is not None else (bytearray(), bytearray())
+    output: list[str] = []
+    position: int = 0
+
+    # Counters over the tags, matching the flags order
+    ul_index: int = -1
+    li_index: int = -1
+    # IDs given to the toggle inputs, derived from the entry links (see :func:`toggle_id`)
+    used_ids: set[str] = set()
+    # Stack of the open <ul> as flags, its length is the depth of their <li>
+    ul_stack: list[int] = []
+    # Output slot of the toggle input waiting for the first tag of its <li> (its link gives the ID), -1 when none
+    pending_input: int = -1
+    # Only the first link to an object gets the type decorator
+    used: set[str] = set()
+
+    for start, end, closing, name in toc_tokens(toc):
+        # Copy everything before the tag as it is
+        output.append(toc[position:start])
+        tag: str = toc[start:end]
+        position = end
+        inject: str = ""
+        toggled: bool = False
+
+        if slt_depth is not None:
+            if pending_input >= 0 and not closing:
+                # The label goes inside the first tag of the toggled <li> (usually <a>)
+                ltt_id: str = toggle_id(link_anchor(tag) if name == "a" else "", used_ids)
+                output[pending_input] = _FRAGMENT_INPUT.format(id=ltt_id)
+                pending_input = -1
+                if name == "a":
+                    inject = _FRAGMENT_LABEL.format(id=ltt_id)
+
+            if name == "ul":
+                if closing:
+                    if ul_stack: ul_stack.pop()
+                else:
+                    ul_index += 1
+                    flags: int = ul_flags[ul_index]
+                    ul_depth: int = len(ul_stack)
+
+                    if flags & _WALKED:
+                        # Starting depth branch
+                        if flags & _HAS_DEPTH and ul_depth == slt_depth:
+                            tag = _add_class(tag, "slt-dropdown-branch")
+                        # Nested depth branch of a toggled <li>
+                        elif ul_depth > slt_depth:
+                            tag = _add_class(tag, "slt-dropdown-depth")
+
+                    ul_stack.append(flags)
+
+            elif name == "li" and not closing:
+                li_index += 1
+                li_depth: int = len(ul_stack) - 1
+
+                if li_flags[li_index] & _WALKED and li_depth >= slt_depth:
+                    # Case 1: this <li> has a nested <ul> ➜ inject dropdown toggle
+                    if li_flags[li_index] & _HAS_UL:
+                        toggled = True
+
+                    # Case 2 & 3 ➜ inject alignment class so leaf items line up visually
+                    elif ul_stack[-1] & _HAS_DEPTH or li_depth > slt_depth:
+                        tag = _add_class(tag, "slt-dropdown-leaf")
+
+        if name == "a" and not closing and types is not None:
+            obj_id: str = link_anchor(tag)
+
+            # Match the anchor ID against our extracted <desc> metadata
+            obj_type: str = "" if obj_id in used else types.get(obj_id, "")
+            if obj_type:
+                used.add(obj_id)
+                inject += _FRAGMENT_TYPE.format(type=obj_type)
+
+        output.append(tag)
+        if inject:
+            output.append(inject)
+
+        # Case 1: the toggle input is filled in once the link of the <li> is known
+        if toggled:
+            pending_input = len(output)
+            output.append("")
+
+    # Toggled <li> without any tag after it
+    if pending_input >= 0:
+        output[pending_input] = _FRAGMENT_INPUT.format(id=toggle_id("", used_ids))
+
+    output.append(toc[position:])
+    return "".join(output)
+
+
+def setup_stream(app: Sphinx) -> None:
+    """
+    Register the "stream" engine for the Local ToC pipeline.
+
+    This engine never builds a tree: the ToC markup is tokenized and copied once to the output, while the type spans
+    and dropdown toggles are injected from precomputed fragments.
+
+    Its memory still grows with the ToC, but with a small constant: the output pieces joined at the end, one flag
+    byte per list and per entry (found by a look-ahead pass over the same tokens, only for the dropdown system) and
+    the stack of the open tags, where a DOM keeps an object per tag, attribute and text.
+    """
+    add_engine(app, ENGINE, _stream_parse, _stream_serialize)
@@ -3,54 +3,125 @@
 #//|>-----------------------------------------------------------------------------------------------------------------<|
 
 #// IMPORT
-from bs4 import BeautifulSoup
+import hashlib
+import sys
+
+from collections.abc import Mapping
 from docutils import nodes
 from pathlib import Path
+from typing import Iterator
+from typing import TYPE_CHECKING
 
 from sphinx import addnodes
 from sphinx.application import Sphinx
 from sphinx.environment import BuildEnvironment
 
 from ._version import __version__
+from .localtoc_dropdown import walk_list
+from .localtoc_nodes import ENGINE as NODES_ENGINE
+from .localtoc_pipeline import add_html_hook
+from .localtoc_pipeline import add_stage
+from .localtoc_profile import profiled
+from .localtoc_stream import ENGINE as STREAM_ENGINE
+from .localtoc_stream import StreamPlan
 from .tools.localtoc_css_generator import obj_types_amount
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from bs4.element import Tag
+
+
+#// GLOBAL VARIABLES
+# Per document data kept in the Sphinx build environment
+_ENV_DATA: tuple[str, ...] = ("asi_localtoc_index", "asi_object_types")
+
+# Where the object types come from: the <desc> nodes of each doctree, or the object inventories of the domains
+TYPE_SOURCES: tuple[str, ...] = ("doctree", "inventory")
+
+# Inventory entries which are not objects, as "domain-objtype" (labels name sections, which are in every ToC)
+INVENTORY_SKIPPED: frozenset[str] = frozenset({"std-label", "std-doc"})
+
+# Attributes of the client-side type filter: object type of an entry, object types of all the entries of a list
+FILTER_TYPE: str = "data-slt-type"
+FILTER_TYPES: str = "data-slt-types"
+
+# Class of the type decorators, prefixing the object type
+_TYPE_CLASS: str = "slt-obj-"
+
 
 #// LOGIC
-def _html_page_context(app: Sphinx, _pn: str, _tm: str, context: dict[str, str|None], doctree: nodes.document) -> None:
+class TypeIndex(Mapping[str, str]):
     """
-    Inject object‑type CSS markers into Local ToC hyperlinks before HTML rendering.
+    Read-only anchor ➜ object type map of a document, kept in the Sphinx build environment.
 
-    This approach is domain‑agnostic and suppose to works for any Sphinx project
-    because it relies on Sphinx’s own object classification.
+    All strings are interned, so the few distinct object types are shared by every entry (and pickled only once),
+    and the mapping can not be changed by whoever renders it.
     """
-    # Feature disabled ➜ nothing to do
-    if not app.config["localtoc_type"]: return
+    __slots__ = ("_data", "_key")
+
+    def __init__(self, data: dict[str, str]) -> None:
+        self._data: dict[str, str] = {sys.intern(k): sys.intern(v) for k, v in data.items()}
+        self._key: str|None = None
+
+    def __getitem__(self, key: str) -> str:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __reduce__(self) -> tuple[type, tuple[dict[str, str]]]:
+        # Only the data is stored, strings are interned again when loaded
+        return TypeIndex, (self._data,)
 
-    # No ToC in the context or custom data in doctree ➜ skip safely
-    # noinspection PyBroadException
-    try:
-        toc: str = context["toc"]
-        localtoc: dict[str, str] = doctree.asi_localtoc_type
-    except BaseException: return
+    @property
+    def key(self) -> str:
+        """
+        Stable digest of the content, computed once.
+        """
+        if self._key is None:
+            self._key = hashlib.sha256(repr(sorted(self._data.items())).encode()).hexdigest()
+        return self._key
 
-    # Parse the ToC HTML into a BeautifulSoup system for easier life
-    soup = BeautifulSoup(toc, "html.parser")
+
+def _from_inventory(app: Sphinx) -> bool:
+    """
+    Check whether the object types come from the domain inventories instead of the doctrees.
+    """
+    return app.config["localtoc_type_source"] == "inventory"
+
+
+def page_index(app: Sphinx, pagename: str|None) -> TypeIndex|None:
+    """
+    Get the anchor ➜ object type map of a page, if there is one.
+    """
+    if _from_inventory(app):
+        return getattr(app, "asi_localtoc_inventory", {}).get(pagename)
+    return getattr(app.env, "asi_localtoc_index", {}).get(pagename)
+
+
+def decorate_types(soup: "BeautifulSoup", localtoc: Mapping[str, str]) -> None:
+    """
+    Inject object‑type CSS markers into the ToC hyperlinks.
+
+    :param localtoc:    Anchor ➜ object type map of the page
+    """
+    # Only the first link to an object gets the decorator
+    used: set[str] = set()
 
     # Process every hyperlink in the ToC
     for element in soup.find_all("a", recursive=True):
         # Extract the anchor target (strip leading # and whitespace)
         obj_id: str = element.get("href", "#").strip().lstrip("#")
-        # Default: no type detected
-        obj_type: str = ""
 
         # Match the anchor ID against our extracted <desc> metadata
-        if obj_id in localtoc:
-            obj_type = localtoc[obj_id]
-            # Remove it to speed up future lookups
-            del localtoc[obj_id]
+        obj_type: str = "" if obj_id in used else localtoc.get(obj_id, "")
 
         # If a type was found, inject a <span> decorator into the <a> tag
         if obj_type:
+            used.add(obj_id)
             tag_type = soup.new_tag(
                 "span",
                 attrs={
@@ -61,27 +132,141 @@ def _html_page_context(app: Sphinx, _pn: str, _tm: str, context: dict[str, str|N
             # Insert tag for the type decorator before the content (text or other tag) of the anchor (<a>)
             element.insert(0, tag_type)
 
-    # Replace the original ToC HTML with the modified version
-    context["toc"] = soup.decode()
 
+def _type_stage(app: Sphinx, soup: "BeautifulSoup", context: dict[str, str|None], _dt: nodes.document|None) -> None:
+    """
+    Inject object‑type CSS markers into Local ToC hyperlinks before HTML rendering.
+
+    This approach is domain‑agnostic and suppose to works for any Sphinx project
+    because it relies on Sphinx’s own object classification.
+    """
+    # No collected data for this page ➜ skip safely
+    localtoc: TypeIndex|None = page_index(app, context.get("pagename"))
+    if localtoc is None: return
+
+    decorate_types(soup, localtoc)
+
+
+def _entry_type(li: "Tag") -> str:
+    """
+    Get the object type an entry was decorated with, empty when it has none.
+    """
+    # The first child (usually <a>) holds the decorator, as the first of its children
+    first: "Tag|None" = li.find()
+    if first is None or first.name != "a": return ""
+
+    decorator: "Tag|None" = first.find("span", class_="slt-type", recursive=False)
+    if decorator is None: return ""
+
+    for name in decorator.get_attribute_list("class"):
+        if name.startswith(_TYPE_CLASS):
+            return name[len(_TYPE_CLASS):]
+    return ""
+
+
+def add_type_filters(root_ul: "Tag") -> None:
+    """
+    Add the data attributes of a client-side type filter to a type decorated ToC list.
+
+    Every decorated entry (<li>) gets its object type in "data-slt-type", and every list (<ul>) the sorted object
+    types found anywhere below it in "data-slt-types". A filter can then hide whole groups by switching a single
+    class, e.g. `.show-method ul[data-slt-types]:not([data-slt-types~="method"])`, instead of visiting every link.
+    """
+    # id() of the list ➜ the list and the object types below it
+    lists: dict[int, "Tag"] = {id(root_ul): root_ul}
+    found: dict[int, set[str]] = {}
+
+    # Gathered from the deepest entries up: a nested list always comes after the entry holding it
+    for _d, li, sub, _hd, parent in reversed(list(walk_list(root_ul))):
+        lists[id(parent)] = parent
+        types: set[str] = found.setdefault(id(parent), set())
+
+        obj_type: str = _entry_type(li)
+        if obj_type:
+            li[FILTER_TYPE] = obj_type
+            types.add(obj_type)
+
+        if sub is not None:
+            types.update(found.get(id(sub), ()))
+
+    for key, types in found.items():
+        if types:
+            lists[key][FILTER_TYPES] = " ".join(sorted(types))
+
+
+def _type_filter_stage(_app: Sphinx, soup: "BeautifulSoup", _ct: dict[str, str|None], _dt: any) -> None:
+    """
+    Add the data attributes of the client-side type filter, from the decorators of the type stage.
+    """
+    root_ul: "Tag|None" = soup.find("ul")
+    if root_ul is None: return
+
+    add_type_filters(root_ul)
+
+
+def _type_nodes_stage(app: Sphinx, toc: nodes.bullet_list, context: dict[str, str|None],
+                      _dt: nodes.document|None) -> None:
+    """
+    Same as :func:`_type_stage`, but decorating the ToC docutils nodes before they are rendered.
+    """
+    # No collected data for this page ➜ skip safely
+    localtoc: TypeIndex|None = page_index(app, context.get("pagename"))
+    if localtoc is None: return
+
+    # Only the first link to an object gets the decorator
+    used: set[str] = set()
+
+    # Process every hyperlink in the ToC
+    for reference in list(toc.findall(nodes.reference)):
+        # Extract the anchor target (strip leading # and whitespace)
+        obj_id: str = reference.get("refuri", "#").strip().lstrip("#")
+
+        # Match the anchor ID against our extracted <desc> metadata
+        obj_type: str = "" if obj_id in used else localtoc.get(obj_id, "")
+
+        # If a type was found, the <inline> node is rendered as <span> decorator inside the <a> tag
+        if obj_type:
+            used.add(obj_id)
+            reference.insert(0, nodes.inline(classes=["slt-type", f"slt-obj-{obj_type}"]))
+
+
+def _type_stream_stage(app: Sphinx, plan: StreamPlan, context: dict[str, str|None], _dt: nodes.document|None) -> None:
+    """
+    Same as :func:`_type_stage`, but only handing the collected metadata to the "stream" engine.
+    """
+    plan.types = page_index(app, context.get("pagename"))
 
-def _collect_info(app: Sphinx, doctree: nodes.document, _dn: str) -> None:
+
+def _type_cache_key(app: Sphinx, pagename: str, _dt: nodes.document|None) -> str:
+    """
+    Get the per page type map as a stable value for the rewrite cache key.
     """
-    Extract structured information from all <desc> nodes in the doctree.
+    localtoc: TypeIndex|None = page_index(app, pagename)
+    return "" if localtoc is None else localtoc.key
+
+
+def _collect_info(app: Sphinx, doctree: nodes.document) -> None:
     """
-    # Feature disabled ➜ nothing to do
-    if not app.config["localtoc_type"]: return
+    Extract structured information from all <desc> nodes in the doctree, while the document is read.
+
+    The results are kept per document in the Sphinx build environment, so unchanged documents are never scanned
+    again, and they can be purged when the document changes and merged back from the parallel reading processes:
+        - env.asi_localtoc_index    ➜   anchor ➜ object type map (:class:`TypeIndex`) for the local ToC type
+        - env.asi_object_types      ➜   "domain-objtype" pairs, for the debug file and the pruned stylesheet
+
+    The data is collected whatever the options which use it, it costs one walk over the <desc> nodes. So these
+    options only matter when the pages are written, and changing them never forces every document to be read again.
+    """
+    # The types come from the domain inventories ➜ nothing to do
+    if _from_inventory(app): return
 
     # Access the Sphinx build environment, which persists across all documents during the build.
-    # This set is consumed by the `_debug_file` to create a list for every new detected object type and domain.
-    debug_time: bool = app.config["localtoc_type_debug_file"].strip() != ""
-    env: BuildEnvironment = app.builder.env
-    if debug_time:
-        if not hasattr(env, "asi_object_types"):
-            env.asi_object_types = set()
+    env: BuildEnvironment = app.env
 
     # Dict of extracted objects data for the local ToC type
     ltt: dict[str, str] = {}
+    # Set of "domain-objtype" pairs for the debug file and the pruned stylesheet
+    object_types: set[str] = set()
 
     # Iterate over all <desc> nodes (API objects)
     for desc in doctree.findall(addnodes.desc):
@@ -99,17 +284,105 @@ def _collect_info(app: Sphinx, doctree: nodes.document, _dn: str) -> None:
                     obj_id = ids[0]
                 break
 
-        # Store the extracted object metadata
-        ltt[obj_id] = obj_type
+        # Store the extracted object metadata (objects without ID can not be linked from the ToC)
+        if obj_id:
+            ltt[obj_id] = obj_type
+
+        # Add the object's type to the set of all discovered types.
+        object_types.add(f"{obj_domain}-{obj_type}")
+
+    if not hasattr(env, "asi_localtoc_index"):
+        env.asi_localtoc_index = {}
+    env.asi_localtoc_index[env.docname] = TypeIndex(ltt)
+
+    if not hasattr(env, "asi_object_types"):
+        env.asi_object_types = {}
+    env.asi_object_types[env.docname] = object_types
+
+
+def _inventory_info(app: Sphinx, env: BuildEnvironment) -> None:
+    """
+    Build the anchor ➜ object type maps of every page at once, from the object inventories of the domains.
+
+    Every anchor an object is registered under is covered (aliases included), and no doctree is walked. The maps are
+    kept on the application only (rebuilt on every build from the always up to date domain data), so the parallel
+    writing processes inherit them.
+
+    A domain keeps a single page for an object, so a duplicated object (already warned by Sphinx) is only decorated
+    on that page.
+    """
+    # The types come from the doctrees ➜ nothing to do
+    if not _from_inventory(app): return
+
+    # Page ➜ anchor ➜ object type, and page ➜ "domain-objtype" pairs
+    pages: dict[str, dict[str, str]] = {}
+    object_types: dict[str, set[str]] = {}
+
+    for domain in env.domains.sorted():
+        for _n, _dn, obj_type, docname, anchor, _p in domain.get_objects():
+            pair: str = f"{domain.name}-{obj_type}"
+
+            # Objects without anchor can not be linked from the ToC
+            if not anchor or pair in INVENTORY_SKIPPED: continue
+
+            # The first object of an anchor wins (e.g. a C function, not its parameters sharing the anchor)
+            anchors: dict[str, str] = pages.setdefault(docname, {})
+            if anchor in anchors: continue
 
-        # Add the object's type to the global set of all discovered types.
-        if debug_time:
-            env.asi_object_types.add(f"{obj_domain}-{obj_type}")
+            anchors[anchor] = obj_type
+            object_types.setdefault(docname, set()).add(pair)
 
-    # Attach the extracted metadata directly to the doctree.
-    # Sphinx will serialize this into the .doctree file, and it will be available later in needed methods
-    # e.g.: In `html-page-context` as `doctree.asi_localtoc_type`
-    doctree.asi_localtoc_type = ltt
+    app.asi_localtoc_inventory = {docname: TypeIndex(data) for docname, data in pages.items()}
+
+    # Same data as the doctree source, for the debug file and the pruned stylesheet
+    env.asi_object_types = object_types
+
+
+def _outdated_info(app: Sphinx, env: BuildEnvironment, added: set[str], changed: set[str], _rm: set[str]
+                   ) -> list[str]:
+    """
+    Get the up to date documents which have no collected data, so they are read again.
+
+    The data is only collected by the HTML builders, so a document read by another builder (e.g. `latex` sharing the
+    same doctree directory) has none.
+    """
+    # The types come from the domain inventories ➜ nothing is collected
+    if _from_inventory(app): return []
+
+    index: dict[str, TypeIndex] = getattr(env, "asi_localtoc_index", {})
+    object_types: dict[str, set[str]] = getattr(env, "asi_object_types", {})
+
+    return [
+        docname for docname in env.all_docs
+        if docname not in added and docname not in changed
+        and (docname not in index or docname not in object_types)
+    ]
+
+
+def _purge_info(_app: Sphinx, env: BuildEnvironment, docname: str) -> None:
+    """
+    Forget the collected data of a document which is going to be read again or was removed.
+    """
+    for name in _ENV_DATA:
+        if hasattr(env, name):
+            getattr(env, name).pop(docname, None)
+
+
+def _merge_info(_app: Sphinx, env: BuildEnvironment, docnames: set[str], other: BuildEnvironment) -> None:
+    """
+    Merge the data collected by a parallel reading process into the main environment.
+    """
+    for name in _ENV_DATA:
+        if not hasattr(other, name): continue
+
+        if not hasattr(env, name):
+            setattr(env, name, {})
+
+        data: dict[str, object] = getattr(env, name)
+        other_data: dict[str, object] = getattr(other, name)
+        for docname in docnames:
+            if docname in other_data:
+                data[docname] = other_data[docname]
 
 
 def _debug_file(app: Sphinx, exception: Exception|None) -> None:
@@ -137,7 +410,7 @@ def _debug_file(app: Sphinx, exception: Exception|None) -> None:
 
     # Access the environment where object types were collected
     env: BuildEnvironment = app.builder.env
-    object_types = getattr(env, "asi_object_types", set())
+    object_types: set[str] = set().union(*getattr(env, "asi_object_types", {}).values())
 
     # Compute debug info's
     if len(object_types):
@@ -239,6 +512,14 @@ def setup_type(app: Sphinx) -> None:
         localtoc_type (bool)
             Enable or disable object type annotations in the local ToC.
 
+        localtoc_type_source (str)
+            Where the object types come from: "doctree" (the <desc> nodes, collected while each document is read) or
+            "inventory" (the objects registered by the domains, indexed once per build, with every anchor).
+
+        localtoc_type_filter (bool)
+            Add the data attributes of a client-side type filter: "data-slt-type" on the decorated entries,
+            "data-slt-types" (object types below) on the lists. Needs `localtoc_type`.
+
         localtoc_type_debug_file (str)
             Absolute or relative path (including filename) to a debug log file.
 
@@ -246,26 +527,57 @@ def setup_type(app: Sphinx) -> None:
             If the file does not exist, it will be created. If it already exists, it will be overwritten.
 
     Connected events:
-        doctree-resolved
-            Extract object metadata from <desc> nodes and attach it to the doctree for later use.
+        doctree-read (HTML builders only)
+            Extract object metadata from <desc> nodes and keep it per document in the environment for later use.
 
-        html-page-context
-            Used to rewrite context["toc"] and inject type decorations.
+        env-get-outdated (HTML builders only)
+            Read again the documents read by other builders, which have no collected metadata.
+
+        env-purge-doc / env-merge-info
+            Keep the collected metadata right on incremental and parallel builds.
 
-        build-finished
+        env-updated (HTML builders only)
+            Index the objects of the domain inventories, for the "inventory" source.
+
+        build-finished (HTML builders only)
             Run the assistant generator after all doctrees have been processed and all pages rendered.
+
+    Pipeline stages added:
+        type
+            Used to rewrite context["toc"] and inject type decorations.
+
+        type-filter
+            Runs after the type stage, on the "soup" engine only.
     """
     app.add_config_value(
         "localtoc_type",
         True,
+        "html"
+    )
+    app.add_config_value(
+        "localtoc_type_source",
+        "doctree",
         "env"
     )
+    app.add_config_value(
+        "localtoc_type_filter",
+        False,
+        "html"
+    )
     app.add_config_value(
         "localtoc_type_debug_file",
         "",
-        "env"
+        "html"
     )
 
-    app.connect("doctree-resolved", _collect_info)
-    app.connect("html-page-context", _html_page_context)
-    app.connect("build-finished", _debug_file)
+    add_html_hook(app, "doctree-read", profiled("doctree-read", _collect_info))
+    add_html_hook(app, "env-get-outdated", _outdated_info)
+    app.connect("env-purge-doc", _purge_info)
+    app.connect("env-merge-info", _merge_info)
+    add_html_hook(app, "env-updated", profiled("env-updated", _inventory_info), priority=400)
+    add_html_hook(app, "build-finished", profiled("build-finished", _debug_file))
+
+    add_stage(app, "type", _type_stage, "localtoc_type", 400, cache_key=_type_cache_key)
+    add_stage(app, "type", _type_nodes_stage, "localtoc_type", 400, NODES_ENGINE)
+    add_stage(app, "type", _type_stream_stage, "localtoc_type", 400, STREAM_ENGINE)
+    add_stage(app, "type-filter", _type_filter_stage, "localtoc_type_filter", 450)
@@ -0,0 +1,443 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from ._version import __version__
+from .localtoc_css import CSS_FILE
+from .localtoc_dropdown import inject_dropdowns
+from .localtoc_pipeline import PARSERS
+from .localtoc_pipeline import lxml_available
+from .localtoc_pipeline import parse_fragment
+from .localtoc_pipeline import serialize_fragment
+from .localtoc_stream import link_anchor
+from .localtoc_stream import toc_tokens
+from .localtoc_type import INVENTORY_SKIPPED
+from .localtoc_type import decorate_types
+from .tools.localtoc_css_generator import generate_css
+
+
+#// GLOBAL VARIABLES
+# Manifest of the rewritten pages, relative to the HTML directory
+MANIFEST_FILE: str = ".localtoc-rewrite.json"
+
+# Markup left by the extension (or a previous rewrite) in a decorated ToC
+_DECORATED: tuple[str, ...] = ('class="slt-dropdown"', 'class="slt-type ')
+
+# Tags and classes added by a rewrite, dropped to decorate a page again with other settings
+_ADDED_TAGS: str = "span.slt-type, input.slt-dropdown, label.slt-dropdown-icon"
+_ADDED_CLASSES: frozenset[str] = frozenset({"slt-dropdown-branch", "slt-dropdown-depth", "slt-dropdown-leaf"})
+
+# Elements holding the local ToC in known themes, as (text found in the page, CSS selector): Furo, then PyData and
+# the themes based on it (e.g. Book)
+_CONTAINERS: tuple[tuple[str, str], ...] = (
+    ("toc-tree", "div.toc-tree"),
+    ("page-toc", "nav.page-toc"),
+)
+
+# Start offset of a page where several lists may be the local ToC
+_AMBIGUOUS: int = -2
+
+# Page status ➜ label of the summary
+_SUMMARY: dict[str, str] = {
+    "rewritten": "rewritten",
+    "unchanged": "unchanged since the last run",
+    "decorated": "already decorated",
+    "plain": "with nothing to decorate",
+    "no-toc": "without local ToC",
+    "ambiguous": "with several possible local ToCs (use --container)",
+    "error": "failed",
+}
+
+
+#// LOGIC
+def _parse_args(argv: list[str]|None=None) -> argparse.Namespace:
+    """
+    Read the command line options.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m sphinx_localtoc.rewrite",
+        description="Decorate the local ToC of already built HTML pages, the same way the extension does.",
+    )
+    parser.add_argument("html_dir", help="directory of the built HTML pages")
+    parser.add_argument(
+        "--container",
+        help="CSS selector of the element holding the local ToC (default: the ToC element of known themes, else the "
+             "only list starting with a link to the page itself, as Sphinx renders it)"
+    )
+    parser.add_argument(
+        "--inventory",
+        help="object inventory giving the object types (default: objects.inv of the HTML directory)"
+    )
+    parser.add_argument("--no-type", action="store_true", help="do not add the object type decorations")
+    parser.add_argument("--no-dropdown", action="store_true", help="do not add the dropdown toggles")
+    parser.add_argument(
+        "--dropdown-depth", type=int, default=1,
+        help="number of initial ToC depth levels without dropdown toggles (default: %(default)s)"
+    )
+    parser.add_argument("--parser", choices=PARSERS, default="auto", help="BeautifulSoup parser (default: auto)")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="worker processes (default: every core)")
+    parser.add_argument(
+        "--manifest",
+        help=f"manifest of the rewritten pages, to skip them on the next run (default: {MANIFEST_FILE} of the HTML "
+             f"directory)"
+    )
+    parser.add_argument("--force", action="store_true", help="ignore the manifest and check every page again")
+
+    return parser.parse_args(argv)
+
+
+def load_inventory(inventory: Path) -> dict[str, dict[str, str]]:
+    """
+    Read the anchor ➜ object type maps of every page from an object inventory (`objects.inv`).
+
+    Same rules as the "inventory" type source of the extension: labels and documents are skipped, and the first
+    object of an anchor wins.
+
+    :return:    Page path (relative to the HTML directory) ➜ anchor ➜ object type
+    """
+    from sphinx.util.inventory import InventoryFile
+
+    pages: dict[str, dict[str, str]] = {}
+    data = InventoryFile.loads(inventory.read_bytes(), uri="").data
+
+    for key, objects in data.items():
+        domain, _, obj_type = key.partition(":")
+        if f"{domain}-{obj_type}" in INVENTORY_SKIPPED: continue
+
+        for item in objects.values():
+            page, _, anchor = item.uri.partition("#")
+            # Objects without anchor can not be linked from the ToC
+            if not anchor: continue
+
+            # "dirhtml" pages are linked by their directory
+            if not page or page.endswith("/"):
+                page += "index.html"
+
+            anchors: dict[str, str] = pages.setdefault(page, {})
+            anchors.setdefault(anchor, obj_type)
+
+    return pages
+
+
+def _container_start(html: str, container: str) -> int:
+    """
+    Find where the first list of the element matching the CSS selector starts, -1 when there is none.
+    """
+    from bs4 import BeautifulSoup
+
+    # Only "html.parser" keeps the source position of the tags
+    element = BeautifulSoup(html, "html.parser").select_one(container)
+    ul = None if element is None else element if element.name == "ul" else element.find("ul")
+    if ul is None or ul.sourceline is None: return -1
+
+    line_start: int = 0
+    for _ in range(ul.sourceline - 1):
+        line_start = html.index("\n", line_start) + 1
+    return line_start + ul.sourcepos
+
+
+def _self_lists(html: str) -> list[int]:
+    """
+    Find the outermost lists whose first entry links to the page itself ("#"), as Sphinx renders the local ToC.
+
+    The lists of the global navigation (`toctree()`) link to the current page the same way, but their entries carry
+    the "toctree-l<N>" classes, so they are skipped. So are the lists whose link is not a "reference internal" one
+    (e.g. the related links of the index page).
+
+    :return:    Start offset of each list, in document order
+    """
+    starts: list[int] = []
+    skip_until: int = 0
+
+    window: list[tuple[int, int, bool, str]] = []
+    for token in toc_tokens(html):
+        # Inside a list already found
+        if token[0] < skip_until: continue
+        window = window[-2:] + [token]
+
+        if [(closing, name) for _s, _e, closing, name in window] != [(False, "ul"), (False, "li"), (False, "a")]:
+            continue
+        link: str = html[window[2][0]:window[2][1]]
+        if link_anchor(link) != "" or "reference internal" not in link: continue
+
+        li_start, li_end = window[1][0], window[1][1]
+        start: int = window[0][0]
+        end: int = _toc_end(html, start)
+        skip_until = len(html) if end < 0 else end
+        window = []
+
+        if "toctree-l" not in html[li_start:li_end]:
+            starts.append(start)
+
+    return starts
+
+
+def _toc_start(html: str, container: str|None) -> int:
+    """
+    Find where the local ToC list starts in the page.
+
+    Without :param:`container`, the ToC element of the known themes is used first, then the only list starting with
+    a link to the page itself (global navigation excluded).
+
+    :return:    Start offset of the list, -1 when there is none, :data:`_AMBIGUOUS` when several lists may be it
+    """
+    if container is not None:
+        return _container_start(html, container)
+
+    for marker, selector in _CONTAINERS:
+        if marker not in html: continue
+        start: int = _container_start(html, selector)
+        if start >= 0: return start
+
+    starts: list[int] = _self_lists(html)
+    if len(starts) > 1: return _AMBIGUOUS
+    return starts[0] if starts else -1
+
+
+def _toc_end(html: str, start: int) -> int:
+    """
+    Find where the list starting at :param:`start` ends (right after its closing tag), -1 when it is not closed.
+    """
+    depth: int = 0
+    for _s, end, closing, name in toc_tokens(html[start:]):
+        if name != "ul": continue
+
+        depth += -1 if closing else 1
+        if depth == 0:
+            return start + end
+
+    return -1
+
+
+def _undecorate(soup: Any) -> None:
+    """
+    Drop the decorations added by an earlier rewrite, giving back the ToC as it was built.
+    """
+    for tag in soup.select(_ADDED_TAGS):
+        tag.decompose()
+
+    for tag in soup.select(", ".join(f".{name}" for name in sorted(_ADDED_CLASSES))):
+        classes: list[str] = [name for name in tag.get_attribute_list("class") if name not in _ADDED_CLASSES]
+        if classes:
+            tag["class"] = classes
+        else:
+            del tag["class"]
+
+
+def _static_prefix(rel: str) -> str:
+    """
+    Get the relative path from a page to the root of the HTML directory.
+    """
+    return "../" * rel.count("/")
+
+
+def _rewrite_page(options: dict[str, Any], task: tuple[str, dict[str, str]|None, bool]
+                  ) -> tuple[str, str, list[int]|None]:
+    """
+    Decorate the local ToC of one page, in a worker process.
+
+    Only the ToC list is parsed and serialized again, the rest of the page is kept byte for byte. A page decorated by
+    an earlier run (and not changed since) is decorated again, so it follows the current settings and object types.
+
+    :return:    Page path, status and (size, mtime) after the run, None when the page could not be read
+    """
+    rel, localtoc, redo = task
+    page: Path = Path(options["html_dir"]) / rel
+
+    try:
+        # Bytes as they are, the line endings of the page are kept
+        html: str = page.read_bytes().decode("utf-8")
+
+        start: int = _toc_start(html, options["container"])
+        end: int = -1 if start < 0 else _toc_end(html, start)
+        status: str = "no-toc" if end < 0 else "rewritten"
+
+        # Rather left as it is than decorating the wrong list
+        if start == _AMBIGUOUS:
+            status = "ambiguous"
+            sys.stderr.write(f"{page}: several lists may be the local ToC, skipped (use --container)\n")
+
+        decorated: bool = status == "rewritten" and any(marker in html[start:end] for marker in _DECORATED)
+        if decorated and not redo:
+            status = "decorated"
+
+        if status == "rewritten":
+            soup = parse_fragment(html[start:end], options["parser"])
+            if decorated:
+                _undecorate(soup)
+
+            if localtoc and options["type"]:
+                decorate_types(soup, localtoc)
+            if options["dropdown"]:
+                inject_dropdowns(soup, options["dropdown_depth"])
+
+            toc: str = serialize_fragment(soup)
+            if toc == html[start:end]:
+                status = "unchanged" if decorated else "plain"
+            else:
+                html = html[:start] + toc + html[end:]
+
+                # Link the stylesheet, as the extension does (unless the page links one, maybe with a hashed name)
+                css_link: str = f"_static/{CSS_FILE}"
+                head_end: int = html.find("</head>")
+                if head_end >= 0 and f"{css_link.removesuffix('.css')}." not in html[:head_end]:
+                    link: str = f'<link rel="stylesheet" type="text/css" href="{_static_prefix(rel)}{css_link}" />\n'
+                    html = html[:head_end] + link + html[head_end:]
+
+                page.write_bytes(html.encode("utf-8"))
+
+        stat: os.stat_result = page.stat()
+        return rel, status, [stat.st_size, stat.st_mtime_ns]
+
+    except (OSError, UnicodeDecodeError) as error:
+        sys.stderr.write(f"{page}: {error}\n")
+        return rel, "error", None
+
+
+def _read_manifest(manifest: Path) -> dict[str, Any]:
+    """
+    Get the last run: its settings, its pages as path ➜ (size, mtime) and the pages it decorated.
+
+    :return:    The manifest data, empty when there is none or it was written by another version
+    """
+    try:
+        data: dict[str, Any] = json.loads(manifest.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict) or data.get("version") != __version__:
+        return {}
+    return data
+
+
+def _write_manifest(manifest: Path, settings: dict[str, Any], pages: dict[str, list[int]], decorated: list[str]
+                    ) -> None:
+    """
+    Save the pages of this run, replacing the manifest at once (an interrupted run keeps the previous one).
+    """
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    temporary: Path = manifest.with_name(manifest.name + ".tmp")
+    temporary.write_text(json.dumps({
+        "version": __version__, "settings": settings, "pages": pages, "decorated": decorated,
+    }, separators=(",", ":")), encoding="utf-8")
+    temporary.replace(manifest)
+
+
+def _write_css(html_dir: Path) -> None:
+    """
+    Generate the stylesheet into the static directory of the HTML pages, unless there is one already (e.g. made by
+    the extension, with the project options).
+    """
+    css_file: Path = html_dir / "_static" / CSS_FILE
+    if css_file.exists(): return
+
+    css_file.parent.mkdir(parents=True, exist_ok=True)
+    css_file.write_text(generate_css(), encoding="utf-8")
+
+
+def main(argv: list[str]|None=None) -> int:
+    """
+    Run the ToC rewriter from the command line.
+
+    :return:    Exit code, 1 when a page could not be rewritten
+    """
+    args: argparse.Namespace = _parse_args(argv)
+    html_dir: Path = Path(args.html_dir)
+
+    if not html_dir.is_dir():
+        sys.stderr.write(f"{html_dir}: not a directory\n")
+        return 1
+
+    # Object types of every page, and the digest of the inventory giving them
+    inventories: dict[str, dict[str, str]] = {}
+    inventory_digest: str|None = None
+    if not args.no_type:
+        inventory: Path = Path(args.inventory) if args.inventory else html_dir / "objects.inv"
+        try:
+            inventory_digest = hashlib.sha256(inventory.read_bytes()).hexdigest()
+            inventories = load_inventory(inventory)
+        except (OSError, ValueError) as error:
+            sys.stderr.write(f"{inventory}: {error}, the object types are not added\n")
+
+    parser: str = args.parser
+    if parser == "auto":
+        parser = "lxml" if lxml_available() else "html.parser"
+
+    # Everything changing the output of a page (the inventory contents included): the pages of a run with other
+    # settings are checked again
+    settings: dict[str, Any] = {
+        "container": args.container,
+        "type": not args.no_type,
+        "dropdown": not args.no_dropdown,
+        "dropdown_depth": max(args.dropdown_depth, 0),
+        "inventory": inventory_digest,
+    }
+    options: dict[str, Any] = {**settings, "html_dir": str(html_dir), "parser": parser}
+
+    manifest: Path = Path(args.manifest) if args.manifest else html_dir / MANIFEST_FILE
+    last: dict[str, Any] = _read_manifest(manifest)
+    last_pages: dict[str, list[int]] = last.get("pages", {})
+    last_decorated: set[str] = set(last.get("decorated", []))
+    reuse: bool = not args.force and last.get("settings") == settings
+
+    # Pages not changed since the last run are skipped from their size and modification time only
+    pages: dict[str, list[int]] = {}
+    tasks: list[tuple[str, dict[str, str]|None, bool]] = []
+    counts: dict[str, int] = dict.fromkeys(_SUMMARY, 0)
+    decorated: list[str] = []
+
+    for page in sorted(html_dir.rglob("*.html")):
+        rel: str = page.relative_to(html_dir).as_posix()
+        stat: os.stat_result = page.stat()
+        untouched: bool = last_pages.get(rel) == [stat.st_size, stat.st_mtime_ns]
+
+        if reuse and untouched:
+            pages[rel] = last_pages[rel]
+            counts["unchanged"] += 1
+            if rel in last_decorated:
+                decorated.append(rel)
+        else:
+            # Decorated by an earlier run and not built again since ➜ decorated again with the current settings
+            tasks.append((rel, inventories.get(rel), untouched and rel in last_decorated))
+
+    jobs: int = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    rewrite = partial(_rewrite_page, options)
+
+    results: list[tuple[str, str, list[int]|None]]
+    if jobs == 1 or len(tasks) < 2:
+        results = list(map(rewrite, tasks))
+    else:
+        # Several pages per task, so the workers are not slowed down by the messages
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+            results = list(executor.map(rewrite, tasks, chunksize=max(1, len(tasks) // (jobs * 8))))
+
+    for (rel, status, stat), (_r, _l, redo) in zip(results, tasks, strict=True):
+        counts[status] += 1
+        if stat is not None:
+            pages[rel] = stat
+        if status == "rewritten" or (redo and status == "unchanged"):
+            decorated.append(rel)
+
+    if counts["rewritten"]:
+        _write_css(html_dir)
+    _write_manifest(manifest, settings, pages, sorted(decorated))
+
+    sys.stdout.write(", ".join(f"{counts[status]} {label}" for status, label in _SUMMARY.items()) + "\n")
+    return 1 if counts["error"] else 0
+
+
+#// RUN
+if __name__ == "__main__":
+    sys.exit(main())
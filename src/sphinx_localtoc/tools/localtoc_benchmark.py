@@ -0,0 +1,543 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from io import StringIO
+from pathlib import Path
+from typing import Any
+from typing import Callable
+
+import sphinx
+
+from sphinx.application import Sphinx
+from sphinx.environment.adapters.toctree import document_toc
+
+from sphinx_localtoc._version import __version__
+from sphinx_localtoc import localtoc_dropdown
+from sphinx_localtoc import localtoc_pipeline
+from sphinx_localtoc import localtoc_stream
+from sphinx_localtoc import localtoc_type
+
+
+#// GLOBAL VARIABLES
+# Section underlines, from the page title down to the deepest section
+headings: str = "=-~^\"'`"
+
+# Directive templates for each domain, as (top level object, nested object or None)
+domain_objects: dict[str, list[tuple[str, str|None]]] = {
+    "py": [
+        (".. py:class:: Class{id}", ".. py:method:: method{id}(value)"),
+        (".. py:class:: Model{id}", ".. py:attribute:: field{id}"),
+        (".. py:function:: function{id}(value)", None),
+        (".. py:exception:: Error{id}", None),
+        (".. py:data:: CONSTANT{id}", None),
+    ],
+    "c": [
+        (".. c:struct:: struct_{id}", ".. c:member:: int member_{id}"),
+        (".. c:function:: int function_{id}(int value)", None),
+        (".. c:macro:: MACRO_{id}", None),
+    ],
+    "cpp": [
+        (".. cpp:class:: Class{id}", ".. cpp:function:: void method{id}()"),
+        (".. cpp:function:: int function{id}(int value)", None),
+        (".. cpp:enum:: Enum{id}", ".. cpp:enumerator:: Value{id}"),
+    ],
+    "js": [
+        (".. js:class:: JsClass{id}", ".. js:method:: method{id}(value)"),
+        (".. js:function:: jsFunction{id}(value)", None),
+    ],
+    "rst": [
+        (".. rst:directive:: directive-{id}", ".. rst:directive:option:: option-{id}"),
+        (".. rst:role:: role-{id}", None),
+    ],
+    "std": [
+        (".. envvar:: ENV_{id}", None),
+        (".. describe:: thing-{id}", None),
+    ],
+}
+
+# Highest cost ratio (see :func:`run_scaling`) still taken as linear, well above the timing noise but way below the
+# ratio of a quadratic rewrite over the same sizes (about the ratio of the sizes)
+SCALING_MAX_RATIO: float = 4.0
+
+
+#// LOGIC
+def generate_project(root: Path, pages: int, objects: int, depth: int, domains: list[str], seed: int=0) -> None:
+    """
+    Write a synthetic Sphinx project, without any network or extra dependency.
+
+    :param root:    Directory of the project (created if needed)
+    :param pages:   Amount of pages listed by the index
+    :param objects: Amount of top level objects per page (a part of them have nested members)
+    :param depth:   Section depth of each page, objects are spread over the deepest sections
+    :param domains: Domains the objects are picked from, in turns
+    :param seed:    Seed for the random choices, the same seed gives the same project
+    """
+    rng: random.Random = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+
+    (root / "conf.py").write_text('project = "Local ToC benchmark"\n', "utf-8")
+
+    index: list[str] = ["Benchmark", "=========", "", ".. toctree::", "   :maxdepth: 1", ""]
+    index += [f"   page{page}" for page in range(pages)]
+    (root / "index.rst").write_text("\n".join(index) + "\n", "utf-8")
+
+    for page in range(pages):
+        # Section titles, as (level, title) in document order
+        sections: list[tuple[int, str]] = []
+
+        def add_sections(titles: list[tuple[int, str]], level: int, prefix: str) -> None:
+            titles.append((level, f"Section {prefix}"))
+            if level < depth:
+                for child in range(2):
+                    add_sections(titles, level + 1, f"{prefix}.{child + 1}")
+
+        for top in range(2):
+            add_sections(sections, 1, str(top + 1))
+
+        # Objects are spread over the deepest sections (or over all of them without sub-sections)
+        leaves: list[int] = [
+            i for i, (level, _t) in enumerate(sections)
+            if i + 1 == len(sections) or sections[i + 1][0] <= level
+        ]
+        per_section: dict[int, list[str]] = {leaf: [] for leaf in leaves}
+
+        for index_object in range(objects):
+            domain: str = domains[index_object % len(domains)]
+            top, nested = rng.choice(domain_objects[domain])
+            object_id: str = f"{page}x{index_object}"
+            lines: list[str] = [top.format(id=object_id), "", "   Synthetic object.", ""]
+
+            if nested is not None:
+                for member in range(rng.randint(1, 4)):
+                    lines += ["   " + nested.format(id=f"{object_id}m{member}"), "", "      Synthetic member.", ""]
+
+            per_section[leaves[index_object % len(leaves)]].extend(lines)
+
+        body: list[str] = [f"Page {page}", headings[0] * 16, ""]
+        for i, (level, title) in enumerate(sections):
+            body += [title, headings[min(level, len(headings) - 1)] * len(title), "", "Text.", ""]
+            body += per_section.get(i, [])
+
+        (root / f"page{page}.rst").write_text("\n".join(body) + "\n", "utf-8")
+
+
+def generate_toc(entries: int, shape: str) -> str:
+    """
+    Write a synthetic local ToC markup, as rendered by Sphinx.
+
+    :param entries: Amount of <li> entries
+    :param shape:   "wide" ➜ every entry has up to 8 children (breadth first), "deep" ➜ two entries per level, the
+                    first one holding the next level (depth of entries / 2)
+    """
+    # Children of every entry, the entry 0 being the root list
+    children: list[list[int]] = [[] for _ in range(entries + 1)]
+    for entry in range(1, entries + 1):
+        parent: int = (entry - 1) // 8 if shape == "wide" else (entry - 1) // 2 * 2 - 1
+        children[max(parent, 0)].append(entry)
+
+    # Written with an explicit stack, the deep shape goes way past the recursion limit
+    output: list[str] = []
+    stack: list[tuple[int, int]] = [(0, -1)]
+    while stack:
+        entry, child = stack.pop()
+        if child == -1:
+            if entry:
+                output.append(f'<li><a class="reference internal" href="#entry-{entry}">Entry {entry}</a>')
+            if children[entry]:
+                output.append("<ul>\n")
+            stack.append((entry, 0))
+        elif child < len(children[entry]):
+            stack.append((entry, child + 1))
+            stack.append((children[entry][child], -1))
+        else:
+            if children[entry]:
+                output.append("</ul>\n")
+            if entry:
+                output.append("</li>\n")
+
+    return "".join(output)
+
+
+def run_scaling(sizes: list[int], repeat: int=3) -> dict[str, Any]:
+    """
+    Measure how the ToC rewrite scales with the amount of entries, for wide and deep ToCs.
+
+    The cost per entry should stay flat when the rewrite is linear: `cost_ratio` compares the cost per entry of the
+    biggest ToC with the smallest one (close to 1 ➜ linear, growing with the size ➜ super-linear).
+
+    :return:    Machine-readable results
+    """
+    app = type("ScalingApp", (), {"config": {"localtoc_dropdown_depth": 1, "localtoc_parser": "auto"}})()
+    results: dict[str, Any] = {}
+
+    for shape in ("wide", "deep"):
+        rows: list[dict[str, Any]] = []
+
+        for entries in sizes:
+            toc: str = generate_toc(entries, shape)
+            context: dict[str, Any] = {"toc": toc, "pagename": "index"}
+            row: dict[str, Any] = {"entries": entries}
+
+            def dropdown(context: dict[str, Any]=context) -> float:
+                soup = localtoc_pipeline._soup_parse(app, "index", context)
+                start: float = time.perf_counter()
+                localtoc_dropdown._dropdown_stage(app, soup, context, None)
+                return time.perf_counter() - start
+
+            def stream(context: dict[str, Any]=context) -> float:
+                plan = localtoc_stream._stream_parse(app, "index", context)
+                localtoc_dropdown._dropdown_stream_stage(app, plan, context, None)
+                start: float = time.perf_counter()
+                localtoc_stream._stream_serialize(app, plan)
+                return time.perf_counter() - start
+
+            for name, function in (("soup_dropdown", dropdown), ("stream_dropdown", stream)):
+                seconds: float = min(function() for _ in range(max(repeat, 1)))
+                row[name] = {"seconds": round(seconds, 6), "us_per_entry": round(seconds / entries * 1e6, 3)}
+
+            rows.append(row)
+
+        results[shape] = {
+            "sizes": rows,
+            "cost_ratio": {
+                name: round(rows[-1][name]["us_per_entry"] / rows[0][name]["us_per_entry"], 3)
+                if rows[0][name]["us_per_entry"] else 0.0
+                for name in ("soup_dropdown", "stream_dropdown")
+            },
+        }
+
+    return results
+
+
+def check_scaling(results: dict[str, Any], max_ratio: float=SCALING_MAX_RATIO) -> list[str]:
+    """
+    Check that every rewrite measured by :func:`run_scaling` scales linearly.
+
+    :param results:     Results of :func:`run_scaling`
+    :param max_ratio:   Highest cost ratio taken as linear
+    :return:            The "shape/rewrite" measures above the ratio, empty when every one passed
+    """
+    return [
+        f"{shape}/{name}"
+        for shape, result in results.items()
+        for name, ratio in result["cost_ratio"].items()
+        if ratio > max_ratio
+    ]
+
+
+def run_parity(pages: int, objects: int, depth: int, domains: list[str], seed: int=0) -> dict[str, Any]:
+    """
+    Check that the "soup" engine gives the same ToC markup with the "lxml" and "html.parser" parsers.
+
+    The corpus is made of the ToCs of a synthetic project (rewritten by the whole pipeline) and of hand written
+    fragments with the markup Sphinx may render in a ToC (entities, inline markup, non-ASCII text, comments, ...).
+
+    :return:    Machine-readable results, with every mismatch
+    """
+    fragments: list[str] = [
+        "",
+        "\n<ul>\n<li><a class=\"reference internal\" href=\"#\">Title</a></li>\n</ul>\n",
+        '<ul>\n<li><a class="reference internal" href="#a-b">A &amp; B &lt;T&gt; &quot;q&quot; &#39;s&#39;</a><ul>\n'
+        '<li><a class="reference internal" href="#x"><code class="docutils literal notranslate"><span class="pre">'
+        'x()</span></code></a></li>\n</ul>\n</li>\n</ul>\n',
+        '<ul>\n<li><a class="reference internal" href="#%C3%A9t%C3%A9">Été — ünïcödé ✓</a></li>\n'
+        '<li><a class="reference internal" href="#m"><em>emph</em> and <strong>strong</strong></a></li>\n</ul>\n',
+        '<ul>\n<!-- comment --><li><a class="reference internal" href="#c" title="a &quot;b&quot;">C</a><ul>\n'
+        '<li><a class="reference internal" href="#d">D</a><ul>\n<li><a class="reference internal" href="#e">E</a>'
+        '</li>\n</ul>\n</li>\n</ul>\n</li>\n</ul>\n',
+    ]
+    mismatches: list[dict[str, Any]] = []
+
+    # Hand written fragments, through the dropdown stage
+    fake = type("ParityApp", (), {"config": {"localtoc_dropdown_depth": 0}})()
+    for index, toc in enumerate(fragments):
+        outputs: dict[str, str] = {}
+        for parser in ("lxml", "html.parser"):
+            fake.config["localtoc_parser"] = parser
+            context: dict[str, Any] = {"toc": toc, "pagename": "index"}
+            soup = localtoc_pipeline._soup_parse(fake, "index", context)
+            localtoc_dropdown._dropdown_stage(fake, soup, context, None)
+            outputs[parser] = localtoc_pipeline._soup_serialize(fake, soup)
+        if outputs["lxml"] != outputs["html.parser"]:
+            mismatches.append({"source": f"fragment {index}", **outputs})
+
+    # Synthetic project, through the whole pipeline
+    with tempfile.TemporaryDirectory(prefix="localtoc-parity-") as temp:
+        root: Path = Path(temp)
+        generate_project(root / "src", pages, objects, depth, domains, seed)
+        app: Sphinx = _make_app(root / "src", root / "build", True, {"localtoc_cache": False})
+        app.build(force_all=True)
+
+        docnames: list[str] = sorted(app.env.found_docs)
+        for docname in docnames:
+            doctree = app.env.get_doctree(docname)
+            toc: str = app.builder.render_partial(document_toc(app.env, docname, app.builder.tags))["fragment"]
+            outputs = {}
+            for parser in ("lxml", "html.parser"):
+                app.config["localtoc_parser"] = parser
+                context = {"toc": toc, "pagename": docname}
+                localtoc_pipeline._html_page_context(app, docname, "page.html", context, doctree)
+                outputs[parser] = context["toc"]
+            if outputs["lxml"] != outputs["html.parser"]:
+                mismatches.append({"source": docname, **outputs})
+
+    return {
+        "benchmark": "sphinx-localtoc-parity",
+        "version": __version__,
+        "parameters": {"pages": pages, "objects": objects, "depth": depth, "domains": domains, "seed": seed},
+        "results": {"fragments": len(fragments), "documents": len(docnames), "mismatches": mismatches},
+    }
+
+
+def _make_app(src: Path, out: Path, extension: bool, overrides: dict[str, Any]|None=None, parallel: int=0) -> Sphinx:
+    """
+    Create a quiet HTML Sphinx application over the project.
+    """
+    extensions: list[str] = ["sphinx_localtoc"] if extension else []
+    return Sphinx(
+        srcdir=src,
+        confdir=src,
+        outdir=out / "html",
+        doctreedir=out / "doctrees",
+        buildername="html",
+        confoverrides={"extensions": extensions, **(overrides or {})},
+        status=None,
+        warning=StringIO(),
+        freshenv=True,
+        parallel=parallel,
+    )
+
+
+def _best(repeat: int, function: Callable[[], Any]) -> float:
+    """
+    Run the function :param:`repeat` times and get the best wall time, in seconds.
+    """
+    best: float = float("inf")
+    for _ in range(max(repeat, 1)):
+        start: float = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _timing(seconds: float, pages: int, size: int=0) -> dict[str, float]:
+    """
+    Describe a timing with the derived throughput.
+    """
+    result: dict[str, float] = {
+        "seconds": round(seconds, 6),
+        "pages_per_second": round(pages / seconds, 3) if seconds else 0.0,
+    }
+    if size:
+        result["bytes_per_second"] = round(size / seconds, 3) if seconds else 0.0
+    return result
+
+
+def run_benchmark(pages: int, objects: int, depth: int, domains: list[str], repeat: int=3, seed: int=0,
+                  parallel: int=0) -> dict[str, Any]:
+    """
+    Generate a synthetic project and measure the cost of the extension.
+
+    Measured:
+        - a full `sphinx-build` with and without the extension
+        - `_collect_info` over every doctree
+        - the "type" and "dropdown" stages, and the parse/serialize round-trip of the "soup" engine
+        - the whole `html-page-context` pipeline for every engine
+        - `_debug_file`
+
+    :return:    Machine-readable results
+    """
+    results: dict[str, Any] = {}
+
+    with tempfile.TemporaryDirectory(prefix="localtoc-benchmark-") as temp:
+        root: Path = Path(temp)
+        src: Path = root / "src"
+        generate_project(src, pages, objects, depth, domains, seed)
+
+        # Full builds
+        for name, extension in (("build_without_extension", False), ("build_with_extension", True)):
+            app: Sphinx = _make_app(src, root / name, extension, {
+                "localtoc_type_debug_file": str(root / "debug.txt")
+            } if extension else None, parallel)
+
+            start: float = time.perf_counter()
+            app.build(force_all=True)
+            results[name] = _timing(time.perf_counter() - start, pages + 1)
+
+        # The last app was built with the extension, every hook is measured on its data
+        docnames: list[str] = sorted(app.env.found_docs)
+        doctrees: dict[str, Any] = {docname: app.env.get_doctree(docname) for docname in docnames}
+        tocs: dict[str, str] = {
+            docname: app.builder.render_partial(document_toc(app.env, docname, app.builder.tags))["fragment"]
+            for docname in docnames
+        }
+        toc_size: int = sum(len(toc.encode()) for toc in tocs.values())
+        app.config["localtoc_cache"] = False
+
+        def collect_info() -> None:
+            for docname, doctree in doctrees.items():
+                app.env.prepare_settings(docname)
+                localtoc_type._collect_info(app, doctree)
+
+        results["collect_info"] = _timing(_best(repeat, collect_info), len(docnames))
+
+        # Separate steps of the "soup" engine
+        def soup_step(step: str) -> float:
+            total: float = 0.0
+            for docname, toc in tocs.items():
+                context: dict[str, Any] = {"toc": toc, "pagename": docname}
+                soup = localtoc_pipeline._soup_parse(app, docname, context)
+                start: float = time.perf_counter()
+                if step == "parse":
+                    localtoc_pipeline._soup_parse(app, docname, context)
+                elif step == "type":
+                    localtoc_type._type_stage(app, soup, context, doctrees[docname])
+                elif step == "dropdown":
+                    localtoc_dropdown._dropdown_stage(app, soup, context, doctrees[docname])
+                else:
+                    localtoc_pipeline._soup_serialize(app, soup)
+                total += time.perf_counter() - start
+            return total
+
+        results["soup_stages"] = {
+            step: _timing(min(soup_step(step) for _ in range(max(repeat, 1))), len(tocs), toc_size)
+            for step in ("parse", "type", "dropdown", "serialize")
+        }
+
+        # Whole pipeline handler for each engine
+        results["html_page_context"] = {}
+        for engine in sorted(app.asi_localtoc_engines):
+            app.config["localtoc_engine"] = engine
+
+            def page_context() -> None:
+                for docname, toc in tocs.items():
+                    localtoc_pipeline._html_page_context(
+                        app, docname, "page.html", {"toc": toc, "pagename": docname}, doctrees[docname]
+                    )
+
+            results["html_page_context"][engine] = _timing(_best(repeat, page_context), len(tocs), toc_size)
+
+        results["debug_file"] = _timing(_best(repeat, lambda: localtoc_type._debug_file(app, None)), 1)
+
+        # Size of the workload, to compare results of the same parameters only
+        results["workload"] = {
+            "documents": len(docnames),
+            "toc_bytes": toc_size,
+            "toc_entries": sum(toc.count("<li") for toc in tocs.values()),
+        }
+
+    return {
+        "benchmark": "sphinx-localtoc",
+        "version": __version__,
+        "python": platform.python_version(),
+        "sphinx": sphinx.__display_version__,
+        "platform": platform.platform(),
+        "parameters": {
+            "pages": pages, "objects": objects, "depth": depth, "domains": domains,
+            "repeat": repeat, "seed": seed, "parallel": parallel,
+        },
+        "results": results,
+    }
+
+
+def _parse_args(argv: list[str]|None=None) -> argparse.Namespace:
+    """
+    Read the command line options.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m sphinx_localtoc.tools.localtoc_benchmark",
+        description="Measure the cost of the Local ToC extension on a synthetic Sphinx project.",
+    )
+    parser.add_argument("--pages", type=int, default=50, help="amount of pages (default: %(default)s)")
+    parser.add_argument("--objects", type=int, default=40, help="top level objects per page (default: %(default)s)")
+    parser.add_argument("--depth", type=int, default=2, help="section depth of each page (default: %(default)s)")
+    parser.add_argument(
+        "--domains", default="py,c,cpp,js,rst,std",
+        help="comma separated domains the objects are picked from (default: %(default)s)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="best of N for each measure (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic project (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="parallel jobs of the full builds")
+    parser.add_argument(
+        "--scaling", metavar="SIZES",
+        help="only measure how the ToC rewrite scales, over comma separated ToC entry counts (e.g. 1000,10000,50000)"
+    )
+    parser.add_argument(
+        "--max-ratio", type=float, default=SCALING_MAX_RATIO,
+        help="highest cost ratio of --scaling taken as linear (exit code 1 above it, default: %(default)s)"
+    )
+    parser.add_argument(
+        "--parity", action="store_true",
+        help="only check that the lxml and html.parser parsers give the same ToCs (exit code 1 on mismatch)"
+    )
+    parser.add_argument("-o", "--output", help="JSON result file (default: standard output)")
+
+    args: argparse.Namespace = parser.parse_args(argv)
+    args.domains = [domain.strip() for domain in args.domains.split(",") if domain.strip()]
+
+    unknown: list[str] = [domain for domain in args.domains if domain not in domain_objects]
+    if unknown or not args.domains:
+        parser.error(f"unknown domains: {", ".join(unknown) or "<none>"} (known: {", ".join(domain_objects)})")
+
+    if args.scaling is not None:
+        try:
+            args.scaling = sorted(int(size) for size in args.scaling.split(",") if size.strip())
+        except ValueError:
+            parser.error(f"invalid scaling sizes: {args.scaling}")
+        if not args.scaling or args.scaling[0] < 1:
+            parser.error("scaling sizes must be positive")
+
+    return args
+
+
+#// RUN
+if __name__ == "__main__":
+    arguments: argparse.Namespace = _parse_args()
+    if arguments.parity:
+        report: dict[str, Any] = run_parity(
+            pages=arguments.pages,
+            objects=arguments.objects,
+            depth=arguments.depth,
+            domains=arguments.domains,
+            seed=arguments.seed,
+        )
+    elif arguments.scaling is not None:
+        report = {
+            "benchmark": "sphinx-localtoc-scaling",
+            "version": __version__,
+            "python": platform.python_version(),
+            "parameters": {"sizes": arguments.scaling, "repeat": arguments.repeat, "max_ratio": arguments.max_ratio},
+            "results": run_scaling(arguments.scaling, arguments.repeat),
+        }
+        report["failures"] = check_scaling(report["results"], arguments.max_ratio)
+    else:
+        report = run_benchmark(
+            pages=arguments.pages,
+            objects=arguments.objects,
+            depth=arguments.depth,
+            domains=arguments.domains,
+            repeat=arguments.repeat,
+            seed=arguments.seed,
+            parallel=arguments.jobs,
+        )
+    output: str = json.dumps(report, indent=2)
+
+    if arguments.output:
+        Path(arguments.output).write_text(output + "\n", "utf-8")
+    else:
+        sys.stdout.write(output + "\n")
+
+    if arguments.parity and report["results"]["mismatches"]:
+        sys.exit(1)
+    if arguments.scaling is not None and report["failures"]:
+        sys.exit(1)
@@ -3,6 +3,7 @@
 #//|>-----------------------------------------------------------------------------------------------------------------<|
 
 #// IMPORT
+from collections.abc import Mapping
 
 
 #// GLOBAL VARIABLES
@@ -13,8 +14,6 @@ prefix_class_name: str = f"--name-{prefix_class}"
 
 name_class_main: str = f"{prefix_main}-type"
 
-obj_types_unique_abbr: dict[str, str] = {}
-obj_types_unique_color: dict[str, tuple[int, int, int]] = {}
 obj_types: dict[str, tuple[str, tuple[int, int, int]]] = {
     # -----------------
     # Core / containers
@@ -97,41 +96,32 @@ obj_types_amount: int = len(obj_types)
 
 
 #// LOGIC
-def _generate_name(name: str, value: str) -> str:
-    abbr: str = ""
+def _generate_name(name: str, value: str, owners: dict[str, str]) -> str:
+    """
+    Generate the abbreviation variable of an object type.
 
-    for k, v in obj_types_unique_abbr.items():
-        if v == value:
-            abbr = f"var({prefix_class_name}-{k})"
-            break
+    :param owners:  Abbreviation ➜ first object type using it, a duplicate refers to the variable of its owner
+    """
+    owner: str = owners.setdefault(value, name)
+    abbr: str = f"\"{value}\"" if owner == name else f"var({prefix_class_name}-{owner})"
+    return f"{prefix_class_name}-{name}: {abbr};"
 
-    if not abbr:
-        obj_types_unique_abbr[name] = value
-        abbr = f"\"{value}\""
 
-    return f"\n\t{prefix_class_name}-{name}: {abbr};"
+def _generate_color(name: str, value: tuple[int, int, int], owners: dict[tuple[int, int, int], str]) -> str:
+    """
+    Generate the color variable of an object type.
 
-
-def _generate_color(name: str, value: tuple[int, int, int]) -> str:
-    color: str = ""
-
-    for k, v in obj_types_unique_color.items():
-        if v == value:
-            color = f"var({prefix_class_color}-{k})"
-            break
-
-    if not color:
-        obj_types_unique_color[name] = value
-        color = str(value)[1:-1]
-
-    return f"\n\t{prefix_class_color}-{name}: {color};"
+    :param owners:  Color ➜ first object type using it, a duplicate refers to the variable of its owner
+    """
+    owner: str = owners.setdefault(tuple(value), name)
+    color: str = ", ".join(str(channel) for channel in value) if owner == name else f"var({prefix_class_color}-{owner})"
+    return f"{prefix_class_color}-{name}: {color};"
 
 
 def _generate_class(name: str) -> str:
     cls_start: str = "{"
     cls_end: str = "}"
-    return f"""
-.{prefix_class}-{name} {cls_start}
+    return f""".{prefix_class}-{name} {cls_start}
     color: rgb(var({prefix_class_color}-{name}));
     background-color: rgba(var({prefix_class_color}-{name}), var(--alpha-{prefix_class}-bg));
 {cls_end}
@@ -140,7 +130,15 @@ def _generate_class(name: str) -> str:
 {cls_end}"""
 
 
-def _generate_template() -> str:
+def generate_css(types: Mapping[str, tuple[str, tuple[int, int, int]]]|None=None) -> str:
+    """
+    Generate the stylesheet for the object types (all the known ones by default).
+
+    This is a pure function: duplicated abbreviations and colors are found through reverse lookup tables local to
+    the call, so it gives the same stylesheet for the same types, however many times it runs.
+
+    :param types:   Object type ➜ (abbreviation, RGB color), in the order of the generated rules
+    """
     template: str = """/* Default Local ToC styling */
 body {
     --icon-$prefix$-chevron-down: url('data:image/svg+xml;charset=utf-8,<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24"><path d="M10.785 18.355C11.455 19.025 12.545 19.025 13.215 18.355L23.495 8.065C24.165 7.395 24.165 6.315 23.495 5.645C22.825 4.975 21.745 4.975 21.075 5.645L12.005 14.715L2.925 5.645C2.255 4.975 1.175 4.975 0.505 5.645C-0.165 6.315 -0.165 7.405 0.505 8.075L10.785 18.355Z"/></svg>');
@@ -158,6 +156,7 @@ body {
     --font-weight-$class_main$: 600;
 
     --size-$prefix$-dropdown: 1rem;
+    --size-$prefix$-dropdown-large: 20rem;
     --space-$prefix$-dropdown: 0.5rem;
     --space-$class_main$: 0.25rem;
     --padding-$class_main$: 0 0.25rem;
@@ -218,70 +217,39 @@ body {
 .$prefix$-dropdown-leaf {
     margin-left: calc(var(--space-$prefix$-dropdown) + var(--size-$prefix$-dropdown));
 }
+/* Big nested lists: laid out only when shown on screen, the rest of the page never waits for them */
+.$prefix$-dropdown-large {
+    content-visibility: auto;
+    contain: layout style;
+    contain-intrinsic-size: auto var(--size-$prefix$-dropdown-large);
+}
 
 /* Object type */
 $generate_classes$
 """
     computed: str = template
-    names: str = ""
-    colors: str = ""
-    classes: str = ""
+    names: list[str] = []
+    colors: list[str] = []
+    classes: list[str] = []
+
+    # Reverse lookup tables, as value ➜ first object type using it
+    abbr_owners: dict[str, str] = {}
+    color_owners: dict[tuple[int, int, int], str] = {}
 
-    for key, value in obj_types.items():
-        names += _generate_name(key, value[0])
-        colors += _generate_color(key, value[1])
-        classes += _generate_class(key)
+    for key, value in (obj_types if types is None else types).items():
+        names.append(_generate_name(key, value[0], abbr_owners))
+        colors.append(_generate_color(key, value[1], color_owners))
+        classes.append(_generate_class(key))
 
     for key, value in {
         "$prefix$": prefix_main,
         "$prefix_class$": prefix_class,
         "$class_main$": name_class_main,
-        "$generate_names$": names[2:],
-        "$generate_colors$": colors[2:],
-        "$generate_classes$": classes[2:],
+        "$generate_names$": "\n\t".join(names),
+        "$generate_colors$": "\n\t".join(colors),
+        "$generate_classes$": "\n".join(classes),
     }.items():
         computed = computed.replace(key, value)
 
     return computed
 
-
-#// RUN
-if __name__ == "__main__":
-    import msvcrt
-    import os
-    import sys
-
-    os.system("TITLE Local ToC - CSS Generator")
-
-    msg_prefix: str = ">>"
-    msg_hint: str = "Type the file path or drag and drop it here."
-    msg_warn: str = "WARNING: The file will be overwrite!"
-    msg_no_file: str = "The provided file do not existing..."
-    file_path: str = ""
-
-    if len(sys.argv) == 1:
-        fail_amount: int = 0
-        fail_last: str = ""
-
-        while not file_path:
-            print(msg_prefix, msg_hint)
-            print(msg_prefix, msg_warn)
-            file_path = os.path.abspath(input(f"{msg_prefix} "))
-
-            if not os.path.isfile(file_path):
-                fail_last = f"{"\n" if fail_amount == 0 else ""}{msg_prefix} {msg_no_file}\n{msg_prefix} {file_path}\n"
-
-                if fail_amount:
-                    os.system("cls" if os.name == "nt" else "clear")
-
-                print(fail_last)
-
-                file_path = ""
-                fail_amount += 1
-
-        with open(file=file_path, mode="w", encoding="utf-8") as file:
-            file.write(_generate_template())
-
-    print("\n" + msg_prefix, "[ DONE ] The file was modified with success.")
-    print(msg_prefix, "Press any key to exit...")
-    msvcrt.getch()
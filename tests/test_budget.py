@@ -0,0 +1,35 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import pytest
+
+from io import StringIO
+from pathlib import Path
+
+from sphinx.application import Sphinx
+
+from sphinx_localtoc.tools.localtoc_benchmark import generate_project
+
+
+#// LOGIC
+@pytest.mark.parametrize(("engine", "warned"), [("soup", False), ("nodes", False), ("stream", True)])
+def test_stream_engine_warns_about_budgets(tmp_path: Path, engine: str, warned: bool) -> None:
+    src: Path = tmp_path / "src"
+    generate_project(src, pages=1, objects=2, depth=1, domains=["py"])
+
+    warning: StringIO = StringIO()
+    Sphinx(
+        srcdir=src,
+        confdir=src,
+        outdir=tmp_path / "out",
+        doctreedir=tmp_path / "out" / ".doctrees",
+        buildername="html",
+        confoverrides={"extensions": ["sphinx_localtoc"], "localtoc_budget": True, "localtoc_engine": engine},
+        status=None,
+        warning=warning,
+        freshenv=True,
+    )
+
+    assert ("localtoc_budget is not supported by the 'stream' engine" in warning.getvalue()) == warned
@@ -0,0 +1,144 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import os
+import pytest
+import time
+
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from sphinx.application import Sphinx
+
+from sphinx_localtoc import localtoc_cache
+from sphinx_localtoc import localtoc_pipeline
+from sphinx_localtoc.localtoc_cache import _cache_file
+from sphinx_localtoc.localtoc_cache import _evict
+from sphinx_localtoc.localtoc_cache import cache_get
+from sphinx_localtoc.localtoc_cache import cache_put
+from sphinx_localtoc.tools.localtoc_benchmark import domain_objects
+from sphinx_localtoc.tools.localtoc_benchmark import generate_project
+
+
+#// LOGIC
+def _build(src: Path, out: Path, doctrees: Path, overrides: dict[str, Any]) -> None:
+    """
+    Build the project quietly, every build of a test sharing the same doctree directory (and so the same cache).
+    """
+    app: Sphinx = Sphinx(
+        srcdir=src,
+        confdir=src,
+        outdir=out,
+        doctreedir=doctrees,
+        buildername="html",
+        confoverrides={
+            "extensions": ["sphinx_localtoc"], "html_theme": "basic", "html_sidebars": {"**": ["localtoc.html"]},
+            "localtoc_cache": True, **overrides,
+        },
+        status=None,
+        warning=StringIO(),
+        freshenv=True,
+    )
+    app.build(force_all=True)
+
+
+def _app(root: Path, **config: Any) -> SimpleNamespace:
+    """
+    Get the smallest app the cache functions work with.
+    """
+    return SimpleNamespace(doctreedir=str(root), config={
+        "localtoc_cache": True, "localtoc_cache_max_age": 0, "localtoc_cache_max_size": 0, **config,
+    })
+
+
+def test_only_the_toc_options_are_keyed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    src: Path = tmp_path / "src"
+    generate_project(src, pages=3, objects=8, depth=2, domains=list(domain_objects))
+
+    hits: list[bool] = []
+
+    def counted_get(app: Sphinx, key: str) -> str|None:
+        html: str|None = cache_get(app, key)
+        hits.append(html is not None)
+        return html
+
+    monkeypatch.setattr(localtoc_pipeline, "cache_get", counted_get)
+
+    _build(src, tmp_path / "out", tmp_path / "doctrees", {})
+    assert hits and not any(hits)
+
+    # An option which never changes the ToC ➜ every page is a hit
+    hits.clear()
+    _build(src, tmp_path / "out", tmp_path / "doctrees", {"localtoc_report_threshold": 1})
+    assert hits and all(hits)
+
+    # An option of a stage ➜ every page is a miss
+    hits.clear()
+    _build(src, tmp_path / "out", tmp_path / "doctrees", {"localtoc_type": False})
+    assert hits and not any(hits)
+
+
+def test_failed_write_keeps_the_entry(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    app: SimpleNamespace = _app(tmp_path)
+    cache_put(app, "ab" * 32, "<ul>old</ul>")
+
+    def failing_replace(_src: str, _dst: str) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(localtoc_cache.os, "replace", failing_replace)
+    cache_put(app, "ab" * 32, "<ul>new</ul>")
+
+    assert cache_get(app, "ab" * 32) == "<ul>old</ul>"
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_evict_age(tmp_path: Path) -> None:
+    app: SimpleNamespace = _app(tmp_path, localtoc_cache_max_age=1)
+    cache_put(app, "aa" * 32, "<ul>old</ul>")
+    cache_put(app, "bb" * 32, "<ul>new</ul>")
+
+    two_days_ago: float = time.time() - 2 * 24 * 60 * 60
+    os.utime(_cache_file(app, "aa" * 32), (two_days_ago, two_days_ago))
+
+    # Leftovers of interrupted writes go after an hour
+    stale_tmp: Path = _cache_file(app, "aa" * 32).with_name("stale.tmp")
+    stale_tmp.write_text("", encoding="utf-8")
+    os.utime(stale_tmp, (two_days_ago, two_days_ago))
+    fresh_tmp: Path = _cache_file(app, "aa" * 32).with_name("fresh.tmp")
+    fresh_tmp.write_text("", encoding="utf-8")
+
+    _evict(app, None)
+
+    assert cache_get(app, "aa" * 32) is None
+    assert cache_get(app, "bb" * 32) == "<ul>new</ul>"
+    assert not stale_tmp.exists() and fresh_tmp.exists()
+
+
+def test_evict_size(tmp_path: Path) -> None:
+    app: SimpleNamespace = _app(tmp_path, localtoc_cache_max_size=250)
+    now: float = time.time()
+
+    # Ten entries of 100 bytes, used one after the other
+    for index in range(10):
+        key: str = f"{index:02d}" * 32
+        cache_put(app, key, "x" * 100)
+        os.utime(_cache_file(app, key), (now - 100 + index, now - 100 + index))
+
+    _evict(app, None)
+
+    # Only the two most recently used entries fit
+    kept: list[str] = sorted(file.stem for file in tmp_path.rglob("*.html"))
+    assert kept == ["08" * 32, "09" * 32]
+
+
+def test_evict_skips_failed_builds(tmp_path: Path) -> None:
+    app: SimpleNamespace = _app(tmp_path, localtoc_cache_max_size=1)
+    cache_put(app, "aa" * 32, "<ul></ul>")
+
+    _evict(app, RuntimeError("build failed"))
+
+    assert cache_get(app, "aa" * 32) == "<ul></ul>"
@@ -0,0 +1,55 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import pytest
+
+from pathlib import Path
+
+from sphinx_localtoc.css import main
+from sphinx_localtoc.tools.localtoc_css_generator import generate_css
+
+
+#// LOGIC
+def test_generate_css_is_pure() -> None:
+    default: str = generate_css()
+
+    # Duplicated abbreviations and colors, which are looked up by the generator
+    types: dict[str, tuple[str, tuple[int, int, int]]] = {
+        "function": ("fn", (1, 2, 3)), "method": ("fn", (1, 2, 3)), "class": ("cls", (4, 5, 6)),
+    }
+    given: dict[str, tuple[str, tuple[int, int, int]]] = dict(types)
+
+    assert generate_css(types) == generate_css(types)
+    assert types == given
+    assert generate_css() == default
+
+
+@pytest.mark.parametrize("minify", [False, True], ids=["full", "minified"])
+def test_check_exit_codes(tmp_path: Path, capsys: pytest.CaptureFixture[str], minify: bool) -> None:
+    stylesheet: Path = tmp_path / "static" / "localtoc.css"
+    options: list[str] = ["--minify"] if minify else []
+
+    # Missing file
+    assert main(["--check", "-o", str(stylesheet), *options]) == 1
+    assert "missing" in capsys.readouterr().err
+    assert not stylesheet.exists()
+
+    # Up to date, once written by the same options
+    assert main(["-o", str(stylesheet), *options]) == 0
+    assert main(["--check", "-o", str(stylesheet), *options]) == 0
+    assert capsys.readouterr().err == ""
+
+    # Stale, and --check never writes it
+    stylesheet.write_text(stylesheet.read_text("utf-8") + "/* edited */\n", "utf-8")
+    assert main(["--check", "-o", str(stylesheet), *options]) == 1
+    assert "stale" in capsys.readouterr().err
+    assert stylesheet.read_text("utf-8").endswith("/* edited */\n")
+
+
+def test_check_needs_output(capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--check", "--stdout"])
+    assert exit_info.value.code == 2
+    capsys.readouterr()
@@ -0,0 +1,101 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import pytest
+import re
+
+from bs4 import BeautifulSoup
+
+from io import StringIO
+from pathlib import Path
+from typing import Any
+
+from sphinx.application import Sphinx
+
+from sphinx_localtoc import localtoc_globaltoc
+
+from sphinx_localtoc.localtoc_dropdown import inject_dropdowns
+from sphinx_localtoc.localtoc_pipeline import parse_fragment
+from sphinx_localtoc.localtoc_pipeline import serialize_fragment
+from sphinx_localtoc.tools.localtoc_benchmark import generate_project
+
+
+#// GLOBAL VARIABLES
+# The toggle IDs of the memoized navigation come from canonical links, the ones of the reference from page links
+_IDS: re.Pattern[str] = re.compile(r' (id|for)="[^"]*"')
+
+
+#// LOGIC
+def _navigations(src: Path, out: Path, overrides: dict[str, Any]) -> dict[str, dict[bool, str]]:
+    """
+    Build the project and get the navigation of every page, collapsed and not.
+    """
+    navigations: dict[str, dict[bool, str]] = {}
+
+    def capture(_app: Sphinx, pagename: str, _tm: str, context: dict[str, Any], _dt: Any) -> None:
+        if "toctree" in context:
+            navigations[pagename] = {collapse: context["toctree"](collapse=collapse) for collapse in (True, False)}
+
+    app: Sphinx = Sphinx(
+        srcdir=src,
+        confdir=src,
+        outdir=out,
+        doctreedir=out / ".doctrees",
+        buildername="html",
+        confoverrides={"extensions": ["sphinx_localtoc"], "localtoc_type": False, **overrides},
+        status=None,
+        warning=StringIO(),
+        freshenv=True,
+    )
+    app.connect("html-page-context", capture, priority=999)
+    app.build(force_all=True)
+    return navigations
+
+
+def _decorate(navigation: str) -> str:
+    """
+    Decorate a navigation rendered by Sphinx the way the dropdown stage does.
+    """
+    soup = parse_fragment(navigation, "html.parser")
+    used_ids: set[str] = set()
+    for ul in [ul for ul in soup.find_all("ul") if ul.find_parent("ul") is None]:
+        inject_dropdowns(soup, 0, ul, used_ids)
+    return serialize_fragment(soup)
+
+
+def test_collapsed_navigation_matches_sphinx(tmp_path: Path) -> None:
+    src: Path = tmp_path / "src"
+    generate_project(src, pages=3, objects=4, depth=2, domains=["py"])
+    # Sections of the pages in the navigation, so there are branches to collapse
+    (src / "index.rst").write_text((src / "index.rst").read_text("utf-8").replace(":maxdepth: 1", ":maxdepth: 3"))
+
+    stock: dict[str, dict[bool, str]] = _navigations(src, tmp_path / "stock", {})
+    memoized: dict[str, dict[bool, str]] = _navigations(src, tmp_path / "memoized", {"localtoc_globaltoc": True})
+
+    assert stock.keys() == memoized.keys()
+    for pagename, navigations in stock.items():
+        for collapse, navigation in navigations.items():
+            expected: str = _IDS.sub("", _decorate(navigation))
+            assert _IDS.sub("", memoized[pagename][collapse]) == expected, f"{pagename} (collapse={collapse})"
+
+    # Only the branches leading to the page are kept (and toggled) when collapsed
+    page: dict[bool, str] = memoized["page0"]
+    assert 0 < page[True].count('class="slt-dropdown"') < page[False].count('class="slt-dropdown"')
+    assert len(page[True]) < len(page[False])
+
+
+def test_links_are_attribute_escaped(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    src: Path = tmp_path / "src"
+    generate_project(src, pages=2, objects=2, depth=1, domains=["py"])
+
+    # Sphinx quotes its document links, but the rendered value must be safe whatever it gets
+    uri: str = 'say"hi" & it\'s.html'
+    monkeypatch.setattr(localtoc_globaltoc, "_relative_uri", lambda _app, _pn, _dn: uri)
+
+    navigation: str = _navigations(src, tmp_path / "out", {"localtoc_globaltoc": True})["page0"][False]
+
+    assert 'href="say&quot;hi&quot; &amp; it&#x27;s.html"' in navigation
+    assert {a["href"] for a in BeautifulSoup(navigation, "html.parser").find_all("a")} == {uri}
+
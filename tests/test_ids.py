@@ -0,0 +1,132 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import pytest
+import re
+
+from bs4 import BeautifulSoup
+from docutils import nodes
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+
+from sphinx import addnodes
+from sphinx.application import Sphinx
+
+from sphinx_localtoc.localtoc_dropdown import _dropdown_nodes_stage
+from sphinx_localtoc.localtoc_dropdown import inject_dropdowns
+from sphinx_localtoc.localtoc_pipeline import parse_fragment
+from sphinx_localtoc.localtoc_pipeline import serialize_fragment
+from sphinx_localtoc.localtoc_stream import _stream_serialize
+from sphinx_localtoc.localtoc_stream import StreamPlan
+
+
+#// GLOBAL VARIABLES
+ENGINES: tuple[str, ...] = ("soup", "nodes", "stream")
+
+# Sections of the page, as (title, sub-section title)
+SECTIONS: list[tuple[str, str]] = [("Alpha", "Alpha one"), ("Beta", "Beta one"), ("Gamma", "Gamma one")]
+
+# Entries of a ToC as (link, nested entries), three of them linking the same anchor
+DUPLICATES: list[tuple[str, list]] = [
+    ("#", [("#a", [("#x", [])]), ("#b", []), ("#a", [("#y", [])]), ("#a", [("#z", [])])]),
+]
+
+_TOGGLE: re.Pattern[str] = re.compile(r'<input class="slt-dropdown" id="([^"]+)"')
+
+
+#// LOGIC
+def _write_page(src: Path, sections: list[tuple[str, str]]) -> None:
+    """
+    Write a single page project with the given sections.
+    """
+    src.mkdir(parents=True, exist_ok=True)
+    (src / "conf.py").write_text('project = "Toggle IDs"\n', "utf-8")
+
+    lines: list[str] = ["Title", "=====", ""]
+    for title, sub_title in sections:
+        lines += [title, "-" * len(title), "", "Text.", "", sub_title, "~" * len(sub_title), "", "Text.", ""]
+    (src / "index.rst").write_text("\n".join(lines), "utf-8")
+
+
+def _toggles(src: Path, out: Path, engine: str) -> dict[str, str]:
+    """
+    Build the project and get the toggle ID of each entry of the local ToC, by link.
+    """
+    app: Sphinx = Sphinx(
+        srcdir=src,
+        confdir=src,
+        outdir=out,
+        doctreedir=out / ".doctrees",
+        buildername="html",
+        confoverrides={
+            "extensions": ["sphinx_localtoc"], "html_theme": "basic", "html_sidebars": {"**": ["localtoc.html"]},
+            "localtoc_cache": False, "localtoc_engine": engine,
+        },
+        status=None,
+        warning=StringIO(),
+        freshenv=True,
+    )
+    app.build(force_all=True)
+
+    soup: BeautifulSoup = BeautifulSoup((out / "index.html").read_text("utf-8"), "html.parser")
+    return {label.parent["href"]: label["for"] for label in soup.find_all("label", class_="slt-dropdown-icon")}
+
+
+def _html(entries: list[tuple[str, list]]) -> str:
+    """
+    Render ToC entries as Sphinx does.
+    """
+    items: str = "".join(
+        f'<li><a class="reference internal" href="{href}">{href}</a>{_html(nested) if nested else ""}</li>\n'
+        for href, nested in entries
+    )
+    return f"<ul>\n{items}</ul>\n"
+
+
+def _nodes(entries: list[tuple[str, list]]) -> nodes.bullet_list:
+    """
+    Build ToC entries as the docutils nodes Sphinx renders.
+    """
+    bullet_list: nodes.bullet_list = nodes.bullet_list()
+    for href, nested in entries:
+        reference: nodes.reference = nodes.reference("", href, internal=True, refuri=href)
+        item: nodes.list_item = nodes.list_item("", addnodes.compact_paragraph("", "", reference))
+        if nested:
+            item += _nodes(nested)
+        bullet_list += item
+    return bullet_list
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_ids_survive_unrelated_sections(tmp_path: Path, engine: str) -> None:
+    _write_page(tmp_path / "before", SECTIONS)
+    # A new section first, and the other ones in another order
+    _write_page(tmp_path / "after", [("Delta", "Delta one"), SECTIONS[2], SECTIONS[0], SECTIONS[1]])
+
+    before: dict[str, str] = _toggles(tmp_path / "before", tmp_path / "out-before", engine)
+    after: dict[str, str] = _toggles(tmp_path / "after", tmp_path / "out-after", engine)
+
+    # The page title is not toggled with the default depth offset
+    assert before == {
+        "#alpha": "slt-dropdown-alpha", "#beta": "slt-dropdown-beta", "#gamma": "slt-dropdown-gamma",
+    }
+    assert after == {**before, "#delta": "slt-dropdown-delta"}
+
+
+def test_duplicated_links_get_suffixes() -> None:
+    expected: list[str] = ["slt-dropdown-top", "slt-dropdown-a", "slt-dropdown-a-2", "slt-dropdown-a-3"]
+
+    soup = parse_fragment(_html(DUPLICATES), "html.parser")
+    inject_dropdowns(soup, 0)
+    assert _TOGGLE.findall(serialize_fragment(soup)) == expected
+
+    plan: StreamPlan = StreamPlan(_html(DUPLICATES))
+    plan.dropdown_depth = 0
+    assert _TOGGLE.findall(_stream_serialize(None, plan)) == expected
+
+    toc: nodes.bullet_list = _nodes(DUPLICATES)
+    _dropdown_nodes_stage(SimpleNamespace(config={"localtoc_dropdown_depth": 0}), toc, {}, None)
+    assert _TOGGLE.findall("".join(raw.astext() for raw in toc.findall(nodes.raw))) == expected
@@ -0,0 +1,121 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import json
+
+from bs4 import BeautifulSoup
+from io import StringIO
+from pathlib import Path
+from typing import Any
+
+from sphinx.application import Sphinx
+
+from sphinx_localtoc.localtoc_lazy import FALLBACK_CLASS
+from sphinx_localtoc.localtoc_lazy import FRAGMENT_DIR
+from sphinx_localtoc.tools.localtoc_benchmark import domain_objects
+from sphinx_localtoc.tools.localtoc_benchmark import generate_project
+
+
+#// GLOBAL VARIABLES
+LAZY: dict[str, Any] = {
+    "localtoc_dropdown_lazy": True, "localtoc_dropdown_lazy_depth": 0, "localtoc_dropdown_lazy_size": 4,
+    "localtoc_dropdown_lazy_label": "{count} entries",
+}
+
+
+#// LOGIC
+def _build(src: Path, out: Path, overrides: dict[str, Any], fresh: bool=True) -> None:
+    """
+    Build the project quietly.
+    """
+    app: Sphinx = Sphinx(
+        srcdir=src,
+        confdir=src,
+        outdir=out,
+        doctreedir=out / ".doctrees",
+        buildername="html",
+        confoverrides={
+            "extensions": ["sphinx_localtoc"], "html_theme": "basic", "html_sidebars": {"**": ["localtoc.html"]},
+            "localtoc_cache": False, **overrides,
+        },
+        status=None,
+        warning=StringIO(),
+        freshenv=fresh,
+    )
+    app.build(force_all=fresh)
+
+
+def _project(src: Path) -> None:
+    """
+    Write a project with a nested page, so its fragment lives in a sub-folder.
+    """
+    generate_project(src, pages=2, objects=12, depth=3, domains=list(domain_objects))
+    (src / "sub").mkdir()
+    (src / "sub" / "extra.rst").write_text((src / "page0.rst").read_text("utf-8").replace("0x", "9x"), "utf-8")
+    index: Path = src / "index.rst"
+    index.write_text(index.read_text("utf-8") + "   sub/extra\n", "utf-8")
+
+
+def _toc(page: Path) -> BeautifulSoup:
+    """
+    Parse the local ToC of a written page.
+    """
+    soup: BeautifulSoup = BeautifulSoup(page.read_text("utf-8"), "html.parser")
+    return BeautifulSoup(str(soup.find("div", class_="sphinxsidebarwrapper")), "html.parser")
+
+
+def test_fragments_hold_the_moved_subtrees(tmp_path: Path) -> None:
+    _project(tmp_path / "src")
+    _build(tmp_path / "src", tmp_path / "eager", {})
+    _build(tmp_path / "src", tmp_path / "lazy", LAZY)
+
+    checked: int = 0
+    for page in ("page0", "page1", "sub/extra"):
+        eager: BeautifulSoup = _toc(tmp_path / "eager" / f"{page}.html")
+        lazy: BeautifulSoup = _toc(tmp_path / "lazy" / f"{page}.html")
+        fragments: dict[str, str] = json.loads(
+            (tmp_path / "lazy" / "_static" / FRAGMENT_DIR / f"{page}.json").read_text("utf-8")
+        )
+        assert fragments
+
+        for ul in lazy.find_all("ul", class_="slt-dropdown-lazy"):
+            key: str = ul["data-slt-key"]
+            assert ul["data-slt-src"].endswith(f"_static/{FRAGMENT_DIR}/{page}.json")
+
+            # Same subtree as the page written without the lazy mode
+            toggle = eager.find("input", id=key)
+            assert fragments[key] == toggle.parent.find("ul", recursive=False).decode_contents()
+
+            # Without the script, a single entry links the section of the moved entries
+            owner_link = ul.parent.find("a", recursive=False)
+            fallback = ul.find_all("li", recursive=False)
+            assert len(fallback) == 1 and fallback[0]["class"] == [FALLBACK_CLASS]
+            assert fallback[0].a["href"] == owner_link["href"]
+            assert fallback[0].a.string == f"{len(BeautifulSoup(fragments[key], "html.parser").find_all("li"))} entries"
+            checked += 1
+
+        assert {ul["data-slt-key"] for ul in lazy.find_all("ul", class_="slt-dropdown-lazy")} == fragments.keys()
+
+    assert checked
+
+
+def test_prune_drops_the_fragments_of_removed_pages(tmp_path: Path) -> None:
+    src: Path = tmp_path / "src"
+    _project(src)
+    _build(src, tmp_path / "out", LAZY)
+
+    root: Path = tmp_path / "out" / "_static" / FRAGMENT_DIR
+    assert (root / "sub" / "extra.json").is_file() and (root / "page1.json").is_file()
+
+    # Removed pages ➜ their fragments and the folders left empty go
+    (src / "sub" / "extra.rst").unlink()
+    (src / "page1.rst").unlink()
+    _build(src, tmp_path / "out", LAZY, fresh=False)
+
+    assert sorted(file.relative_to(root).as_posix() for file in root.rglob("*")) == ["page0.json"]
+
+    # Lazy mode off ➜ every fragment goes
+    _build(src, tmp_path / "out", {**LAZY, "localtoc_dropdown_lazy": False}, fresh=False)
+    assert not list(root.rglob("*.json"))
@@ -0,0 +1,140 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import pytest
+
+from docutils import nodes
+from io import StringIO
+from pathlib import Path
+from typing import Any
+
+from sphinx.application import Sphinx
+from sphinx.builders.html import StandaloneHTMLBuilder
+
+from sphinx_localtoc import localtoc_pipeline
+from sphinx_localtoc.localtoc_dropdown import inject_dropdowns
+from sphinx_localtoc.localtoc_pipeline import parse_fragment
+from sphinx_localtoc.localtoc_pipeline import serialize_fragment
+from sphinx_localtoc.localtoc_stream import _stream_serialize
+from sphinx_localtoc.localtoc_stream import StreamPlan
+from sphinx_localtoc.localtoc_type import decorate_types
+from sphinx_localtoc.tools.localtoc_benchmark import domain_objects
+from sphinx_localtoc.tools.localtoc_benchmark import generate_project
+from sphinx_localtoc.tools.localtoc_benchmark import run_parity
+
+
+#// GLOBAL VARIABLES
+ENGINES: tuple[str, ...] = ("soup", "nodes", "stream")
+
+# A ToC with a commented out entry, and ">" inside quoted attribute values
+TRICKY_TOC: str = """<ul>
+<li><a class="reference internal" href="#" title="a > b">Page</a><ul>
+<!-- <li><a class="reference internal" href="#mod.func">Commented out</a><ul><li>x</li></ul></li> -->
+<li><a class="reference internal" href="#mod.func" data-note='x > y'>func</a></li>
+<li><a class="reference internal" href="#section">Section</a><ul>
+<li><a class="reference internal" href="#mod.Cls">Cls</a></li>
+</ul>
+</li>
+</ul>
+</li>
+</ul>
+"""
+
+
+#// LOGIC
+def _build(src: Path, out: Path, overrides: dict[str, Any]) -> dict[str, str]:
+    """
+    Build the project quietly and get every written page, by path.
+    """
+    app: Sphinx = Sphinx(
+        srcdir=src,
+        confdir=src,
+        outdir=out,
+        doctreedir=out / ".doctrees",
+        buildername="html",
+        confoverrides={
+            "extensions": ["sphinx_localtoc"], "html_theme": "basic", "html_sidebars": {"**": ["localtoc.html"]},
+            "localtoc_cache": False, **overrides,
+        },
+        status=None,
+        warning=StringIO(),
+        freshenv=True,
+    )
+    app.build(force_all=True)
+    return {str(page.relative_to(out)): page.read_text("utf-8") for page in sorted(out.rglob("*.html"))}
+
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"localtoc_dropdown_depth": 0},
+    {"localtoc_type": False},
+    {"localtoc_budget": True, "localtoc_budget_depth": 3, "localtoc_budget_branch": 3, "localtoc_budget_total": 20},
+], ids=["default", "dropdown-depth-0", "no-type", "budget"])
+def test_engines_give_the_same_pages(tmp_path: Path, overrides: dict[str, Any]) -> None:
+    src: Path = tmp_path / "src"
+    generate_project(src, pages=3, objects=12, depth=3, domains=list(domain_objects))
+
+    pages: dict[str, dict[str, str]] = {
+        engine: _build(src, tmp_path / engine, {"localtoc_engine": engine, **overrides}) for engine in ENGINES
+    }
+
+    # The pages must have a decorated ToC, or there is nothing to compare
+    assert pages["soup"]
+    assert any("slt-" in html for html in pages["soup"].values())
+    for engine in ENGINES[1:]:
+        assert pages[engine].keys() == pages["soup"].keys()
+        for path, html in pages["soup"].items():
+            assert pages[engine][path] == html, f"{engine} differs from soup on {path}"
+
+
+def test_parsers_give_the_same_tocs() -> None:
+    report: dict[str, Any] = run_parity(pages=3, objects=12, depth=3, domains=list(domain_objects))
+    assert report["results"]["documents"]
+    assert report["results"]["mismatches"] == []
+
+
+def test_nodes_engine_renders_each_toc_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    src: Path = tmp_path / "src"
+    generate_project(src, pages=3, objects=12, depth=3, domains=list(domain_objects))
+
+    rendered: list[str] = []
+    render_partial = StandaloneHTMLBuilder.render_partial
+
+    def counted_render_partial(builder: StandaloneHTMLBuilder, node: Any) -> dict[str, str]:
+        if isinstance(node, nodes.bullet_list):
+            rendered.append(builder.current_docname)
+        return render_partial(builder, node)
+
+    def no_parse(_toc: str, _parser: str) -> Any:
+        raise AssertionError("the nodes engine must not parse the rendered ToC")
+
+    monkeypatch.setattr(StandaloneHTMLBuilder, "render_partial", counted_render_partial)
+    monkeypatch.setattr(localtoc_pipeline, "parse_fragment", no_parse)
+
+    pages: dict[str, str] = _build(src, tmp_path / "nodes", {"localtoc_engine": "nodes"})
+
+    # Each local ToC is rendered once, by Sphinx itself, and comes out decorated
+    assert any("slt-" in html for html in pages.values())
+    assert rendered and sorted(rendered) == sorted(set(rendered))
+
+
+def test_stream_engine_skips_comments_and_quoted_gt() -> None:
+    types: dict[str, str] = {"mod.func": "function", "mod.Cls": "class"}
+
+    soup = parse_fragment(TRICKY_TOC, "html.parser")
+    decorate_types(soup, types)
+    inject_dropdowns(soup, 0)
+    expected: str = serialize_fragment(soup)
+
+    plan: StreamPlan = StreamPlan(TRICKY_TOC)
+    plan.types = types
+    plan.dropdown_depth = 0
+    streamed: str = _stream_serialize(None, plan)
+
+    # The comment is copied as it is, and both outputs are the same markup once normalized ("&gt;" in attributes)
+    assert "<!-- <li><a class=\"reference internal\" href=\"#mod.func\">Commented out</a>" in streamed
+    assert serialize_fragment(parse_fragment(streamed, "html.parser")) == expected
+    assert expected.count("slt-obj-function") == 1 and expected.count('<input class="slt-dropdown"') == 2
+
@@ -0,0 +1,27 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+from typing import Any
+
+from sphinx_localtoc.localtoc_report import toc_weight
+
+
+#// LOGIC
+def test_toc_weight_lists_the_typed_anchors() -> None:
+    weight: dict[str, Any] = toc_weight(
+        '<ul>\n<li><a class="reference internal" href="#">Page</a><ul>\n'
+        '<li><a class="reference internal" href="#mod.func"><span class="slt-type slt-obj-function"></span>func</a>'
+        '</li>\n'
+        '<li><a class="reference internal" href="#mod.Cls"><span class="slt-type slt-obj-class"></span>Cls</a></li>\n'
+        '<li><a class="reference internal" href="#notes">Notes</a></li>\n'
+        '</ul>\n</li>\n</ul>\n'
+    )
+
+    assert (weight["entries"], weight["max_depth"], weight["links"]) == (4, 2, 4)
+    assert weight["typed"] == 2 and weight["untyped"] == 2
+    assert weight["typed_anchors"] == [
+        {"anchor": "mod.func", "type": "function"}, {"anchor": "mod.Cls", "type": "class"},
+    ]
+    assert weight["untyped_anchors"] == ["", "notes"]
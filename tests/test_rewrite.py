@@ -0,0 +1,125 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import pytest
+
+from io import StringIO
+from pathlib import Path
+
+from sphinx.application import Sphinx
+
+from sphinx_localtoc.rewrite import _AMBIGUOUS
+from sphinx_localtoc.rewrite import _toc_start
+from sphinx_localtoc.rewrite import main
+from sphinx_localtoc.tools.localtoc_benchmark import domain_objects
+from sphinx_localtoc.tools.localtoc_benchmark import generate_project
+
+
+#// GLOBAL VARIABLES
+# Global navigation linking the current page, as `toctree()` renders it
+NAVIGATION: str = (
+    '<ul class="current">\n<li class="toctree-l1 current"><a class="current reference internal" href="#">Page</a>'
+    '</li>\n</ul>\n'
+)
+# Local ToC, as Sphinx renders it
+LOCAL: str = (
+    '<ul>\n<li><a class="reference internal" href="#">Page</a><ul>\n'
+    '<li><a class="reference internal" href="#section">Section</a></li>\n</ul>\n</li>\n</ul>\n'
+)
+
+
+#// LOGIC
+def _page(*parts: str) -> str:
+    """
+    Get a page holding the given parts.
+    """
+    return f"<html><head></head><body>\n{"".join(parts)}</body></html>\n"
+
+
+def test_toc_detection() -> None:
+    # Known theme container, before anything else
+    html: str = _page(NAVIGATION, '<div class="toc-tree">', LOCAL.replace("#section", "#other"), "</div>", LOCAL)
+    assert html[_toc_start(html, None):].startswith('<ul>\n<li><a class="reference internal" href="#">Page</a><ul>\n'
+                                                    '<li><a class="reference internal" href="#other">')
+
+    # The only list linking the page itself, the global navigation excluded
+    html = _page(NAVIGATION, LOCAL)
+    assert _toc_start(html, None) == html.index(LOCAL)
+
+    # Several candidates ➜ ambiguous, unless the container is given
+    html = _page('<nav id="one">', LOCAL, "</nav>", '<nav id="two">', LOCAL, "</nav>")
+    assert _toc_start(html, None) == _AMBIGUOUS
+    assert _toc_start(html, "nav#two") == html.rindex(LOCAL)
+
+    # Nothing linking the page itself, or not as a ToC does (e.g. the related links of the index page)
+    assert _toc_start(_page(NAVIGATION), None) == -1
+    related: str = '<ul>\n<li class="right"><a href="#" title="General Index">index</a></li>\n</ul>\n'
+    assert _toc_start(_page(related), None) == -1
+
+
+def _build(src: Path, out: Path) -> Path:
+    """
+    Build the project without the extension, as pages to rewrite.
+    """
+    app: Sphinx = Sphinx(
+        srcdir=src,
+        confdir=src,
+        outdir=out,
+        doctreedir=out / ".doctrees",
+        buildername="html",
+        confoverrides={"html_theme": "basic", "html_sidebars": {"**": ["globaltoc.html", "localtoc.html"]}},
+        status=None,
+        warning=StringIO(),
+        freshenv=True,
+    )
+    app.build(force_all=True)
+    return out
+
+
+def _snapshot(html_dir: Path) -> dict[str, tuple[str, int]]:
+    """
+    Get the content and the modification time of every page, by path.
+    """
+    return {
+        page.relative_to(html_dir).as_posix(): (page.read_text("utf-8"), page.stat().st_mtime_ns)
+        for page in sorted(html_dir.rglob("*.html"))
+    }
+
+
+def test_rewrite_runs(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    generate_project(tmp_path / "src", pages=2, objects=8, depth=2, domains=list(domain_objects))
+    html_dir: Path = _build(tmp_path / "src", tmp_path / "html")
+
+    # Same project without objects ➜ an inventory without any type
+    generate_project(tmp_path / "empty", pages=2, objects=0, depth=2, domains=list(domain_objects))
+    empty_inventory: Path = _build(tmp_path / "empty", tmp_path / "empty-html") / "objects.inv"
+
+    # The pages with sections are decorated, the other ones have no local ToC (a single entry is not shown)
+    assert main([str(html_dir), "-j", "1"]) == 0
+    assert capsys.readouterr().out.startswith(
+        "2 rewritten, 0 unchanged since the last run, 0 already decorated, 0 with nothing to decorate, "
+        "3 without local ToC, 0 with several"
+    )
+    first: dict[str, tuple[str, int]] = _snapshot(html_dir)
+    assert 'class="slt-dropdown"' in first["page1.html"][0] and "slt-obj-" in first["page0.html"][0]
+
+    # Nothing changed ➜ every page is skipped, and left as it is
+    assert main([str(html_dir), "-j", "1"]) == 0
+    assert capsys.readouterr().out.startswith("0 rewritten, 5 unchanged since the last run")
+    assert _snapshot(html_dir) == first
+
+    # Another inventory ➜ the pages are decorated again, without the stale types
+    assert main([str(html_dir), "-j", "1", "--inventory", str(empty_inventory)]) == 0
+    assert capsys.readouterr().out.startswith("2 rewritten")
+    second: dict[str, tuple[str, int]] = _snapshot(html_dir)
+    assert "slt-obj-" not in second["page0.html"][0] and 'class="slt-dropdown"' in second["page0.html"][0]
+    assert second["page0.html"][0].count('class="slt-dropdown"') == first["page0.html"][0].count('class="slt-dropdown"')
+
+    # Back to the first settings ➜ the same pages as the first run
+    assert main([str(html_dir), "-j", "1"]) == 0
+    assert capsys.readouterr().out.startswith("2 rewritten")
+    assert {rel: html for rel, (html, _mt) in _snapshot(html_dir).items()} == {
+        rel: html for rel, (html, _mt) in first.items()
+    }
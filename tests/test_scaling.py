@@ -0,0 +1,23 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+from sphinx_localtoc.tools.localtoc_benchmark import check_scaling
+from sphinx_localtoc.tools.localtoc_benchmark import run_scaling
+
+
+#// LOGIC
+def test_check_scaling_flags_super_linear_ratios() -> None:
+    results = {
+        "wide": {"cost_ratio": {"soup_dropdown": 1.2, "stream_dropdown": 9.5}},
+        "deep": {"cost_ratio": {"soup_dropdown": 0.8, "stream_dropdown": 1.0}},
+    }
+    assert check_scaling(results, 4.0) == ["wide/stream_dropdown"]
+    assert check_scaling(results, 10.0) == []
+
+
+def test_dropdown_rewrite_scales_linearly() -> None:
+    # A quadratic rewrite would get a cost ratio close to 10 over these sizes
+    results = run_scaling([500, 5000], repeat=3)
+    assert check_scaling(results) == []
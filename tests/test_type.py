@@ -0,0 +1,165 @@
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+#//| Copyright (c) 17 Oct 2026. All rights are reserved by ASI
+#//|>-----------------------------------------------------------------------------------------------------------------<|
+
+#// IMPORT
+import pytest
+import shutil
+
+from bs4 import BeautifulSoup
+from io import StringIO
+from pathlib import Path
+from typing import Any
+
+from sphinx.application import Sphinx
+
+from sphinx_localtoc.tools.localtoc_benchmark import domain_objects
+from sphinx_localtoc.tools.localtoc_benchmark import generate_project
+
+
+#// GLOBAL VARIABLES
+ENGINES: tuple[str, ...] = ("soup", "nodes", "stream")
+
+# A page mixing object types, nested in sections and in a class
+MIXED_PAGE: str = """Mixed
+=====
+
+Functions
+---------
+
+.. py:function:: run()
+
+.. py:data:: LIMIT
+
+Classes
+-------
+
+.. py:class:: Box
+
+   .. py:method:: open()
+
+   .. py:attribute:: size
+
+Notes
+-----
+
+Text.
+"""
+
+
+#// LOGIC
+def _build(src: Path, out: Path, parallel: int=0, fresh: bool=True) -> dict[str, Any]:
+    """
+    Build the project quietly and get the collected type data, the debug file and the written pages.
+    """
+    app: Sphinx = Sphinx(
+        srcdir=src,
+        confdir=src,
+        outdir=out,
+        doctreedir=out / ".doctrees",
+        buildername="html",
+        confoverrides={
+            "extensions": ["sphinx_localtoc"], "html_theme": "basic", "html_sidebars": {"**": ["localtoc.html"]},
+            "localtoc_cache": False, "localtoc_type_debug_file": str(out / "debug.txt"),
+        },
+        status=None,
+        warning=StringIO(),
+        freshenv=fresh,
+        parallel=parallel,
+    )
+    app.build(force_all=fresh)
+
+    return {
+        "index": {docname: dict(index) for docname, index in app.env.asi_localtoc_index.items()},
+        "object_types": app.env.asi_object_types,
+        "debug": (out / "debug.txt").read_text("utf-8"),
+        "pages": {str(page.relative_to(out)): page.read_text("utf-8") for page in sorted(out.glob("*.html"))},
+    }
+
+
+def _remove_page(src: Path, page: str) -> None:
+    """
+    Remove a page of a project made by :func:`generate_project`, and its toctree entry.
+    """
+    (src / f"{page}.rst").unlink()
+    index: Path = src / "index.rst"
+    index.write_text(index.read_text("utf-8").replace(f"   {page}\n", ""), "utf-8")
+
+
+def test_parallel_and_incremental_builds_match_serial(tmp_path: Path) -> None:
+    src: Path = tmp_path / "src"
+    generate_project(src, pages=8, objects=10, depth=2, domains=list(domain_objects))
+    shutil.copytree(src, tmp_path / "src-serial")
+
+    serial: dict[str, Any] = _build(src, tmp_path / "serial")
+    parallel: dict[str, Any] = _build(src, tmp_path / "parallel", parallel=2)
+
+    # Data merged from the reading processes, and pages written by the writing ones
+    assert len(serial["index"]) == 9 and serial["debug"]
+    assert parallel == serial
+
+    # One page removed ➜ its data is purged by the incremental build, as if it never existed
+    _remove_page(src, "page3")
+    _remove_page(tmp_path / "src-serial", "page3")
+
+    incremental: dict[str, Any] = _build(src, tmp_path / "parallel", parallel=2, fresh=False)
+    reference: dict[str, Any] = _build(tmp_path / "src-serial", tmp_path / "reference")
+
+    assert "page3" not in incremental["index"] and "page3" not in incremental["object_types"]
+    assert incremental["index"] == reference["index"]
+    assert incremental["object_types"] == reference["object_types"]
+    assert incremental["debug"] == reference["debug"]
+
+
+def _filter_data(src: Path, out: Path, engine: str) -> tuple[list[tuple[str, str|None]], list[str|None]]:
+    """
+    Build the page with the type filter and get its attributes: (link, data-slt-type) of every entry, and
+    data-slt-types of every list, in document order.
+    """
+    app: Sphinx = Sphinx(
+        srcdir=src,
+        confdir=src,
+        outdir=out,
+        doctreedir=out / ".doctrees",
+        buildername="html",
+        confoverrides={
+            "extensions": ["sphinx_localtoc"], "html_theme": "basic", "html_sidebars": {"**": ["localtoc.html"]},
+            "localtoc_cache": False, "localtoc_engine": engine, "localtoc_type_filter": True,
+        },
+        status=None,
+        warning=StringIO(),
+        freshenv=True,
+    )
+    app.build(force_all=True)
+
+    page: BeautifulSoup = BeautifulSoup((out / "index.html").read_text("utf-8"), "html.parser")
+    toc = page.find("div", class_="sphinxsidebarwrapper").find("ul")
+    return (
+        [(li.find("a")["href"], li.get("data-slt-type")) for li in toc.find_all("li")],
+        [ul.get("data-slt-types") for ul in [toc, *toc.find_all("ul")]],
+    )
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_type_filter_attributes(tmp_path: Path, engine: str) -> None:
+    src: Path = tmp_path / "src"
+    src.mkdir()
+    (src / "conf.py").write_text('project = "Type filter"\n', "utf-8")
+    (src / "index.rst").write_text(MIXED_PAGE, "utf-8")
+
+    entries, lists = _filter_data(src, tmp_path / "out", engine)
+
+    assert entries == [
+        ("#", None),
+        ("#functions", None), ("#run", "function"), ("#LIMIT", "data"),
+        ("#classes", None), ("#Box", "class"), ("#Box.open", "method"), ("#Box.size", "attribute"),
+        ("#notes", None),
+    ]
+    assert lists == [
+        "attribute class data function method",
+        "attribute class data function method",
+        "data function",
+        "attribute class method",
+        "attribute method",
+    ]
+